@@ -39,6 +39,11 @@ def main() -> None:
         f"## {PACKAGE_NAME}\n\n```text\n{_render_help()}\n```",
         f"## lint\n\n```text\n{_render_help('lint')}\n```",
         f"## format\n\n```text\n{_render_help('format')}\n```",
+        f"## lsp\n\n```text\n{_render_help('lsp')}\n```",
+        f"## cache\n\n```text\n{_render_help('cache')}\n```",
+        f"### cache stats\n\n```text\n{_render_help('cache', 'stats')}\n```",
+        f"### cache clean\n\n```text\n{_render_help('cache', 'clean')}\n```",
+        f"### cache prune\n\n```text\n{_render_help('cache', 'prune')}\n```",
         f"{EXIT_CODES_HEADING}{exit_codes.rstrip()}",
     ]
     CLI_DOCUMENTATION.write_text("\n\n".join(sections) + "\n")
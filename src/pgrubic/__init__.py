@@ -1,13 +1,14 @@
 """pgrubic."""
 
+from __future__ import annotations
+
 import os
 import enum
 import typing
 import pathlib
-import tomllib
-import importlib.metadata
 
-from pglast import ast
+if typing.TYPE_CHECKING:
+    from pglast import ast  # pragma: no cover
 
 PACKAGE_NAME: typing.Final[str] = "pgrubic"
 
@@ -15,6 +16,8 @@ WORKERS_ENVIRONMENT_VARIABLE: typing.Final[str] = f"{PACKAGE_NAME.upper()}_WORKE
 
 DEFAULT_WORKERS: typing.Final[int] = 4
 
+RULE_PACKS_ENTRY_POINT_GROUP: typing.Final[str] = f"{PACKAGE_NAME}.rules"
+
 SCHEMA_QUALIFIED_LENGTH: typing.Final[int] = 2
 
 REPOSITORY_URL: typing.Final[str] = "https://github.com/bolajiwahab/pgrubic"
@@ -41,13 +44,11 @@ RULES_DIRECTORY: typing.Final[pathlib.Path] = PACKAGE_DIRECTORY / "rules/"
 
 FORMATTERS_DIRECTORY: typing.Final[pathlib.Path] = PACKAGE_DIRECTORY / "formatters/"
 
-pyproject_file = pathlib.Path(PROJECT_DIRECTORY / "pyproject.toml")
-if pyproject_file.exists():
-    with pathlib.Path(PROJECT_DIRECTORY / "pyproject.toml").open("rb") as f:
-        pyproject_config = tomllib.load(f)
-        __version__: str = pyproject_config["project"]["version"]
-else:
-    __version__ = importlib.metadata.version(PACKAGE_NAME)  # pragma: no cover
+MANIFEST_FILE: typing.Final[pathlib.Path] = PACKAGE_DIRECTORY / "manifest.py"
+
+# Kept in sync with pyproject.toml on release, so that neither the project file nor the
+# package metadata are read at startup
+__version__: typing.Final[str] = "2.0.0"
 
 RULES_BASE_MODULE: typing.Final[str] = f"{PACKAGE_NAME}/rules/"
 
@@ -68,6 +69,9 @@ def get_fully_qualified_name(node: tuple[ast.String] | ast.String | ast.RangeVar
         Fully qualified name.
 
     """
+    # pglast is only imported by the commands parsing sql
+    from pglast import ast  # noqa: PLC0415
+
     if isinstance(node, ast.String):
         return str(node.sval)
 
@@ -1,20 +1,27 @@
 """Entry point."""
 
+from __future__ import annotations
+
 import os
 import sys
-import difflib
+import typing
 import logging
 import pathlib
-import multiprocessing
-from collections import abc
+import functools
 
-import toml
 import click
-from rich.syntax import Syntax
-from rich.console import Console
 
-from pgrubic import DEFAULT_WORKERS, WORKERS_ENVIRONMENT_VARIABLE, core, cli_help
-from pgrubic.core import noqa, errors
+from pgrubic import (
+    DEFAULT_WORKERS,
+    WORKERS_ENVIRONMENT_VARIABLE,
+    core,
+    cli_help,
+    __version__,
+)
+
+if typing.TYPE_CHECKING:
+    import multiprocessing.pool  # pragma: no cover
+    from collections import abc  # pragma: no cover
 
 
 def common_options[T](func: abc.Callable[..., T]) -> abc.Callable[..., T]:
@@ -26,6 +33,12 @@ def common_options[T](func: abc.Callable[..., T]) -> abc.Callable[..., T]:
         help=f"Number of workers to use. Defaults to the number of CPUs or the value of {WORKERS_ENVIRONMENT_VARIABLE}.",  # noqa: E501
     )(func)
     func = click.option("--verbose", is_flag=True, help="Enable verbose logging.")(func)
+    func = click.option(
+        "--progress",
+        "show_progress",
+        is_flag=True,
+        help="Show the number of processed files and the throughput.",
+    )(func)
     return click.option(
         "--config",
         "config_overrides",
@@ -44,11 +57,13 @@ def _parse_config_overrides(
 
     config_override = "\n".join(config_overrides)
 
+    import toml  # noqa: PLC0415
+
     try:
         return dict(toml.loads(config_override))
     except toml.decoder.TomlDecodeError as error:
         msg = f'Error parsing configuration override "{config_override}"'
-        raise errors.ConfigParseError(msg) from error
+        raise core.errors.ConfigParseError(msg) from error
 
 
 @click.group(
@@ -98,9 +113,39 @@ def cli() -> None:
     default=False,
     help='Exit with status code "0", even when lint violations are present.',
 )
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Lint files incrementally as they are read, with memory bounded by the largest statement. Useful for very large files such as dumps, cannot be used with `--fix`.",  # noqa: E501
+)
+@click.option(
+    "--profile-rules",
+    is_flag=True,
+    default=False,
+    help="Report the time spent in, and the violations produced by, each rule.",
+)
+@click.option(
+    "--profile-rules-json",
+    type=click.Path(dir_okay=False),
+    metavar="<FILE>",
+    help="Write the rule profiles as JSON to the given file. Implies `--profile-rules`.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Disable cache reads.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Lint the files again as they change, until interrupted.",
+)
 @common_options
 @click.argument("sources", nargs=-1, type=click.Path(exists=True, path_type=pathlib.Path))  # type: ignore [type-var]
-def lint(  # noqa: C901, PLR0912, PLR0913, PLR0915
+def lint(  # noqa: PLR0913
     sources: tuple[pathlib.Path, ...],
     *,
     fix: bool,
@@ -108,9 +153,15 @@ def lint(  # noqa: C901, PLR0912, PLR0913, PLR0915
     add_file_level_general_noqa: bool,
     generate_lint_report: bool,
     exit_zero: bool,
+    stream: bool,
+    profile_rules: bool,
+    profile_rules_json: str | None,
+    no_cache: bool,
+    watch: bool,
     config_overrides: tuple[str, ...],
     workers: int,
     verbose: bool,
+    show_progress: bool,
 ) -> None:
     """Lint SQL files.
 
@@ -128,12 +179,24 @@ def lint(  # noqa: C901, PLR0912, PLR0913, PLR0915
         Whether to generate a lint report.
     exit_zero: bool
         Whether to exit with status code 0, even when lint violations are present.
+    stream: bool
+        Whether to lint files incrementally, as they are read.
+    profile_rules: bool
+        Whether to report the time spent in, and the violations produced by, each rule.
+    profile_rules_json: str | None
+        File to write the rule profiles to as JSON.
+    no_cache: bool
+        Whether to read the cache.
+    watch: bool
+        Whether to lint the files again as they change.
     config_overrides: tuple[str, ...]
         TOML key-value pairs overriding configuration options.
     workers: int
         Number of workers to use.
     verbose: bool
         Enable verbose logging.
+    show_progress: bool
+        Show the number of processed files and the throughput.
 
     Returns:
     -------
@@ -142,33 +205,30 @@ def lint(  # noqa: C901, PLR0912, PLR0913, PLR0915
     """
     core.logger.setLevel(logging.INFO if verbose else logging.WARNING)
 
-    try:
-        config = core.parse_config(
-            overrides=_parse_config_overrides(config_overrides),
-        )
-    except errors.MissingConfigError as error:
-        sys.stderr.write(f"{error}{noqa.NEW_LINE}")
-        sys.exit(1)
-    except errors.InvalidConfigValueError as error:
-        sys.stderr.write(f"{error}{noqa.NEW_LINE}")
-        sys.exit(1)
-    except errors.ConfigParseError as error:
-        sys.stderr.write(f"{error}{noqa.NEW_LINE}")
-        sys.exit(1)
-    except errors.ConfigFileNotFoundError as error:
-        sys.stderr.write(f"{error}{noqa.NEW_LINE}")
-        sys.exit(1)
+    config = _parse_config(config_overrides)
 
-    for key, value in [("fix", fix), ("ignore_noqa", ignore_noqa)]:
+    for key, value in [
+        ("fix", fix),
+        ("ignore_noqa", ignore_noqa),
+        ("no_cache", no_cache),
+    ]:
         if value:
             setattr(config.lint, key, value)
 
-    linter: core.Linter = core.Linter(config=config, formatters=core.load_formatters)
+    # rule packs are loaded once here, before the workers inherit them
+    try:
+        core.loader.load_rule_packs()
+    except core.errors.RulePackError as error:
+        sys.stderr.write(f"{error}{core.noqa.NEW_LINE}")
+        sys.exit(1)
 
-    rules: set[type[core.BaseChecker]] = core.load_rules(config=config)
+    if stream and config.lint.fix:
+        sys.stderr.write(
+            f"Fixes cannot be applied when linting files incrementally{core.noqa.NEW_LINE}",  # noqa: E501
+        )
+        sys.exit(1)
 
-    for rule in rules:
-        linter.checkers.add(rule(config=config))
+    profile_rules = profile_rules or profile_rules_json is not None
 
     # Use the current working directory if no sources are specified
     if not sources:
@@ -182,9 +242,9 @@ def lint(  # noqa: C901, PLR0912, PLR0913, PLR0915
     )
 
     if add_file_level_general_noqa:
-        sources_modified = noqa.add_file_level_general_lint_ignore(included_sources)
+        sources_modified = core.noqa.add_file_level_general_lint_ignore(included_sources)
         sys.stdout.write(
-            f"File-level general noqa directive added to {sources_modified} file(s){noqa.NEW_LINE}",  # noqa: E501
+            f"File-level general noqa directive added to {sources_modified} file(s){core.noqa.NEW_LINE}",  # noqa: E501
         )
         sys.exit(0)
 
@@ -192,46 +252,193 @@ def lint(  # noqa: C901, PLR0912, PLR0913, PLR0915
     # the environment variable when provided, takes precedence over the default
     workers = workers or int(os.getenv(WORKERS_ENVIRONMENT_VARIABLE, DEFAULT_WORKERS))
 
-    # we set the number of processes to the smallest of these values:
-    # 1. the number of CPUs
-    # 2. the number of workers
+    import multiprocessing  # noqa: PLC0415
+
+    # each worker builds its linter once and reads the files itself, the workers stay
+    # alive between the passes of the watch mode
     with multiprocessing.Pool(
-        processes=min(
-            multiprocessing.cpu_count(),
-            workers,
+        processes=_pool_size(workers, sources=included_sources, watch=watch),
+        initializer=functools.partial(
+            core.workers.initialize_linter,
+            config,
+            profile_rules=profile_rules,
+            stream=stream,
         ),
     ) as pool:
-        results = [
-            pool.apply_async(
-                linter.run,
-                kwds={
-                    "source_file": str(source.resolve()),
-                    "source_code": source.read_text(encoding="utf-8"),
-                },
+        lint_sources = functools.partial(
+            _lint_sources,
+            pool=pool,
+            config=config,
+            exit_zero=exit_zero,
+            generate_lint_report=generate_lint_report,
+            profile_rules=profile_rules,
+            profile_rules_json=profile_rules_json,
+            show_progress=show_progress,
+        )
+
+        exit_code = lint_sources(included_sources)
+
+        if watch:
+            exit_code = _watch(
+                process_sources=lint_sources,
+                exit_code=exit_code,
+                sources=sources,
+                include=config.lint.include,
+                exclude=config.lint.exclude,
+                respect_gitignore=config.respect_gitignore,
             )
-            for source in included_sources
-        ]
-        pool.close()
-        pool.join()
 
-        lint_results = [result.get() for result in results]
+    core.cache.evict(config)
+
+    if exit_code:
+        sys.exit(exit_code)
+
+
+def _pool_size(workers: int, *, sources: set[pathlib.Path], watch: bool) -> int:
+    """Get the number of worker processes, the smallest of:
+    1. the number of CPUs
+    2. the number of workers
+    3. the number of sources, unless watching as sources may be added, since starting
+    a worker costs more than processing a file.
+
+    Parameters:
+    ----------
+    workers: int
+        Number of workers.
+    sources: set[pathlib.Path]
+        Sources to process.
+    watch: bool
+        Whether the sources are watched.
+
+    Returns:
+    -------
+    int
+        Number of worker processes.
+    """
+    import multiprocessing  # noqa: PLC0415
+
+    pool_size = min(multiprocessing.cpu_count(), workers)
+
+    if watch:
+        return pool_size
 
+    return max(min(pool_size, len(sources)), 1)
+
+
+def _watch(  # noqa: PLR0913
+    *,
+    process_sources: abc.Callable[[set[pathlib.Path]], int],
+    exit_code: int,
+    sources: tuple[pathlib.Path, ...],
+    include: list[str],
+    exclude: list[str],
+    respect_gitignore: bool,
+) -> int:
+    """Process the changed sources until interrupted.
+
+    Parameters:
+    ----------
+    process_sources: abc.Callable[[set[pathlib.Path]], int]
+        Function processing sources, returning the exit code.
+    exit_code: int
+        Exit code of the first pass.
+    sources: tuple[pathlib.Path, ...]
+        Files and directories to watch.
+    include: list[str]
+        List of file patterns to include.
+    exclude: list[str]
+        List of file patterns to exclude.
+    respect_gitignore: bool
+        Whether to respect gitignore.
+
+    Returns:
+    -------
+    int
+        Exit code of the last pass.
+    """
+    sys.stdout.write(f"Watching for file changes...{core.noqa.NEW_LINE}")
+
+    try:
+        for changed_sources in core.watcher.watch_sources(
+            sources=sources,
+            include=include,
+            exclude=exclude,
+            respect_gitignore=respect_gitignore,
+        ):
+            exit_code = process_sources(changed_sources)
+
+            sys.stdout.write(f"Watching for file changes...{core.noqa.NEW_LINE}")
+    except KeyboardInterrupt:
+        pass
+
+    return exit_code
+
+
+def _lint_sources(  # noqa: C901, PLR0912, PLR0913
+    sources: set[pathlib.Path],
+    *,
+    pool: multiprocessing.pool.Pool,
+    config: core.Config,
+    exit_zero: bool,
+    generate_lint_report: bool,
+    profile_rules: bool,
+    profile_rules_json: str | None,
+    show_progress: bool,
+) -> int:
+    """Lint sources with the linters of the pool workers and report the results.
+
+    Parameters:
+    ----------
+    sources: set[pathlib.Path]
+        Sources to lint.
+    pool: multiprocessing.pool.Pool
+        Pool of linter workers.
+    config: core.Config
+        Config.
+    exit_zero: bool
+        Whether to exit with status code 0, even when lint violations are present.
+    generate_lint_report: bool
+        Whether to generate a lint report.
+    profile_rules: bool
+        Whether to report the time spent in, and the violations produced by, each rule.
+    profile_rules_json: str | None
+        File to write the rule profiles to as JSON.
+    show_progress: bool
+        Show the number of processed files and the throughput.
+
+    Returns:
+    -------
+    int
+        Exit code.
+    """
     total_violations = 0
     auto_fixable_violations = 0
     fix_enabled_violations = 0
     total_errors = 0
 
-    for lint_result in lint_results:
-        violations = linter.get_violation_stats(
+    # only kept when needed, results are otherwise released once printed
+    lint_results: list[core.linter.LintResult] = []
+    rule_profiles: dict[str, core.linter.RuleProfile] = {}
+
+    progress = core.Progress(total_sources=len(sources), enabled=show_progress)
+
+    # results are consumed as soon as they are available
+    for lint_result in pool.imap_unordered(
+        core.workers.lint_source,
+        [str(source.resolve()) for source in sources],
+    ):
+        progress.clear()
+
+        violations = core.Linter.get_violation_stats(
             lint_result.violations,
         )
 
-        linter.print_violations(
+        core.Linter.print_violations(
             violations=lint_result.violations,
             source_file=lint_result.source_file,
         )
 
-        errors.print_errors(
+        core.errors.print_errors(
             errors=lint_result.errors,
             source_file=lint_result.source_file,
         )
@@ -241,47 +448,75 @@ def lint(  # noqa: C901, PLR0912, PLR0913, PLR0915
         fix_enabled_violations += violations.fix_enabled
         total_errors += len(lint_result.errors)
 
+        # Sizes are only needed to report the throughput
+        if progress.enabled:
+            progress.advance(
+                size=pathlib.Path(lint_result.source_file).stat().st_size,
+            )
+
         if lint_result.fixed_source_code:
             pathlib.Path(lint_result.source_file).write_text(
                 lint_result.fixed_source_code,
                 encoding="utf-8",
             )
 
+        if generate_lint_report:
+            lint_results.append(lint_result)
+
+        if profile_rules:
+            rule_profiles = core.Linter.merge_rule_profiles(
+                [lint_result],
+                rule_profiles=rule_profiles,
+            )
+
+    progress.finish()
+
     if generate_lint_report:
-        linter.generate_lint_report(
+        core.Linter.generate_lint_report(
             lint_results=lint_results,
         )
 
+    if profile_rules:
+        core.Linter.print_rule_profiles(rule_profiles)
+
+        if profile_rules_json is not None:
+            core.Linter.write_rule_profiles(
+                rule_profiles=rule_profiles,
+                profile_file=profile_rules_json,
+            )
+
     if total_violations > 0 or total_errors > 0:
         if config.lint.fix:
             sys.stdout.write(
-                f"{noqa.NEW_LINE}Found {total_violations} violation(s)"
-                f"{noqa.SPACE}({fix_enabled_violations} fixed,"
-                f"{noqa.SPACE}{total_violations - fix_enabled_violations} remaining){noqa.NEW_LINE}"  # noqa: E501
-                f"{total_errors} error(s) found{noqa.NEW_LINE}",
+                f"{core.noqa.NEW_LINE}Found {total_violations} violation(s)"
+                f"{core.noqa.SPACE}({fix_enabled_violations} fixed,"
+                f"{core.noqa.SPACE}{total_violations - fix_enabled_violations} remaining){core.noqa.NEW_LINE}"  # noqa: E501
+                f"{total_errors} error(s) found{core.noqa.NEW_LINE}",
             )
 
             if total_errors > 0 or (
                 (total_violations - fix_enabled_violations) > 0 and not exit_zero
             ):
-                sys.exit(1)
+                return 1
 
         else:
             sys.stdout.write(
-                f"{noqa.NEW_LINE}Found {total_violations} violation(s){noqa.NEW_LINE}"
-                f"{auto_fixable_violations} fix(es) available, {fix_enabled_violations} fix(es) enabled{noqa.NEW_LINE}"  # noqa: E501
-                f"{total_errors} error(s) found{noqa.NEW_LINE}",
+                f"{core.noqa.NEW_LINE}Found {total_violations} violation(s){core.noqa.NEW_LINE}"  # noqa: E501
+                f"{auto_fixable_violations} fix(es) available, {fix_enabled_violations} fix(es) enabled{core.noqa.NEW_LINE}"  # noqa: E501
+                f"{total_errors} error(s) found{core.noqa.NEW_LINE}",
             )
 
             if auto_fixable_violations > 0:
                 sys.stdout.write(
-                    f"Use with '--fix' to auto fix the violations{noqa.NEW_LINE}",
+                    f"Use with '--fix' to auto fix the violations{core.noqa.NEW_LINE}",
                 )
 
             if total_errors > 0 or not exit_zero:
-                sys.exit(1)
+                return 1
     else:
-        sys.stdout.write(f"All checks passed!{noqa.NEW_LINE}")
+        sys.stdout.write(f"All checks passed!{core.noqa.NEW_LINE}")
+
+    return 0
 
 
 @cli.command(
@@ -306,17 +541,25 @@ def lint(  # noqa: C901, PLR0912, PLR0913, PLR0915
     default=False,
     help="Disable cache reads.",
 )
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Format the files again as they change, until interrupted.",
+)
 @common_options
 @click.argument("sources", nargs=-1, type=click.Path(exists=True, path_type=pathlib.Path))  # type: ignore [type-var]
-def format_sources(  # noqa: C901, PLR0912, PLR0913, PLR0915
+def format_sources(  # noqa: PLR0913
     sources: tuple[pathlib.Path, ...],
     *,
     check: bool,
     diff: bool,
     no_cache: bool,
+    watch: bool,
     config_overrides: tuple[str, ...],
     workers: int,
     verbose: bool,
+    show_progress: bool,
 ) -> None:
     """Format SQL files.
 
@@ -331,12 +574,16 @@ def format_sources(  # noqa: C901, PLR0912, PLR0913, PLR0915
         how the formatted file would look like.
     no_cache: bool
         Whether to read the cache.
+    watch: bool
+        Whether to format the files again as they change.
     config_overrides: tuple[str, ...]
         TOML key-value pairs overriding configuration options.
     workers: int
         Number of workers to use.
     verbose: bool
         Enable verbose logging.
+    show_progress: bool
+        Show the number of processed files and the throughput.
 
     Returns:
     -------
@@ -345,34 +592,12 @@ def format_sources(  # noqa: C901, PLR0912, PLR0913, PLR0915
     """
     core.logger.setLevel(logging.INFO if verbose else logging.WARNING)
 
-    console = Console()
-
-    try:
-        config = core.parse_config(
-            overrides=_parse_config_overrides(config_overrides),
-        )
-    except errors.MissingConfigError as error:
-        sys.stderr.write(f"{error}{noqa.NEW_LINE}")
-        sys.exit(1)
-    except errors.InvalidConfigValueError as error:
-        sys.stderr.write(f"{error}{noqa.NEW_LINE}")
-        sys.exit(1)
-    except errors.ConfigParseError as error:
-        sys.stderr.write(f"{error}{noqa.NEW_LINE}")
-        sys.exit(1)
-    except errors.ConfigFileNotFoundError as error:
-        sys.stderr.write(f"{error}{noqa.NEW_LINE}")
-        sys.exit(1)
+    config = _parse_config(config_overrides)
 
     for key, value in [("check", check), ("diff", diff), ("no_cache", no_cache)]:
         if value:
             setattr(config.format, key, value)
 
-    formatter: core.Formatter = core.Formatter(
-        config=config,
-        formatters=core.load_formatters,
-    )
-
     # Use the current working directory if no sources are specified
     if not sources:
         sources = (pathlib.Path.cwd(),)
@@ -386,46 +611,95 @@ def format_sources(  # noqa: C901, PLR0912, PLR0913, PLR0915
 
     cache = core.Cache(config=config)
 
-    sources_to_format = included_sources
-
-    if not config.format.no_cache:
-        sources_to_format = cache.filter_sources(
-            sources=included_sources,
-        )
-
     # the `--workers` flag when specified, takes precedence over the environment variable
     # the environment variable when provided, takes precedence over the default
     workers = workers or int(os.getenv(WORKERS_ENVIRONMENT_VARIABLE, DEFAULT_WORKERS))
 
-    # we set the number of processes to the smallest of these values:
-    # 1. the number of CPUs
-    # 2. the number of workers
+    import multiprocessing  # noqa: PLC0415
+
+    # each worker builds its formatter once and reads the files itself, the workers and
+    # the cache stay alive between the passes of the watch mode
     with multiprocessing.Pool(
-        processes=min(
-            multiprocessing.cpu_count(),
-            workers,
-        ),
+        processes=_pool_size(workers, sources=included_sources, watch=watch),
+        initializer=core.workers.initialize_formatter,
+        initargs=(config,),
     ) as pool:
-        results = [
-            pool.apply_async(
-                formatter.format,
-                kwds={
-                    "source_file": source.resolve(),
-                    "source_code": source.read_text(encoding="utf-8"),
-                },
+        format_sources = functools.partial(
+            _format_sources,
+            pool=pool,
+            cache=cache,
+            config=config,
+            show_progress=show_progress,
+        )
+
+        exit_code = format_sources(included_sources)
+
+        if watch:
+            exit_code = _watch(
+                process_sources=format_sources,
+                exit_code=exit_code,
+                sources=sources,
+                include=config.format.include,
+                exclude=config.format.exclude,
+                respect_gitignore=config.respect_gitignore,
             )
-            for source in sources_to_format
-        ]
-        pool.close()
-        pool.join()
 
-        formatting_results = [result.get() for result in results]
+    core.cache.evict(config)
+
+    sys.exit(exit_code)
+
+
+def _format_sources(  # noqa: C901
+    sources: set[pathlib.Path],
+    *,
+    pool: multiprocessing.pool.Pool,
+    cache: core.Cache,
+    config: core.Config,
+    show_progress: bool,
+) -> int:
+    """Format sources with the formatters of the pool workers and report the results.
+
+    Parameters:
+    ----------
+    sources: set[pathlib.Path]
+        Sources to format.
+    pool: multiprocessing.pool.Pool
+        Pool of formatter workers.
+    cache: core.Cache
+        Format cache.
+    config: core.Config
+        Config.
+    show_progress: bool
+        Show the number of processed files and the throughput.
+
+    Returns:
+    -------
+    int
+        Exit code.
+    """
+    sources_to_format = sources
+
+    if not config.format.no_cache:
+        sources_to_format = cache.filter_sources(
+            sources=sources,
+        )
 
     changes_detected = False
     files_reformatted = 0
     total_errors = 0
+    hashed_contents: dict[str, str] = {}
+    # Sources verified as already formatted, cached in check and diff modes
+    formatted_sources: set[pathlib.Path] = set()
+
+    progress = core.Progress(total_sources=len(sources_to_format), enabled=show_progress)
+
+    # results are consumed as soon as they are available
+    for formatting_result in pool.imap_unordered(
+        core.workers.format_source,
+        [str(source.resolve()) for source in sources_to_format],
+    ):
+        progress.clear()
 
-    for formatting_result in formatting_results:
         content_changed = (
             formatting_result.formatted_source_code
             != formatting_result.original_source_code
@@ -436,17 +710,12 @@ def format_sources(  # noqa: C901, PLR0912, PLR0913, PLR0915
             files_reformatted += 1
 
         if config.format.diff and content_changed:
-            diff_unified = difflib.unified_diff(
-                formatting_result.original_source_code.splitlines(keepends=True),
-                formatting_result.formatted_source_code.splitlines(keepends=True),
-                fromfile=str(formatting_result.source_file),
-                tofile=str(formatting_result.source_file),
+            _print_diff(
+                source_file=formatting_result.source_file,
+                original_source_code=formatting_result.original_source_code,
+                formatted_source_code=formatting_result.formatted_source_code,
             )
 
-            diff_output = "".join(diff_unified)
-
-            console.print(Syntax(diff_output, "diff", theme="ansi_dark"))
-
         # Only touch the file when its content genuinely changed, so a cache
         # miss on an already-correctly-formatted file never rewrites it.
         if not config.format.check and not config.format.diff and content_changed:
@@ -455,34 +724,293 @@ def format_sources(  # noqa: C901, PLR0912, PLR0913, PLR0915
                 encoding="utf-8",
             )
 
-        errors.print_errors(
+        core.errors.print_errors(
             errors=formatting_result.errors,
             source_file=formatting_result.source_file,
+            source_code=formatting_result.original_source_code,
         )
 
         total_errors += len(formatting_result.errors)
 
+        if formatting_result.digest is not None:
+            hashed_contents[formatting_result.source_file] = formatting_result.digest
+
+        if not content_changed and not formatting_result.errors:
+            formatted_sources.add(pathlib.Path(formatting_result.source_file))
+
+        # Sizes are only needed to report the throughput
+        if progress.enabled:
+            progress.advance(
+                size=len(formatting_result.original_source_code.encode("utf-8")),
+            )
+
+    progress.finish()
+
     if not config.format.check and not config.format.diff:
-        cache.write(sources=sources_to_format)
+        cache.write(sources=sources_to_format, hashed_contents=hashed_contents)
         sys.stdout.write(
-            f"{noqa.NEW_LINE}{files_reformatted} file(s) reformatted, "
-            f"{len(included_sources) - files_reformatted} file(s) left unchanged{noqa.NEW_LINE}",  # noqa: E501
+            f"{core.noqa.NEW_LINE}{files_reformatted} file(s) reformatted, "
+            f"{len(sources) - files_reformatted} file(s) left unchanged{core.noqa.NEW_LINE}",  # noqa: E501
         )
         if total_errors > 0:
-            sys.stdout.write(f"{total_errors} error(s) found{noqa.NEW_LINE}")
-            sys.exit(1)
+            sys.stdout.write(f"{total_errors} error(s) found{core.noqa.NEW_LINE}")
+            return 1
 
-        sys.exit(0)
+        return 0
+
+    # Sources that would change are never cached, so that they are checked again
+    cache.write(sources=formatted_sources, hashed_contents=hashed_contents)
 
     if (
         changes_detected and (config.format.check or config.format.diff)
     ) or total_errors > 0:
         if total_errors > 0:
             sys.stdout.write(
-                f"{noqa.NEW_LINE}{total_errors} error(s) found{noqa.NEW_LINE}",
+                f"{core.noqa.NEW_LINE}{total_errors} error(s) found{core.noqa.NEW_LINE}",
             )
+        return 1
+
+    return 0
+
+
+def _print_diff(
+    *,
+    source_file: str,
+    original_source_code: str,
+    formatted_source_code: str,
+) -> None:
+    """Print the difference between the original and the formatted source code, rich
+    is only imported when there is a difference to print.
+
+    Parameters:
+    ----------
+    source_file: str
+        Path to the source file.
+    original_source_code: str
+        Original source code.
+    formatted_source_code: str
+        Formatted source code.
+
+    Returns:
+    -------
+    None
+    """
+    import difflib  # noqa: PLC0415
+
+    from rich.syntax import Syntax  # noqa: PLC0415
+    from rich.console import Console  # noqa: PLC0415
+
+    diff_unified = difflib.unified_diff(
+        original_source_code.splitlines(keepends=True),
+        formatted_source_code.splitlines(keepends=True),
+        fromfile=source_file,
+        tofile=source_file,
+    )
+
+    Console().print(Syntax("".join(diff_unified), "diff", theme="ansi_dark"))
+
+
+def _parse_config(config_overrides: tuple[str, ...]) -> core.Config:
+    """Parse config, exiting on errors.
+
+    Parameters:
+    ----------
+    config_overrides: tuple[str, ...]
+        TOML key-value pairs overriding configuration options.
+
+    Returns:
+    -------
+    core.Config
+        Config.
+    """
+    try:
+        return core.parse_config(
+            overrides=_parse_config_overrides(config_overrides),
+        )
+    except (
+        core.errors.MissingConfigError,
+        core.errors.InvalidConfigValueError,
+        core.errors.ConfigParseError,
+        core.errors.ConfigFileNotFoundError,
+    ) as error:
+        sys.stderr.write(f"{error}{core.noqa.NEW_LINE}")
         sys.exit(1)
 
 
+def _parse_cache_quantity(
+    parser: typing.Literal["parse_size", "parse_age"],
+) -> abc.Callable[[click.Context, click.Parameter, str | None], float | None]:
+    """Return a click callback parsing a cache quantity with the `parser` of the cache
+    module, which is only imported when the option is given.
+    """
+
+    def callback(
+        _ctx: click.Context,
+        _param: click.Parameter,
+        value: str | None,
+    ) -> float | None:
+        """Parse the value of the option, if given."""
+        if value is None:
+            return None
+
+        try:
+            return getattr(core.cache, parser)(value)  # type: ignore [no-any-return]
+        except ValueError as error:
+            raise click.BadParameter(str(error)) from error
+
+    return callback
+
+
+def cache_options[T](func: abc.Callable[..., T]) -> abc.Callable[..., T]:
+    """Decorator to add common options to each cache subcommand."""
+    return click.option(
+        "--config",
+        "config_overrides",
+        multiple=True,
+        metavar="<CONFIG_OPTION>",
+        help=cli_help.CONFIG_OVERRIDE_HELP,
+    )(func)
+
+
+@cli.command(
+    name="lsp",
+    help="Run the language server, speaking the Language Server Protocol over stdio.",
+)
+@click.option(
+    "--config",
+    "config_overrides",
+    multiple=True,
+    metavar="<CONFIG_OPTION>",
+    help=cli_help.CONFIG_OVERRIDE_HELP,
+)
+def language_server(*, config_overrides: tuple[str, ...]) -> None:
+    """Run the language server.
+
+    Parameters:
+    ----------
+    config_overrides: tuple[str, ...]
+        TOML key-value pairs overriding configuration options.
+
+    Returns:
+    -------
+    None
+    """
+    # the language server is only imported when started
+    from pgrubic.core import lsp  # noqa: PLC0415
+
+    sys.exit(lsp.serve(_parse_config(config_overrides)))
+
+
+@cli.group(name="cache", cls=cli_help.Group, help="Inspect and manage the cache.")
+def cache_group() -> None:
+    """Manage the cache."""
+
+
+@cache_group.command(name="stats", help="Show the number of files and size of the cache.")
+@cache_options
+def cache_stats(*, config_overrides: tuple[str, ...]) -> None:
+    """Show cache statistics.
+
+    Parameters:
+    ----------
+    config_overrides: tuple[str, ...]
+        TOML key-value pairs overriding configuration options.
+
+    Returns:
+    -------
+    None
+    """
+    config = _parse_config(config_overrides)
+
+    sys.stdout.write(
+        f"Cache directory: {core.cache.cache_directory(config)}{core.noqa.NEW_LINE}"
+    )
+
+    cache_usage = core.cache.usage(config)
+
+    if not cache_usage:
+        sys.stdout.write(f"No cache found{core.noqa.NEW_LINE}")
+
+    for version, version_usage in cache_usage.items():
+        current = " (current)" if version == __version__ else ""
+        sys.stdout.write(
+            f"{version}{current}: {version_usage.files} file(s), "
+            f"{core.cache.format_size(version_usage.size)}{core.noqa.NEW_LINE}",
+        )
+
+
+@cache_group.command(name="clean", help="Remove the cache of every version.")
+@cache_options
+def cache_clean(*, config_overrides: tuple[str, ...]) -> None:
+    """Remove the cache.
+
+    Parameters:
+    ----------
+    config_overrides: tuple[str, ...]
+        TOML key-value pairs overriding configuration options.
+
+    Returns:
+    -------
+    None
+    """
+    removed = core.cache.clean(_parse_config(config_overrides))
+
+    sys.stdout.write(
+        f"Removed {removed.files} file(s), "
+        f"{core.cache.format_size(removed.size)}{core.noqa.NEW_LINE}",
+    )
+
+
+@cache_group.command(
+    name="prune",
+    short_help="Remove old and least recently used cache files.",
+    help="Remove the cache of other versions and the cache files of the current version that are too old or exceed the size budget, least recently used first.",  # noqa: E501
+)
+@click.option(
+    "--max-size",
+    callback=_parse_cache_quantity("parse_size"),
+    metavar="<SIZE>",
+    help="Maximum size of the cache, such as 500K, 100M or 1G.",
+)
+@click.option(
+    "--max-age",
+    callback=_parse_cache_quantity("parse_age"),
+    metavar="<AGE>",
+    help="Maximum time since a cache file was last used, such as 12h, 30d or 2w.",
+)
+@cache_options
+def cache_prune(
+    *,
+    max_size: int | None,
+    max_age: float | None,
+    config_overrides: tuple[str, ...],
+) -> None:
+    """Prune the cache.
+
+    Parameters:
+    ----------
+    max_size: int | None
+        Maximum size of the cache, in bytes.
+    max_age: float | None
+        Maximum time since a cache file was last used, in seconds.
+    config_overrides: tuple[str, ...]
+        TOML key-value pairs overriding configuration options.
+
+    Returns:
+    -------
+    None
+    """
+    removed = core.cache.prune(
+        _parse_config(config_overrides),
+        max_size=max_size,
+        max_age=max_age,
+    )
+
+    sys.stdout.write(
+        f"Removed {removed.files} file(s), "
+        f"{core.cache.format_size(removed.size)}{core.noqa.NEW_LINE}",
+    )
+
+
 if __name__ == "__main__":
     cli()
@@ -1,28 +1,116 @@
-"""Core functionalities."""
+"""Core functionalities.
+
+Submodules and their objects are imported on first access, so that each command only
+imports what it uses.
+"""
+
+from __future__ import annotations
+
+import typing
+import importlib
 
-from pgrubic.core import cache, enums, config, visitors
-from pgrubic.core.cache import Cache
-from pgrubic.core.config import Config, parse_config
-from pgrubic.core.linter import Linter, BaseChecker, ViolationStats
-from pgrubic.core.loader import load_rules, load_formatters
 from pgrubic.core.logger import logger
-from pgrubic.core.filters import filter_sources
-from pgrubic.core.formatter import Formatter
+
+if typing.TYPE_CHECKING:
+    from pgrubic.core import (  # pragma: no cover
+        noqa,
+        cache,
+        enums,
+        config,
+        errors,
+        loader,
+        watcher,
+        workers,
+        visitors,
+    )
+    from pgrubic.core.cache import Cache, LintCache  # pragma: no cover
+    from pgrubic.core.config import Config, parse_config  # pragma: no cover
+    from pgrubic.core.linter import (  # pragma: no cover
+        Linter,
+        BaseChecker,
+        ViolationStats,
+    )
+    from pgrubic.core.loader import load_rules, load_formatters  # pragma: no cover
+    from pgrubic.core.filters import filter_sources  # pragma: no cover
+    from pgrubic.core.progress import Progress  # pragma: no cover
+    from pgrubic.core.formatter import Formatter  # pragma: no cover
 
 __all__ = [
     "BaseChecker",
     "Cache",
     "Config",
     "Formatter",
+    "LintCache",
     "Linter",
+    "Progress",
     "ViolationStats",
     "cache",
     "config",
     "enums",
+    "errors",
     "filter_sources",
     "load_formatters",
     "load_rules",
+    "loader",
     "logger",
+    "noqa",
     "parse_config",
     "visitors",
+    "watcher",
+    "workers",
 ]
+
+_SUBMODULES: typing.Final[frozenset[str]] = frozenset(
+    {
+        "cache",
+        "config",
+        "enums",
+        "errors",
+        "loader",
+        "noqa",
+        "visitors",
+        "watcher",
+        "workers",
+    },
+)
+
+# Object name to the submodule defining it
+_OBJECTS: typing.Final[dict[str, str]] = {
+    "BaseChecker": "linter",
+    "Cache": "cache",
+    "Config": "config",
+    "Formatter": "formatter",
+    "LintCache": "cache",
+    "Linter": "linter",
+    "Progress": "progress",
+    "ViolationStats": "linter",
+    "filter_sources": "filters",
+    "load_formatters": "loader",
+    "load_rules": "loader",
+    "parse_config": "config",
+}
+
+
+def __getattr__(name: str) -> object:
+    """Import a submodule or an object of a submodule on first access.
+
+    Parameters:
+    ----------
+    name: str
+        Name of the submodule or object.
+
+    Returns:
+    -------
+    object
+        Submodule or object.
+    """
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    if name in _OBJECTS:
+        value = getattr(importlib.import_module(f"{__name__}.{_OBJECTS[name]}"), name)
+        globals()[name] = value
+        return value
+
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -1,16 +1,29 @@
-"""Caching of formatted files."""
+"""Caching of formatted files and lint results."""
 
+from __future__ import annotations
+
+import io
 import os
+import re
+import json
+import time
+import shutil
 import typing
 import hashlib
 import pathlib
 import tempfile
+import functools
+import contextlib
+import concurrent.futures
 
 import msgpack
 
 import pgrubic
 from pgrubic import PACKAGE_NAME
-from pgrubic.core import config
+from pgrubic.core import noqa, config, errors, linter, loader, selection
+
+if typing.TYPE_CHECKING:
+    from collections import abc  # pragma: no cover
 
 CACHE_FILE_NAME_LENGTH: typing.Final[int] = 20
 
@@ -18,6 +31,143 @@ CACHE_DIR_ENVIRONMENT_VARIABLE: typing.Final[str] = f"{PACKAGE_NAME.upper()}_CAC
 
 DEFAULT_CACHE_DIR: typing.Final[str] = ".pgrubic_cache"
 
+# Runs after which the entries of sources that were not seen are evicted
+MAX_UNSEEN_RUNS: typing.Final[int] = 50
+
+# Time after which unused lint results and statement tables are evicted, in seconds
+MAX_UNUSED_AGE: typing.Final[int] = 30 * 24 * 60 * 60
+
+# Minimum time between two evictions, in seconds
+EVICTION_INTERVAL: typing.Final[int] = 24 * 60 * 60
+
+# Names of the caches in a version directory, and of the temporary files written there
+CACHE_NAME_PATTERN: typing.Final[re.Pattern[str]] = re.compile(
+    rf"[0-9a-f]{{{CACHE_FILE_NAME_LENGTH}}}|tmp\w+",
+)
+
+SIZE_UNITS: typing.Final[dict[str, int]] = {
+    "B": 1,
+    "K": 1000,
+    "M": 1000**2,
+    "G": 1000**3,
+}
+
+AGE_UNITS: typing.Final[dict[str, int]] = {
+    "s": 1,
+    "m": 60,
+    "h": 60 * 60,
+    "d": 24 * 60 * 60,
+    "w": 7 * 24 * 60 * 60,
+}
+
+
+# Size of the blocks source files are hashed by
+HASH_BLOCK_SIZE: typing.Final[int] = 1024 * 1024
+
+# Config fields that do not affect lint results
+LINT_CONFIG_EXCLUDED_FIELDS: typing.Final[frozenset[str]] = frozenset(
+    {"include", "exclude", "no_cache"},
+)
+
+# Config fields that do not affect formatting
+FORMAT_CONFIG_EXCLUDED_FIELDS: typing.Final[frozenset[str]] = frozenset(
+    {"include", "exclude", "diff", "check", "no_cache"},
+)
+
+
+def _set_cache_dir_from_environment(config: config.Config) -> None:
+    """Set the cache directory from the environment variable, if set and the cache
+    directory is the default one.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    None
+    """
+    if (
+        os.getenv(CACHE_DIR_ENVIRONMENT_VARIABLE)
+        and str(config.cache_dir) == DEFAULT_CACHE_DIR
+    ):
+        config.cache_dir = pathlib.Path(
+            os.environ[CACHE_DIR_ENVIRONMENT_VARIABLE],
+        )
+
+
+def _json_default(value: object) -> object:
+    """Serialize config values that are not natively serializable, sets are sorted so
+    that the serialization does not depend on the hash seed.
+    """
+    if isinstance(value, set | frozenset):
+        return sorted(value)
+
+    return str(value)
+
+
+def _config_digest(*sections: dict[str, object]) -> bytes:
+    """Return hash digest of config sections.
+
+    Parameters:
+    ----------
+    *sections: dict[str, object]
+        Dumped config sections.
+
+    Returns:
+    -------
+    bytes
+        Hash digest of the config sections.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            sections,
+            sort_keys=True,
+            default=_json_default,
+        ).encode("utf-8"),
+    ).digest()
+
+
+def lint_config_digest(config: config.Config) -> bytes:
+    """Return hash digest of the config fields that affect lint results.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    bytes
+        Hash digest of the config.
+    """
+    return _config_digest(
+        config.lint.model_dump(exclude=set(LINT_CONFIG_EXCLUDED_FIELDS)),
+        # Fixes and inline sql statements go through the formatter
+        config.format.model_dump(exclude=set(FORMAT_CONFIG_EXCLUDED_FIELDS)),
+        # Results change with the installed rule packs
+        {rule_pack.name: rule_pack.version for rule_pack in loader.load_rule_packs()},
+    )
+
+
+def format_config_digest(config: config.Config) -> bytes:
+    """Return hash digest of the config fields that affect formatting.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    bytes
+        Hash digest of the config.
+    """
+    return _config_digest(
+        config.format.model_dump(exclude=set(FORMAT_CONFIG_EXCLUDED_FIELDS)),
+    )
+
 
 class FileData(typing.NamedTuple):
     """Representation of file data."""
@@ -25,10 +175,19 @@ class FileData(typing.NamedTuple):
     size: int
     last_modified_time: float
     hashed_content: str
+    last_seen_run: int = 0
 
 
 class Cache:
-    """Caching of formatted files."""
+    """Caching of formatted files.
+
+    The cache file is read once per run. Sources whose size or modified time changed
+    are formatted without hashing them, the others are hashed in a thread pool to
+    confirm that their content is unchanged.
+
+    Each write counts as a run. Entries of sources that no longer exist, or that have
+    not been seen for `MAX_UNSEEN_RUNS` runs, are evicted on write.
+    """
 
     def __init__(
         self,
@@ -37,13 +196,7 @@ class Cache:
     ) -> None:
         """Initialize variables."""
         self.config = config
-        if (
-            os.getenv(CACHE_DIR_ENVIRONMENT_VARIABLE)
-            and str(self.config.cache_dir) == DEFAULT_CACHE_DIR
-        ):
-            self.config.cache_dir = pathlib.Path(
-                os.environ[CACHE_DIR_ENVIRONMENT_VARIABLE],
-            )
+        _set_cache_dir_from_environment(config)
 
         self.cache_dir = config.cache_dir.resolve() / pgrubic.__version__
         self.cache_file = (
@@ -51,86 +204,69 @@ class Cache:
             / hashlib.sha256(b"formatter.cache").hexdigest()[:CACHE_FILE_NAME_LENGTH]
         )
 
+        self._file_data: dict[str, FileData] | None = None
+        self._run = 0
+
+        # Resolved paths of the sources seen in this run
+        self._seen_sources: set[str] = set()
+
     def _read(self) -> dict[str, FileData]:
-        """Read the cache file if it exists."""
-        if not self.cache_file.exists():
-            return {}
-
-        with self.cache_file.open("rb") as f:
-            cache: dict[str, tuple[int, float, str]] = msgpack.unpack(f)
-            return {
-                k: FileData(size=v[0], last_modified_time=v[1], hashed_content=v[2])
-                for k, v in cache.items()
-            }
-
-    def _hash_digest(self, source: pathlib.Path) -> str:
-        """Return hash digest of the content of source and config.
+        """Read the cache file if it exists, only once."""
+        if self._file_data is not None:
+            return self._file_data
 
-        Parameters:
-        ----------
-        source: pathlib.Path
-            Path to the source file.
+        self._file_data = {}
 
-        Returns:
-        -------
-        str
-            Hash digest of the content of source and config.
-        """
-        hasher = hashlib.sha256()
-        hasher.update(source.read_bytes())
-        hasher.update(msgpack.packb(self.config.format.__repr__()))
-        return hasher.hexdigest()
+        if self.cache_file.exists():
+            with self.cache_file.open("rb") as f:
+                cache: dict[str, typing.Any] = msgpack.unpack(f)
+
+            # Cache files written before runs were counted are discarded
+            if "files" in cache:
+                self._run = cache["run"]
+                self._file_data = {k: FileData(*v) for k, v in cache["files"].items()}
 
-    def _get_file_data(self, source: pathlib.Path) -> FileData:
-        """Return file data for source.
+        return self._file_data
+
+    def hash_digest(self, content: bytes, *, config_digest: bytes | None = None) -> str:
+        """Return hash digest of content and config.
 
         Parameters:
         ----------
-        source: pathlib.Path
-            Path to the source file.
+        content: bytes
+            Content of a source file.
+        config_digest: bytes | None
+            Hash digest of the config, computed from the config when not given.
 
         Returns:
         -------
-        FileData
-            File data for source.
+        str
+            Hash digest of content and config.
         """
-        file_stat = source.stat()
-        hashed_content = self._hash_digest(source)
-        return FileData(
-            size=file_stat.st_size,
-            last_modified_time=file_stat.st_mtime,
-            hashed_content=hashed_content,
+        hasher = hashlib.sha256(content)
+        hasher.update(
+            config_digest
+            if config_digest is not None
+            else format_config_digest(self.config),
         )
+        return hasher.hexdigest()
 
-    def _need_to_be_formatted(self, source: pathlib.Path) -> bool:
-        """Check if source needs to be formatted.
+    def _hash_digest(self, source: pathlib.Path, *, config_digest: bytes) -> str:
+        """Return hash digest of the content of source and config.
 
         Parameters:
         ----------
         source: pathlib.Path
             Path to the source file.
+        config_digest: bytes
+            Hash digest of the config.
 
         Returns:
         -------
-        bool
-            True if source needs to be formatted, False otherwise.
+        str
+            Hash digest of the content of source and config.
         """
-        cache = self._read()
-        resolved_source = source.resolve()
-        cached_version = cache.get(str(resolved_source))
-        if not cached_version:
-            return True
-
-        source_stat = resolved_source.stat()
-
-        if source_stat.st_size != cached_version.size:
-            return True
-
-        if source_stat.st_mtime != cached_version.last_modified_time:
-            return True
-
-        new_file_hash = self._hash_digest(resolved_source)
-        return new_file_hash != cached_version.hashed_content
+        return self.hash_digest(source.read_bytes(), config_digest=config_digest)
 
     def filter_sources(self, sources: set[pathlib.Path]) -> set[pathlib.Path]:
         """Return sources that need to be formatted.
@@ -145,32 +281,118 @@ class Cache:
         set[pathlib.Path]
             Set of sources that need to be formatted.
         """
+        cache = self._read()
+
         sources_to_be_formatted: set[pathlib.Path] = set()
+        sources_to_be_hashed: list[tuple[pathlib.Path, FileData]] = []
+
         for source in sources:
-            if self._need_to_be_formatted(source):
+            resolved_source = source.resolve()
+            self._seen_sources.add(str(resolved_source))
+            cached_version = cache.get(str(resolved_source))
+
+            if not cached_version:
+                sources_to_be_formatted.add(source)
+                continue
+
+            source_stat = resolved_source.stat()
+
+            if (
+                source_stat.st_size != cached_version.size
+                or source_stat.st_mtime != cached_version.last_modified_time
+            ):
                 sources_to_be_formatted.add(source)
+                continue
+
+            sources_to_be_hashed.append((source, cached_version))
+
+        config_digest = format_config_digest(self.config)
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            hashed_contents = executor.map(
+                functools.partial(self._hash_digest, config_digest=config_digest),
+                [source.resolve() for source, _ in sources_to_be_hashed],
+            )
+
+            sources_to_be_formatted.update(
+                source
+                for (source, cached_version), hashed_content in zip(
+                    sources_to_be_hashed,
+                    hashed_contents,
+                    strict=True,
+                )
+                if hashed_content != cached_version.hashed_content
+            )
 
         return sources_to_be_formatted
 
-    def write(self, sources: set[pathlib.Path]) -> None:
+    def write(
+        self,
+        sources: set[pathlib.Path],
+        *,
+        hashed_contents: dict[str, str] | None = None,
+    ) -> None:
         """Generate the cache data for sources and write a new cache file.
 
         Parameters:
         ----------
         sources: set[pathlib.Path]
             Set of source files.
+        hashed_contents: dict[str, str] | None
+            Hash digests of the content of sources by resolved path, as returned by
+            the workers that formatted them. Sources without one are read and hashed.
 
         Returns:
         -------
         None
         """
         cache = self._read()
-        file_data: dict[str, FileData] = {
-            str(source.resolve()): self._get_file_data(source) for source in sources
-        }
+        run = self._run + 1
+
+        seen_sources = [path for path in self._seen_sources if path in cache]
+
+        # Seen entries are refreshed once halfway through their lifetime, so that runs
+        # where every source is cached do not rewrite the cache file
+        if not sources and all(
+            run - cache[path].last_seen_run < MAX_UNSEEN_RUNS // 2
+            for path in seen_sources
+        ):
+            return
+
+        hashed_contents = hashed_contents or {}
+        config_digest = format_config_digest(self.config)
+
+        for path in seen_sources:
+            cache[path] = cache[path]._replace(last_seen_run=run)
+
+        for source in sources:
+            resolved_source = source.resolve()
+            file_stat = resolved_source.stat()
+
+            hashed_content = hashed_contents.get(str(resolved_source))
+
+            if hashed_content is None:
+                hashed_content = self._hash_digest(
+                    resolved_source,
+                    config_digest=config_digest,
+                )
 
-        # Maintain cache for previous sources that are not in the new sources
-        file_data.update({k: v for k, v in cache.items() if k not in file_data})
+            # Previous sources that are not in the new sources are maintained
+            cache[str(resolved_source)] = FileData(
+                size=file_stat.st_size,
+                last_modified_time=file_stat.st_mtime,
+                hashed_content=hashed_content,
+                last_seen_run=run,
+            )
+
+        for path, file_data in list(cache.items()):
+            if (
+                run - file_data.last_seen_run > MAX_UNSEEN_RUNS
+                or not pathlib.Path(path).exists()
+            ):
+                del cache[path]
+
+        self._run = run
 
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
@@ -178,10 +400,784 @@ class Cache:
             dir=str(self.cache_file.parent),
             delete=False,
         ) as tf:
-            data: dict[str, tuple[int, float, str]] = {
-                k: (v.size, v.last_modified_time, v.hashed_content)
-                for k, v in file_data.items()
-            }
-            msgpack.pack(data, tf)
+            msgpack.pack({"run": run, "files": cache}, tf)
 
         pathlib.Path.replace(pathlib.Path(tf.name), self.cache_file)
+
+
+class HashingReader(io.RawIOBase):
+    """Binary reader updating a hasher with what it reads, so that a stream is hashed
+    as it is consumed.
+    """
+
+    def __init__(self, raw: typing.BinaryIO, *, hasher: hashlib._Hash) -> None:
+        """Initialize variables."""
+        self.raw = raw
+        self.hasher = hasher
+
+    def readable(self) -> bool:
+        """Whether the reader is readable."""
+        return True
+
+    def readinto(self, buffer: abc.Buffer) -> int:
+        """Read into buffer, hashing what is read."""
+        view = memoryview(buffer)
+        data = self.raw.read(len(view))
+        view[: len(data)] = data
+        self.hasher.update(data)
+
+        return len(data)
+
+
+class LintCache:
+    """Caching of lint results, keyed by the content of the source file, the config and
+    the pgrubic version. Results are stored one file per key, so that workers read and
+    write them concurrently and renamed or copied files are answered from the cache.
+    Results not used for `MAX_UNUSED_AGE` seconds are evicted by `evict`.
+    """
+
+    def __init__(
+        self,
+        *,
+        config: config.Config,
+    ) -> None:
+        """Initialize variables."""
+        self.config = config
+        _set_cache_dir_from_environment(config)
+
+        self.cache_dir = (
+            config.cache_dir.resolve()
+            / pgrubic.__version__
+            / hashlib.sha256(b"linter.cache").hexdigest()[:CACHE_FILE_NAME_LENGTH]
+        )
+        self.config_digest = lint_config_digest(config)
+        self.rule_selection = selection.compile_rule_selection(
+            config.lint,
+            codes=loader.rule_entries(),
+        )
+
+    def hasher(self, source: pathlib.Path) -> hashlib._Hash:
+        """Return the hasher of the cache key of source, to be updated with its content.
+        As the same content is linted with other rules in files selecting rules per
+        file, the enabled rules are hashed as well.
+
+        Parameters:
+        ----------
+        source: pathlib.Path
+            Path to the source file.
+
+        Returns:
+        -------
+        hashlib._Hash
+            Hasher of the config and enabled rules.
+        """
+        hasher = hashlib.sha256(self.config_digest)
+
+        if self.rule_selection.has_per_file_rules:
+            hasher.update(
+                ",".join(sorted(self.rule_selection.file_rules(str(source)))).encode(),
+            )
+
+        return hasher
+
+    def key(self, source: pathlib.Path, *, content: bytes | None = None) -> str:
+        """Return the cache key of source.
+
+        Parameters:
+        ----------
+        source: pathlib.Path
+            Path to the source file.
+        content: bytes | None
+            Content of source, read and hashed by blocks if not given.
+
+        Returns:
+        -------
+        str
+            Hash digest of the content of source and config.
+        """
+        hasher = self.hasher(source)
+
+        if content is not None:
+            hasher.update(content)
+            return hasher.hexdigest()
+
+        with source.open("rb") as f:
+            while block := f.read(HASH_BLOCK_SIZE):
+                hasher.update(block)
+
+        return hasher.hexdigest()
+
+    def read(self, *, key: str, source_file: str) -> linter.LintResult | None:
+        """Read the cached lint result of a key, if any.
+
+        Parameters:
+        ----------
+        key: str
+            Cache key of the source file.
+        source_file: str
+            Path to the source file.
+
+        Returns:
+        -------
+        linter.LintResult | None
+            Cached lint result, None if there is none.
+        """
+        cache_file = self.cache_dir / key
+
+        if not cache_file.exists():
+            return None
+
+        with cache_file.open("rb") as f:
+            cached_violations, cached_errors, cached_lint_ignores = msgpack.unpack(f)
+
+        # Cache files are pruned by last use
+        cache_file.touch()
+
+        violations: set[linter.Violation] = set()
+
+        for (
+            rule_code,
+            line_number,
+            column_offset,
+            line_start,
+            line_end,
+            statement_location,
+            description,
+            is_auto_fixable,
+            is_fix_enabled,
+            help_,
+            line,
+        ) in cached_violations:
+            violation = linter.Violation(
+                rule_code=rule_code,
+                line_number=line_number,
+                column_offset=column_offset,
+                line_span=(line_start, line_end),
+                statement_location=statement_location,
+                description=description,
+                is_auto_fixable=is_auto_fixable,
+                is_fix_enabled=is_fix_enabled,
+                help=help_,
+            )
+            violation.line = line
+            violations.add(violation)
+
+        return linter.LintResult(
+            source_file=source_file,
+            violations=violations,
+            errors={
+                errors.Error(
+                    source_file=source_file,
+                    statement_start_location=statement_start_location,
+                    statement_end_location=statement_end_location,
+                    line_number=line_number,
+                    message=message,
+                    hint=hint,
+                    statement=statement,
+                )
+                for (
+                    statement_start_location,
+                    statement_end_location,
+                    line_number,
+                    message,
+                    hint,
+                    statement,
+                ) in cached_errors
+            },
+            unused_lint_ignores=tuple(
+                noqa.NoQaDirective(
+                    location=location,
+                    line_number=line_number,
+                    column_offset=column_offset,
+                    rule=rule,
+                )
+                for location, line_number, column_offset, rule in cached_lint_ignores
+            ),
+        )
+
+    def write(self, *, key: str, lint_result: linter.LintResult) -> None:
+        """Write the lint result of a key. Results with fixes are not cached, as the
+        source file is rewritten with the fixed source code.
+
+        Parameters:
+        ----------
+        key: str
+            Cache key of the source file.
+        lint_result: linter.LintResult
+            Lint result of the source file.
+
+        Returns:
+        -------
+        None
+        """
+        if lint_result.fixed_source_code is not None:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(
+            dir=str(self.cache_dir),
+            delete=False,
+        ) as tf:
+            msgpack.pack(
+                (
+                    [
+                        (
+                            violation.rule_code,
+                            violation.line_number,
+                            violation.column_offset,
+                            violation.line_start,
+                            violation.line_end,
+                            violation.statement_location,
+                            violation.description,
+                            violation.is_auto_fixable,
+                            violation.is_fix_enabled,
+                            violation.help,
+                            violation.line,
+                        )
+                        for violation in lint_result.violations
+                    ],
+                    [
+                        (
+                            error.statement_start_location,
+                            error.statement_end_location,
+                            error.line_number,
+                            error.message,
+                            error.hint,
+                            error.statement,
+                        )
+                        for error in lint_result.errors
+                    ],
+                    [
+                        (
+                            directive.location,
+                            directive.line_number,
+                            directive.column_offset,
+                            directive.rule,
+                        )
+                        for directive in lint_result.unused_lint_ignores
+                    ],
+                ),
+                tf,
+            )
+
+        pathlib.Path.replace(pathlib.Path(tf.name), self.cache_dir / key)
+
+
+class StatementCache:
+    """Caching of lint or format results per statement, keyed by the statement text
+    and the config, so that editing a statement only reprocesses that statement.
+
+    Results are kept in one table per source file, opened before processing the source
+    file and closed after it. A table only keeps the statements of the last processed
+    version of its source file, tables not used for `MAX_UNUSED_AGE` seconds are evicted
+    by `evict`.
+    """
+
+    def __init__(
+        self,
+        *,
+        config: config.Config,
+        name: str,
+        config_digest: bytes,
+        read: bool = True,
+    ) -> None:
+        """Initialize variables."""
+        self.config = config
+        _set_cache_dir_from_environment(config)
+
+        self.cache_dir = (
+            config.cache_dir.resolve()
+            / pgrubic.__version__
+            / hashlib.sha256(f"{name}.statements.cache".encode()).hexdigest()[
+                :CACHE_FILE_NAME_LENGTH
+            ]
+        )
+        self.config_digest = config_digest
+        self.read = read
+
+        self.cache_file: pathlib.Path | None = None
+        self.cached_entries: dict[str, typing.Any] = {}
+        self.entries: dict[str, typing.Any] = {}
+
+    def key(self, text: str) -> str:
+        """Return the cache key of a statement.
+
+        Parameters:
+        ----------
+        text: str
+            Statement text.
+
+        Returns:
+        -------
+        str
+            Hash digest of the statement text and config.
+        """
+        hasher = hashlib.sha256(self.config_digest)
+        hasher.update(text.encode("utf-8"))
+        return hasher.hexdigest()
+
+    def open(self, source_file: str) -> None:
+        """Open the table of a source file.
+
+        Parameters:
+        ----------
+        source_file: str
+            Path to the source file.
+
+        Returns:
+        -------
+        None
+        """
+        self.cache_file = (
+            self.cache_dir / hashlib.sha256(source_file.encode("utf-8")).hexdigest()
+        )
+        self.cached_entries = {}
+        self.entries = {}
+
+        if self.read and self.cache_file.exists():
+            with self.cache_file.open("rb") as f:
+                self.cached_entries = msgpack.unpack(f)
+
+            # Tables are pruned by last use
+            self.cache_file.touch()
+
+    def get(self, text: str) -> typing.Any:
+        """Return the cached result of a statement, if any, keeping it in the table.
+
+        Parameters:
+        ----------
+        text: str
+            Statement text.
+
+        Returns:
+        -------
+        typing.Any
+            Cached result, None if there is none.
+        """
+        key = self.key(text)
+        entry = self.cached_entries.get(key)
+
+        if entry is not None:
+            self.entries[key] = entry
+
+        return entry
+
+    def put(self, text: str, entry: object) -> None:
+        """Store the result of a statement.
+
+        Parameters:
+        ----------
+        text: str
+            Statement text.
+        entry: object
+            Result of the statement, serializable by msgpack.
+
+        Returns:
+        -------
+        None
+        """
+        self.entries[self.key(text)] = entry
+
+    def close(self) -> None:
+        """Write the table of the opened source file, if it has changed.
+
+        Returns:
+        -------
+        None
+        """
+        if self.cache_file is None:
+            return
+
+        if self.entries.keys() != self.cached_entries.keys():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile(
+                dir=str(self.cache_dir),
+                delete=False,
+            ) as tf:
+                msgpack.pack(self.entries, tf)
+
+            pathlib.Path.replace(pathlib.Path(tf.name), self.cache_file)
+
+        self.cache_file = None
+        self.cached_entries = {}
+        self.entries = {}
+
+
+class MemoryStatementCache(StatementCache):
+    """Statement cache kept in memory, with one table per source file, for long-lived
+    processes such as the language server where documents are processed on each edit.
+    """
+
+    def __init__(self, *, config_digest: bytes) -> None:
+        """Initialize variables."""
+        self.config_digest = config_digest
+        self.read = True
+
+        self.cache_file = None
+        self.cached_entries = {}
+        self.entries = {}
+
+        self.source_file: str | None = None
+        self.tables: dict[str, dict[str, typing.Any]] = {}
+
+    def open(self, source_file: str) -> None:
+        """Open the table of a source file.
+
+        Parameters:
+        ----------
+        source_file: str
+            Path to the source file.
+
+        Returns:
+        -------
+        None
+        """
+        self.source_file = source_file
+        self.cached_entries = self.tables.get(source_file, {})
+        self.entries = {}
+
+    def close(self) -> None:
+        """Keep the table of the opened source file.
+
+        Returns:
+        -------
+        None
+        """
+        if self.source_file is None:
+            return
+
+        self.tables[self.source_file] = self.entries
+
+        self.source_file = None
+        self.cached_entries = {}
+        self.entries = {}
+
+    def discard(self, source_file: str) -> None:
+        """Discard the table of a source file.
+
+        Parameters:
+        ----------
+        source_file: str
+            Path to the source file.
+
+        Returns:
+        -------
+        None
+        """
+        self.tables.pop(source_file, None)
+
+
+class CacheUsage(typing.NamedTuple):
+    """Number of files and size of a cache."""
+
+    files: int = 0
+    size: int = 0
+
+
+def cache_directory(config: config.Config) -> pathlib.Path:
+    """Return the cache directory.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    pathlib.Path
+        Resolved cache directory.
+    """
+    _set_cache_dir_from_environment(config)
+
+    return config.cache_dir.resolve()
+
+
+def _version_directories(config: config.Config) -> list[pathlib.Path]:
+    """Return the directories of the cache per version. Directories holding anything
+    else than caches are never returned, so that they are never removed.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    list[pathlib.Path]
+        Version directories.
+    """
+    directory = cache_directory(config)
+
+    if not directory.is_dir():
+        return []
+
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_dir()
+        and all(CACHE_NAME_PATTERN.fullmatch(child.name) for child in path.iterdir())
+    )
+
+
+def _cache_files(directory: pathlib.Path) -> list[tuple[pathlib.Path, os.stat_result]]:
+    """Return the files of a cache directory with their status.
+
+    Parameters:
+    ----------
+    directory: pathlib.Path
+        Cache directory.
+
+    Returns:
+    -------
+    list[tuple[pathlib.Path, os.stat_result]]
+        Files with their status.
+    """
+    return [(path, path.stat()) for path in directory.rglob("*") if path.is_file()]
+
+
+def _usage(files: list[tuple[pathlib.Path, os.stat_result]]) -> CacheUsage:
+    """Return the usage of cache files.
+
+    Parameters:
+    ----------
+    files: list[tuple[pathlib.Path, os.stat_result]]
+        Files with their status.
+
+    Returns:
+    -------
+    CacheUsage
+        Usage of the files.
+    """
+    return CacheUsage(
+        files=len(files),
+        size=sum(file_stat.st_size for _, file_stat in files),
+    )
+
+
+def usage(config: config.Config) -> dict[str, CacheUsage]:
+    """Return the usage of the cache per version.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    dict[str, CacheUsage]
+        Usage of the cache per version.
+    """
+    return {
+        directory.name: _usage(_cache_files(directory))
+        for directory in _version_directories(config)
+    }
+
+
+def clean(config: config.Config) -> CacheUsage:
+    """Remove the cache of every version.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    CacheUsage
+        Usage of the removed cache.
+    """
+    removed_files: list[tuple[pathlib.Path, os.stat_result]] = []
+
+    for directory in _version_directories(config):
+        removed_files.extend(_cache_files(directory))
+        shutil.rmtree(directory)
+
+    # The cache directory is kept if anything else is in it
+    with contextlib.suppress(OSError):
+        cache_directory(config).rmdir()
+
+    return _usage(removed_files)
+
+
+def prune(
+    config: config.Config,
+    *,
+    max_size: int | None = None,
+    max_age: float | None = None,
+) -> CacheUsage:
+    """Remove the cache of other versions, then the cache files of the current version
+    not used for `max_age` seconds, then the least recently used cache files until the
+    cache fits in `max_size` bytes.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+    max_size: int | None
+        Maximum size of the cache, in bytes.
+    max_age: float | None
+        Maximum time since a cache file was last used, in seconds.
+
+    Returns:
+    -------
+    CacheUsage
+        Usage of the removed cache.
+    """
+    removed_files: list[tuple[pathlib.Path, os.stat_result]] = []
+    files: list[tuple[pathlib.Path, os.stat_result]] = []
+
+    for directory in _version_directories(config):
+        if directory.name == pgrubic.__version__:
+            files = _cache_files(directory)
+            continue
+
+        removed_files.extend(_cache_files(directory))
+        shutil.rmtree(directory)
+
+    # Least recently used first
+    files.sort(key=lambda file: file[1].st_mtime)
+
+    if max_age is not None:
+        oldest_time = time.time() - max_age
+
+        while files and files[0][1].st_mtime < oldest_time:
+            removed_files.append(files.pop(0))
+
+    if max_size is not None:
+        size = _usage(files).size
+
+        while files and size > max_size:
+            path, file_stat = files.pop(0)
+            size -= file_stat.st_size
+            removed_files.append((path, file_stat))
+
+    for path, _ in removed_files:
+        path.unlink(missing_ok=True)
+
+    return _usage(removed_files)
+
+
+def evict(config: config.Config) -> CacheUsage:
+    """Remove the lint results and statement tables of the current version not used for
+    `MAX_UNUSED_AGE` seconds, such as those of deleted or rewritten source files. As
+    every cache file has to be checked, this is done at most once per
+    `EVICTION_INTERVAL` seconds, the time of the last eviction being kept in a marker
+    file. The format cache evicts its own entries on write.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    CacheUsage
+        Usage of the removed cache.
+    """
+    directory = cache_directory(config) / pgrubic.__version__
+    marker = directory / hashlib.sha256(b"eviction").hexdigest()[:CACHE_FILE_NAME_LENGTH]
+    now = time.time()
+
+    if not directory.is_dir() or (
+        marker.exists() and now - marker.stat().st_mtime < EVICTION_INTERVAL
+    ):
+        return CacheUsage()
+
+    marker.touch()
+
+    # Only the files of the cache directories, not the format cache or the marker
+    removed_files = [
+        (path, file_stat)
+        for path, file_stat in _cache_files(directory)
+        if path.parent != directory and file_stat.st_mtime < now - MAX_UNUSED_AGE
+    ]
+
+    for path, _ in removed_files:
+        path.unlink(missing_ok=True)
+
+    return _usage(removed_files)
+
+
+def _parse_quantity(value: str, *, units: dict[str, int], default_unit: str) -> float:
+    """Parse a quantity made of a number and an optional unit.
+
+    Parameters:
+    ----------
+    value: str
+        Quantity.
+    units: dict[str, int]
+        Multiplier of each unit.
+    default_unit: str
+        Unit of quantities without one.
+
+    Returns:
+    -------
+    float
+        Quantity in the base unit.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]?)\s*", value)
+
+    if not match or (match.group(2) or default_unit) not in units:
+        msg = (
+            f"Invalid value {value!r}, expected a number optionally followed by one"
+            f" of: {', '.join(units)}"
+        )
+        raise ValueError(msg)
+
+    return float(match.group(1)) * units[match.group(2) or default_unit]
+
+
+def parse_size(value: str) -> int:
+    """Parse a size such as `500K`, `100M` or `1G` into bytes.
+
+    Parameters:
+    ----------
+    value: str
+        Size.
+
+    Returns:
+    -------
+    int
+        Size in bytes.
+    """
+    return int(
+        _parse_quantity(value.upper(), units=SIZE_UNITS, default_unit="B"),
+    )
+
+
+def parse_age(value: str) -> float:
+    """Parse an age such as `12h`, `30d` or `2w` into seconds.
+
+    Parameters:
+    ----------
+    value: str
+        Age.
+
+    Returns:
+    -------
+    float
+        Age in seconds.
+    """
+    return _parse_quantity(value.lower(), units=AGE_UNITS, default_unit="s")
+
+
+def format_size(size: int) -> str:
+    """Format a size in bytes for display.
+
+    Parameters:
+    ----------
+    size: int
+        Size in bytes.
+
+    Returns:
+    -------
+    str
+        Formatted size.
+    """
+    for unit in ("G", "M", "K"):
+        if size >= SIZE_UNITS[unit]:
+            return f"{size / SIZE_UNITS[unit]:.1f} {unit}B"
+
+    return f"{size} B"
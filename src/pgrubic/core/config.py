@@ -177,6 +177,43 @@ ignore = ["TP017"]
 ```
 </details>
 
+### **per-file-select**
+Mapping of file patterns to the rule aliases or prefixes to enable for the matching
+files, in place of **select**. When a file matches several patterns, the rules of all
+of them are enabled. Rules disabled by **ignore** or **per-file-ignores** stay disabled.
+
+**Type**: `dict[str, list[str]]`
+
+**Default**: `{}`
+
+**Example**:
+<details open>
+<summary><strong>pgrubic.toml</strong></summary>
+
+```toml
+[lint.per-file-select]
+"migrations/*.sql" = ["US", "UN"]
+```
+</details>
+
+### **per-file-ignores**
+Mapping of file patterns to the rule aliases or prefixes to disable for the matching
+files, in addition to **ignore**.
+
+**Type**: `dict[str, list[str]]`
+
+**Default**: `{}`
+
+**Example**:
+<details open>
+<summary><strong>pgrubic.toml</strong></summary>
+
+```toml
+[lint.per-file-ignores]
+"seeds/*.sql" = ["TP017"]
+```
+</details>
+
 ### **include**
 List of file patterns to include in the linting process.
 
@@ -546,6 +583,28 @@ Regular expression to match sequence names.
 [lint]
 regex-sequence = r"^[a-z0-9_]+$"
 ```
+</details>
+
+### **no-cache**
+Whether to read the cache. Caching helps speed up the linting process. When a file
+with the same content has already been linted with the same configuration, its lint
+result is read from the cache instead.
+To force relinting of a file, set to `true`.
+
+Overridden by the `--no-cache` command-line flag.
+
+**Type**: `bool`
+
+**Default**: `false`
+
+**Example**:
+<details open>
+<summary><strong>pgrubic.toml</strong></summary>
+
+```toml
+[lint]
+no-cache = true
+```
 </details>
     """  # noqa: D212, D207 # fmt: on
 
@@ -553,6 +612,8 @@ regex-sequence = r"^[a-z0-9_]+$"
     additional_non_volatile_functions: frozenset[str]
     select: list[str]
     ignore: list[str]
+    per_file_select: dict[str, list[str]]
+    per_file_ignores: dict[str, list[str]]
     include: list[str]
     exclude: list[str]
     ignore_noqa: bool
@@ -577,6 +638,8 @@ regex-sequence = r"^[a-z0-9_]+$"
     regex_constraint_exclusion: str
     regex_sequence: str
 
+    no_cache: bool
+
     @field_validator("additional_non_volatile_functions", mode="before")
     @classmethod
     def _parse_additional_non_volatile_functions(
@@ -939,6 +1002,8 @@ Path to the cache directory.
 If default and the environment variable `PGRUBIC_CACHE_DIR` is set, the environment
 variable takes precedence or otherwise the non-default set value is always used.
 
+The cache can be inspected, pruned and removed with the `pgrubic cache` command.
+
 **Type**: `str`
 
 **Default**: `".pgrubic_cache"`
@@ -1,7 +1,10 @@
 """pgrubic errors."""
 
+from __future__ import annotations
+
 import sys
 import typing
+import pathlib
 
 from colorama import Fore, Style
 
@@ -28,22 +31,59 @@ class ConfigParseError(BaseError):
     """Raised when a config file cannot be parsed."""
 
 
+class RulePackError(BaseError):
+    """Raised when a rule pack cannot be loaded."""
+
+
 class Error(typing.NamedTuple):
-    """Representation of an error."""
+    """Representation of an error.
+
+    The statement text is not carried along, as the statement may be as large as the
+    source code, it is filled in from the source code when the error is printed.
+    """
 
     source_file: str
-    source_code: str
     statement_start_location: int
     statement_end_location: int
-    statement: str
+    # Line number of the end of the statement
+    line_number: int
     message: str
     hint: str
+    statement: str | None = None
+
+    def with_statement(self, source_code: str, *, start_location: int = 0) -> Error:
+        """Fill in the statement text from the source code it was found in.
+
+        Parameters:
+        ----------
+        source_code: str
+            Source code, or the part of it starting at `start_location`, holding the
+            statement.
+        start_location: int
+            Location of the start of the given source code.
+
+        Returns:
+        -------
+        errors.Error
+            Error with the statement text.
+        """
+        if self.statement is not None:
+            return self
+
+        return self._replace(
+            statement=source_code[
+                self.statement_start_location
+                - 1
+                - start_location : self.statement_end_location - start_location
+            ],
+        )
 
 
 def print_errors(
     *,
     errors: set[Error],
     source_file: str,
+    source_code: str | None = None,
 ) -> None:
     """Print all errors collected during linting.
 
@@ -53,23 +93,30 @@ def print_errors(
         Errors to print.
     source_file: str
         Path to the source file.
+    source_code: str | None
+        Source code the errors were found in, read from the source file when needed
+        and not given.
 
     Returns:
     -------
     None
     """
     for error in errors:
+        if error.statement is None:
+            if source_code is None:
+                source_code = pathlib.Path(source_file).read_text(encoding="utf-8")
+
+            error = error.with_statement(source_code)  # noqa: PLW2901
+
+        statement = typing.cast(str, error.statement)
+
         sys.stdout.write(
             f"{noqa.NEW_LINE}{source_file}: {error.message}: {error.hint}{noqa.NEW_LINE}",
         )
 
-        line_number = (
-            error.source_code[: error.statement_end_location].count(noqa.NEW_LINE) + 1
-        )
-
         for idx, line in enumerate(
-            error.statement.splitlines(keepends=False),
-            start=line_number - error.statement.count(noqa.NEW_LINE),
+            statement.splitlines(keepends=False),
+            start=error.line_number - statement.count(noqa.NEW_LINE),
         ):
             sys.stdout.write(
                 f"{Fore.BLUE}{idx} | {Style.RESET_ALL}{Fore.RED}{Style.BRIGHT}{line}{Style.RESET_ALL}{noqa.NEW_LINE}",  # noqa: E501
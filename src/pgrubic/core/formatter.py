@@ -1,5 +1,7 @@
 """Formatter."""
 
+from __future__ import annotations
+
 import typing
 
 from pglast import ast, parser, stream
@@ -7,6 +9,9 @@ from pglast import ast, parser, stream
 from pgrubic import ISSUES_URL
 from pgrubic.core import noqa, config, errors
 
+if typing.TYPE_CHECKING:
+    from pgrubic.core import cache  # pragma: no cover
+
 
 class FormatResult(typing.NamedTuple):
     """Format Result."""
@@ -15,6 +20,8 @@ class FormatResult(typing.NamedTuple):
     original_source_code: str
     formatted_source_code: str
     errors: set[errors.Error]
+    # Hash digest of the source file content once formatted, set by the workers
+    digest: str | None = None
 
 
 class RawStream(stream.RawStream):
@@ -160,10 +167,12 @@ class Formatter:
         *,
         config: config.Config,
         formatters: typing.Callable[[], set[typing.Callable[[], None]]],
+        statement_cache: cache.StatementCache | None = None,
     ) -> None:
         """Initialize variables."""
         self.formatters = formatters()
         self.config = config
+        self.statement_cache = statement_cache
 
     def create_raw_stream(self) -> RawStream:
         """Create a raw stream with the formatter's configuration."""
@@ -178,11 +187,12 @@ class Formatter:
         )
 
     @staticmethod
-    def run(
+    def run(  # noqa: C901
         *,
         source_file: str,
         source_code: str,
         config: config.Config,
+        statement_cache: cache.StatementCache | None = None,
     ) -> tuple[str, set[errors.Error]]:
         """Format source code.
 
@@ -192,6 +202,10 @@ class Formatter:
             Path to the source file.
         source_code: str
             Source code to format.
+        config: config.Config
+            Config.
+        statement_cache: cache.StatementCache | None
+            Cache of the formatted statements, if any.
 
         Returns:
         -------
@@ -202,29 +216,36 @@ class Formatter:
 
         formatted_statements: list[str] = []
 
-        statements = noqa.extract_statements(
+        document = noqa.SourceDocument(
+            source_file=source_file,
             source_code=source_code,
         )
 
-        is_file_format_skip = noqa.check_file_format_skip(
-            source_code=source_code,
-        )
+        if not document.is_file_format_skip:
+            if statement_cache is not None:
+                statement_cache.open(source_file)
 
-        if not is_file_format_skip:
-            for statement in statements:
-                if noqa.check_statement_format_skip(
-                    source_code=source_code,
-                    statement=statement,
-                ):
-                    formatted_statements.append(statement.text)
+            for statement in document.statements:
+                if document.is_statement_format_skip(statement):
+                    formatted_statements.append(statement.with_copy_data(statement.text))
                     continue
 
-                comments = noqa.extract_comments(
-                    statement=statement,
+                cached_statement = (
+                    statement_cache.get(statement.text)
+                    if statement_cache is not None
+                    else None
                 )
 
+                if cached_statement is not None:
+                    formatted_statements.append(
+                        statement.with_copy_data(cached_statement),
+                    )
+                    continue
+
+                comments = document.statement_comments(statement)
+
                 try:
-                    parser.parse_sql(statement.text)
+                    parse_tree = parser.parse_sql(statement.text)
 
                     output = IndentedStream(
                         config=config,
@@ -235,8 +256,9 @@ class Formatter:
                         comma_at_eoln=not (config.format.comma_at_beginning),
                         special_functions=config.format.rewrite_function_calls_as_equivalent_syntax,
                     )
+                    # Statements made only of comments have an empty parse tree
                     formatted_statement = output.apply_keyword_case(
-                        text=output(statement.text),
+                        text=output(parse_tree or statement.text),
                     )
 
                     if config.format.new_line_before_semicolon:
@@ -244,35 +266,49 @@ class Formatter:
                     else:
                         formatted_statement += noqa.SEMI_COLON
 
-                    formatted_statements.append(formatted_statement)
+                    formatted_statements.append(
+                        statement.with_copy_data(formatted_statement),
+                    )
+
+                    if statement_cache is not None:
+                        statement_cache.put(statement.text, formatted_statement)
 
                 except parser.ParseError as error:
                     _errors.add(
                         errors.Error(
                             source_file=str(source_file),
-                            source_code=statement.text,
                             statement_start_location=statement.start_location + 1,
                             statement_end_location=statement.end_location,
-                            statement=statement.text,
+                            line_number=document.line_index.line_number(
+                                statement.end_location,
+                            ),
                             message=str(error),
                             hint=f"""Make sure the statement is valid PostgreSQL statement. If it is, please report this issue at {ISSUES_URL}{noqa.NEW_LINE}""",  # noqa: E501
                         ),
                     )
-                    formatted_statements.append(statement.text.strip(noqa.NEW_LINE))
+                    formatted_statements.append(
+                        statement.with_copy_data(statement.text.strip(noqa.NEW_LINE)),
+                    )
 
                 except RecursionError as error:  # pragma: no cover
                     _errors.add(
                         errors.Error(
                             source_file=str(source_file),
-                            source_code=statement.text,
                             statement_start_location=statement.start_location + 1,
                             statement_end_location=statement.end_location,
-                            statement=statement.text,
+                            line_number=document.line_index.line_number(
+                                statement.end_location,
+                            ),
                             message=str(error),
                             hint="Maximum format depth exceeded, reduce deeply nested queries",  # noqa: E501
                         ),
                     )
-                    formatted_statements.append(statement.text.strip(noqa.NEW_LINE))
+                    formatted_statements.append(
+                        statement.with_copy_data(statement.text.strip(noqa.NEW_LINE)),
+                    )
+
+            if statement_cache is not None:
+                statement_cache.close()
 
             return (
                 noqa.NEW_LINE + (noqa.NEW_LINE * config.format.lines_between_statements)
@@ -301,6 +337,7 @@ class Formatter:
             source_file=source_file,
             source_code=source_code,
             config=self.config,
+            statement_cache=self.statement_cache,
         )
         return FormatResult(
             source_file=source_file,
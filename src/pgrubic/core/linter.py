@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import sys
+import json
+import time
 import typing
-import fnmatch
 import pathlib
 import functools
 import dataclasses
@@ -15,12 +16,21 @@ from colorama import Fore, Style
 from caseconverter import kebabcase
 
 from pgrubic import ISSUES_URL, PACKAGE_NAME, DOCUMENTATION_URL, RULE_DOCUMENTATION_BASE
-from pgrubic.core import noqa, config, errors, visitors as pgrubic_visitors, formatter
+from pgrubic.core import (
+    noqa,
+    config,
+    errors,
+    visitors as pgrubic_visitors,
+    formatter,
+    selection,
+)
 from pgrubic.postgres import functions as postgres_functions
 
 if typing.TYPE_CHECKING:
     from collections import abc  # pragma: no cover
 
+    from pgrubic.core import cache  # pragma: no cover
+
 
 DEFAULT_LINT_REPORT_FILE: str = f"{PACKAGE_NAME}-lint-report.md"
 
@@ -41,20 +51,205 @@ class FixCounter:
         self.counter = 0
 
 
-class Violation(typing.NamedTuple):
-    """Representation of rule violation."""
+class RuleMetadata(typing.NamedTuple):
+    """Metadata of a rule, shared by all the violations of the rule."""
 
-    rule_code: str
-    rule_name: str
-    rule_category: str
-    line_number: int
-    column_offset: int
-    line: str
-    statement_location: int
-    description: str
-    is_auto_fixable: bool
-    is_fix_enabled: bool
-    help: str | None = None
+    code: str
+    name: str
+    category: str
+
+
+# Metadata of the defined rules by rule code, set in BaseChecker.__init_subclass__
+RULE_METADATA: dict[str, RuleMetadata] = {}
+
+
+class Violation:
+    """Representation of rule violation.
+
+    Violations are kept compact as a source code may have millions of them. The rule
+    metadata is shared among the violations of a rule, descriptions and helps are
+    interned and the reported line is held as its locations in the source code, its text
+    is filled in when the violation is printed.
+    """
+
+    __slots__ = (
+        "column_offset",
+        "description",
+        "help",
+        "is_auto_fixable",
+        "is_fix_enabled",
+        "line",
+        "line_end",
+        "line_number",
+        "line_start",
+        "rule",
+        "statement_location",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        rule_code: str,
+        line_number: int,
+        column_offset: int,
+        line_span: tuple[int, int],
+        statement_location: int,
+        description: str,
+        is_auto_fixable: bool,
+        is_fix_enabled: bool,
+        help: str | None = None,  # noqa: A002
+    ) -> None:
+        """Initialize variables."""
+        self.rule = RULE_METADATA[rule_code]
+        self.line_number = line_number
+        self.column_offset = column_offset
+        self.line_start, self.line_end = line_span
+        self.statement_location = statement_location
+        self.description = sys.intern(description)
+        self.is_auto_fixable = is_auto_fixable
+        self.is_fix_enabled = is_fix_enabled
+        self.help = sys.intern(help) if help is not None else None
+        # Text of the reported line, filled in from the source code when needed
+        self.line: str | None = None
+
+    @property
+    def rule_code(self) -> str:
+        """Code of the violated rule."""
+        return self.rule.code
+
+    @property
+    def rule_name(self) -> str:
+        """Name of the violated rule."""
+        return self.rule.name
+
+    @property
+    def rule_category(self) -> str:
+        """Category of the violated rule."""
+        return self.rule.category
+
+    def fill_line(self, source_code: str, *, start_location: int = 0) -> None:
+        """Fill in the text of the reported line from the source code it was found in.
+
+        Parameters:
+        ----------
+        source_code: str
+            Source code, or the part of it starting at `start_location`, holding the
+            reported line.
+        start_location: int
+            Location of the start of the given source code.
+
+        Returns:
+        -------
+        None
+        """
+        if self.line is None:
+            self.line = source_code[
+                self.line_start - start_location : self.line_end - start_location
+            ]
+
+    def _key(self) -> tuple[object, ...]:
+        """Fields identifying the violation, the line text is derived from them."""
+        return (
+            self.rule.code,
+            self.line_number,
+            self.column_offset,
+            self.line_start,
+            self.line_end,
+            self.statement_location,
+            self.description,
+            self.is_auto_fixable,
+            self.is_fix_enabled,
+            self.help,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Compare violations by their fields."""
+        if not isinstance(other, Violation):
+            return NotImplemented
+
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        """Hash the fields of the violation."""
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        """Represent the violation by its rule and location."""
+        return (
+            f"Violation(rule_code={self.rule.code!r}, line_number={self.line_number},"
+            f" column_offset={self.column_offset}, description={self.description!r})"
+        )
+
+    def __reduce__(self) -> tuple[typing.Callable[..., Violation], tuple[object, ...]]:
+        """Pickle the violation as its fields, the rule metadata is pickled once per
+        pickled object graph, e.g. per lint result.
+        """
+        return (
+            _restore_violation,
+            (
+                self.rule,
+                self.line_number,
+                self.column_offset,
+                self.line_start,
+                self.line_end,
+                self.statement_location,
+                self.description,
+                self.is_auto_fixable,
+                self.is_fix_enabled,
+                self.help,
+                self.line,
+            ),
+        )
+
+
+def _restore_violation(  # noqa: PLR0913
+    rule: RuleMetadata,
+    line_number: int,
+    column_offset: int,
+    line_start: int,
+    line_end: int,
+    statement_location: int,
+    description: str,
+    is_auto_fixable: bool,  # noqa: FBT001
+    is_fix_enabled: bool,  # noqa: FBT001
+    help: str | None,  # noqa: A002
+    line: str | None,
+) -> Violation:
+    """Restore a pickled violation, interning its strings again."""
+    violation = Violation.__new__(Violation)
+    violation.rule = rule
+    violation.line_number = line_number
+    violation.column_offset = column_offset
+    violation.line_start = line_start
+    violation.line_end = line_end
+    violation.statement_location = statement_location
+    violation.description = sys.intern(description)
+    violation.is_auto_fixable = is_auto_fixable
+    violation.is_fix_enabled = is_fix_enabled
+    violation.help = sys.intern(help) if help is not None else None
+    violation.line = line
+    return violation
+
+
+@dataclasses.dataclass(kw_only=True)
+class RuleProfile:
+    """Time spent in, and violations produced by, a rule. The time spent fixing
+    violations is excluded from the time spent visiting nodes.
+    """
+
+    invocations: int = 0
+    time: float = 0.0
+    fix_invocations: int = 0
+    fix_time: float = 0.0
+    violations: int = 0
+
+    def merge(self, other: RuleProfile) -> None:
+        """Merge another profile of the same rule into this one."""
+        self.invocations += other.invocations
+        self.time += other.time
+        self.fix_invocations += other.fix_invocations
+        self.fix_time += other.fix_time
+        self.violations += other.violations
 
 
 class LintResult(typing.NamedTuple):
@@ -64,6 +259,18 @@ class LintResult(typing.NamedTuple):
     violations: set[Violation]
     errors: set[errors.Error]
     fixed_source_code: str | None = None
+    rule_profiles: dict[str, RuleProfile] | None = None
+    unused_lint_ignores: tuple[noqa.NoQaDirective, ...] = ()
+
+
+class StatementResult(typing.NamedTuple):
+    """Result of linting a statement."""
+
+    violations: set[Violation]
+    # Node types visited in the statement and its inline sql statements
+    node_types: set[type[ast.Node]]
+    output: str
+    error: errors.Error | None = None
 
 
 class ViolationStats(typing.NamedTuple):
@@ -95,7 +302,19 @@ class CheckerMeta(type):
             if callable(attr_value) and attr_name.startswith("visit_"):
                 dct[attr_name] = cls._set_locations(attr_value)
 
-        return super().__new__(cls, name, bases, dct)
+        new_class = super().__new__(cls, name, bases, dct)
+
+        # Node types the checker visits, used to skip it for statements that contain
+        # none of them
+        new_class.node_types = frozenset(  # type: ignore[attr-defined]
+            node_class
+            for attr_name in dir(new_class)
+            if attr_name.startswith("visit_")
+            and (node_class := getattr(ast, attr_name.removeprefix("visit_"), None))
+            is not None
+        )
+
+        return new_class
 
     @staticmethod
     def _set_locations(
@@ -109,50 +328,42 @@ class CheckerMeta(type):
             ancestors: visitors.Ancestor,
             node: ast.Node,
         ) -> object:
-            """Set locations for node."""
+            """Set location handle for node, resolved on violation."""
             # some nodes have location attribute which is different from node location
             # for example ast.CreateTablespaceStmt while some nodes do not carry
             # location at all.
             # If a node has no location or it is an inlined sql statement,
             # we use the length of the root statement
-            if (
-                hasattr(node, "location")
-                and isinstance(node.location, int)
-                and not checker.in_inline_sql_mode
-            ):
-                checker.node_location = checker.statement_location + node.location
+            location = getattr(node, "location", None)
+
+            if isinstance(location, int) and not checker.in_inline_sql_mode:
+                checker.node_has_location = True
+                checker.node_location = checker.statement_location + location
             else:
+                checker.node_has_location = False
                 checker.node_location = checker.statement_location + len(
                     checker.root_statement,
                 )
 
-            # get the position of the newline just before our node location,
-            line_start = (
-                checker.source_code.rfind(noqa.NEW_LINE, 0, checker.node_location) + 1
-            )
-            # get the position of the newline just after our node location
-            line_end = checker.source_code.find(noqa.NEW_LINE, checker.node_location)
+            if checker.rule_profiles is None:
+                return func(checker, ancestors, node)
 
-            # line number is number of newlines before our node location,
-            # increment by 1 to land on the actual node
-            checker.line_number = (
-                checker.source_code[: checker.node_location].count(noqa.NEW_LINE) + 1
+            rule_profile = checker.rule_profiles.setdefault(
+                checker.code,
+                RuleProfile(),
             )
-            # We account for a single space thus +1
-            checker.column_offset = (checker.node_location - line_start) + 1
+            fix_time = rule_profile.fix_time
 
-            # If a node has no location or it is an inlined sql statement,
-            # we return the whole root statement instead
-            if (
-                hasattr(node, "location")
-                and isinstance(node.location, int)
-                and not checker.in_inline_sql_mode
-            ):
-                checker.line = checker.source_code[line_start:line_end]
-            else:
-                checker.line = checker.root_statement
+            start_time = time.perf_counter()
 
-            return func(checker, ancestors, node)
+            try:
+                return func(checker, ancestors, node)
+            finally:
+                rule_profile.invocations += 1
+                # Time spent fixing is reported on its own
+                rule_profile.time += (
+                    time.perf_counter() - start_time - (rule_profile.fix_time - fix_time)
+                )
 
         return wrapper
 
@@ -175,8 +386,18 @@ class CheckerMeta(type):
             if not checker.is_fix_applicable:
                 return None
 
+            start_time = time.perf_counter()
+
             result = func(checker, *args, **kwargs)
 
+            if checker.rule_profiles is not None:
+                rule_profile = checker.rule_profiles.setdefault(
+                    checker.code,
+                    RuleProfile(),
+                )
+                rule_profile.fix_invocations += 1
+                rule_profile.fix_time += time.perf_counter() - start_time
+
             checker.statement_fixes.add()
             checker.file_fixes.add()
 
@@ -204,26 +425,34 @@ class BaseChecker(visitors.Visitor, metaclass=CheckerMeta):
     # Is this rule automatically fixable?
     is_auto_fixable: bool = False
 
+    # Node types visited by the rule, set in CheckerMeta
+    node_types: typing.ClassVar[frozenset[type[ast.Node]]]
+
     deprecation: typing.ClassVar[Deprecation | None] = None
 
     # Attributes shared among all subclasses
-    lint_ignores: list[noqa.NoQaDirective]
+    suppressions: noqa.SuppressionIndex
     source_file: str
     source_code: str
+    line_index: noqa.LineIndex
 
     statement_location: int
     node_location: int
-    line_number: int
-    column_offset: int
+    node_has_location: bool
     statement: str
     root_statement: str
-    line: str
     in_inline_sql_mode: bool = False
 
     # Track fixes
     statement_fixes: FixCounter
     file_fixes: FixCounter
 
+    # Per rule profiles, only tracked when profiling rules
+    rule_profiles: dict[str, RuleProfile] | None = None
+
+    # Rule selection compiled from the config
+    rule_selection: selection.RuleSelection
+
     def __init__(self, *, config: config.Config) -> None:
         """Initialize variables."""
         self.violations: set[Violation] = set()
@@ -235,9 +464,44 @@ class BaseChecker(visitors.Visitor, metaclass=CheckerMeta):
         cls.name = kebabcase(cls.__name__)
         cls.category = cls.__module__.split(".")[-2]
 
+        RULE_METADATA[cls.code] = RuleMetadata(
+            code=cls.code,
+            name=cls.name,
+            category=cls.category,
+        )
+
     def visit(self, ancestors: visitors.Ancestor, node: ast.Node) -> None:
         """Visit the node."""
 
+    def reset(self) -> None:
+        """Reset the state kept across the statements of a source file. Called before
+        linting each source file, as a checker lints many source files in a worker.
+        """
+
+    @property
+    def line_number(self) -> int:
+        """Line number of the visited node."""
+        return self.line_index.line_number(self.node_location)
+
+    @property
+    def column_offset(self) -> int:
+        """Column offset of the visited node."""
+        return self.line_index.column_offset(self.node_location)
+
+    @property
+    def line_span(self) -> tuple[int, int]:
+        """Start and end locations of the line of the visited node. If the node has no
+        location or it is an inlined sql statement, we return those of the whole root
+        statement instead.
+        """
+        if self.node_has_location:
+            return self.line_index.line_span(self.node_location)
+
+        return (
+            self.statement_location,
+            self.statement_location + len(self.root_statement),
+        )
+
     def is_non_volatile_function(self, function: ast.FuncCall) -> bool:
         """Check if function is non-volatile."""
         return postgres_functions.is_non_volatile_function(
@@ -253,19 +517,7 @@ class BaseChecker(visitors.Visitor, metaclass=CheckerMeta):
         if not self.is_auto_fixable:
             return False
 
-        return not (
-            (
-                self.config.lint.fixable
-                and not any(
-                    fnmatch.fnmatch(self.code, pattern + "*")
-                    for pattern in self.config.lint.fixable
-                )
-            )
-            or any(
-                fnmatch.fnmatch(self.code, pattern + "*")
-                for pattern in self.config.lint.unfixable
-            )
-        )
+        return self.code in self.rule_selection.fix_enabled
 
     @property
     def is_fix_applicable(self) -> bool:
@@ -277,18 +529,10 @@ class BaseChecker(visitors.Visitor, metaclass=CheckerMeta):
             return False
 
         # if the violation has been suppressed by noqa, there is no need to try to fix it
-        for inline_ignore in self.lint_ignores:
-            if (
-                (
-                    self.statement_location == inline_ignore.location
-                    or self.source_file == inline_ignore.source_file
-                )
-                and inline_ignore.rule in (noqa.A_STAR, self.code)
-                and not self.config.lint.ignore_noqa
-            ):
-                return False
-
-        return True
+        return self.config.lint.ignore_noqa or not self.suppressions.is_suppressed(
+            location=self.statement_location,
+            rule=self.code,
+        )
 
     @classmethod
     @contextmanager
@@ -308,6 +552,118 @@ class BaseChecker(visitors.Visitor, metaclass=CheckerMeta):
                 checker.is_auto_fixable = original_state
 
 
+class RuleDispatcher(visitors.Visitor):
+    """Walk a parse tree once, dispatching each node to the matching `visit_*` methods of
+    all checkers, in rule order.
+
+    Checkers are only called on the node types they visit. The node types seen during
+    the walk are collected for the statement cache.
+
+    A checker that can fix violations may replace or delete the visited node, whose
+    children are then not walked and whose replacement is only applied once the walk is
+    over. Each such checker walks the tree on its own, in rule order, and the
+    checkers in between share a walk. Every checker therefore sees the tree as fixed by
+    the preceding rules, as if each checker walked it in turn.
+    """
+
+    def __init__(self, checkers: abc.Iterable[BaseChecker]) -> None:
+        """Build the node type to handlers table."""
+        self.checkers: list[BaseChecker] = sorted(checkers, key=lambda x: x.code)
+        self.handlers = self._build_handlers(self.checkers)
+        self.node_types: set[type[ast.Node]] = set()
+
+        # Handler tables of the walks by the indexes of the fixing checkers
+        self.walks: dict[
+            tuple[int, ...],
+            list[dict[type[ast.Node], list[abc.Callable[..., object]]]],
+        ] = {(): [self.handlers]}
+
+    @staticmethod
+    def _build_handlers(
+        checkers: list[BaseChecker],
+    ) -> dict[type[ast.Node], list[abc.Callable[..., object]]]:
+        """Build the node type to handlers table of checkers, in rule order."""
+        handlers: dict[type[ast.Node], list[abc.Callable[..., object]]] = {}
+
+        for checker in checkers:
+            for node_class in checker.node_types:
+                handlers.setdefault(node_class, []).append(
+                    getattr(checker, f"visit_{node_class.__name__}"),
+                )
+
+        return handlers
+
+    def _walk_handlers(
+        self,
+    ) -> list[dict[type[ast.Node], list[abc.Callable[..., object]]]]:
+        """Get the handler tables of the walks, one walk unless fixes are applied."""
+        fixing_checkers = tuple(
+            index
+            for index, checker in enumerate(self.checkers)
+            if checker.config.lint.fix and checker.is_fix_enabled
+        )
+
+        if fixing_checkers not in self.walks:
+            groups: list[list[BaseChecker]] = [[]]
+
+            for index, checker in enumerate(self.checkers):
+                if index in fixing_checkers:
+                    groups.extend([[checker], []])
+                else:
+                    groups[-1].append(checker)
+
+            self.walks[fixing_checkers] = [
+                self._build_handlers(group) for group in groups if group
+            ]
+
+        return self.walks[fixing_checkers]
+
+    def __call__(self, node: tuple[ast.RawStmt, ...] | ast.Node) -> object:
+        """Visit the node, calling the handlers of each visited node."""
+        self.root = node
+        self.node_types = set()
+
+        for checker in self.checkers:
+            if checker.violations:
+                checker.violations = set()
+
+        for handlers in self._walk_handlers():
+            self._walk(self.root, handlers=handlers)
+
+        return self.root
+
+    def _walk(
+        self,
+        node: tuple[ast.RawStmt, ...] | ast.Node,
+        *,
+        handlers: dict[type[ast.Node], list[abc.Callable[..., object]]],
+    ) -> None:
+        """Walk the node, calling the handlers of each visited node."""
+        generator = self.iterate(node)
+
+        try:
+            ancestors, visited_node = generator.send(None)
+        except StopIteration:
+            return
+
+        while True:
+            result = None
+            node_class = visited_node.__class__
+
+            self.node_types.add(node_class)
+
+            # Only a checker walking on its own returns a fix
+            for handler in handlers.get(node_class, ()):
+                result = handler(ancestors, visited_node)
+
+            try:
+                ancestors, visited_node = generator.send(
+                    visitors.Continue if result is None else result,
+                )
+            except StopIteration:
+                break
+
+
 class Linter:
     """Holds all lint rules, and runs them against a source code."""
 
@@ -318,10 +674,15 @@ class Linter:
             [],
             set[typing.Callable[[], None]],
         ],
+        *,
+        profile_rules: bool = False,
+        statement_cache: cache.StatementCache | None = None,
     ) -> None:
         """Initialize variables."""
         self.checkers: set[BaseChecker] = set()
         self.config = config
+        self.profile_rules = profile_rules
+        self.statement_cache = statement_cache
         self.formatter = formatter.Formatter(
             config=config,
             formatters=formatters,
@@ -330,48 +691,71 @@ class Linter:
     @staticmethod
     def _skip_suppressed_violations(
         *,
-        source_file: str,
-        checker: BaseChecker,
-        lint_ignores: list[noqa.NoQaDirective],
-    ) -> None:
+        violations: set[Violation],
+        suppressions: noqa.SuppressionIndex,
+    ) -> set[Violation]:
         """Skip suppressed violations.
 
         Parameters:
         ----------
-        source_file: str
-            Path to the source file.
+        violations: set[Violation]
+            Violations of a statement.
 
-        checker: BaseChecker
-            Lint rule checker.
+        suppressions: SuppressionIndex
+            Index of noqa directives.
 
-        lint_ignores: list[NoQaDirective]
-            List of noqa directives.
+        Returns:
+        -------
+        set[Violation]
+            Violations that are not suppressed.
+        """
+        return {
+            violation
+            for violation in violations
+            if not suppressions.suppress(
+                location=violation.statement_location,
+                rule=violation.rule_code,
+            )
+        }
+
+    def _run_checkers(
+        self,
+        *,
+        dispatcher: RuleDispatcher,
+        parse_tree: tuple[ast.RawStmt, ...],
+    ) -> set[Violation]:
+        """Run all checkers against a parse tree in a single walk.
+
+        Parameters:
+        ----------
+        dispatcher: RuleDispatcher
+            Dispatcher holding the checkers.
+
+        parse_tree: tuple[ast.RawStmt, ...]
+            Parse tree to walk.
 
         Returns:
         -------
-        None
+        set[Violation]
+            Violations, including suppressed ones.
         """
-        for inline_ignore in lint_ignores:
-            suppressed_violations: set[Violation] = {
-                violation
-                for violation in checker.violations
-                if (
-                    (
-                        violation.statement_location == inline_ignore.location
-                        or source_file == inline_ignore.source_file
-                    )
-                    and (inline_ignore.rule in (noqa.A_STAR, checker.code))
-                )
-            }
+        violations: set[Violation] = set()
 
-            if suppressed_violations:
-                inline_ignore.used = True
+        dispatcher(parse_tree)
 
-                checker.violations = {
-                    violation
-                    for violation in checker.violations
-                    if violation not in suppressed_violations
-                }
+        for checker in dispatcher.checkers:
+            if not checker.violations:
+                continue
+
+            if checker.rule_profiles is not None:
+                checker.rule_profiles.setdefault(
+                    checker.code,
+                    RuleProfile(),
+                ).violations += len(checker.violations)
+
+            violations.update(checker.violations)
+
+        return violations
 
     @staticmethod
     def get_violation_stats(violations: set[Violation]) -> ViolationStats:
@@ -398,6 +782,7 @@ class Linter:
         *,
         violations: set[Violation],
         source_file: str,
+        source_code: str | None = None,
     ) -> None:
         """Print all violations collected by a checker.
 
@@ -407,24 +792,35 @@ class Linter:
             Violations to print.
         source_file: str
             Path to the source file.
+        source_code: str | None
+            Source code the violations were found in, read from the source file when
+            needed and not given.
 
         Returns:
         -------
         None
         """
         for violation in violations:
+            if violation.line is None:
+                if source_code is None:
+                    source_code = pathlib.Path(source_file).read_text(encoding="utf-8")
+
+                violation.fill_line(source_code)
+
+            line = typing.cast(str, violation.line)
+
             sys.stdout.write(
                 f"{noqa.NEW_LINE}{source_file}:{violation.line_number}:{violation.column_offset}:"
                 f"{noqa.SPACE}\033]8;;{DOCUMENTATION_URL}/{RULE_DOCUMENTATION_BASE}/{violation.rule_category}/{violation.rule_name}{Style.RESET_ALL}{Fore.RED}{Style.BRIGHT}{violation.rule_code}\033]8;;{Style.RESET_ALL}:"
                 f"{noqa.SPACE}{violation.description}{noqa.NEW_LINE}",
             )
 
-            for idx, line in enumerate(
-                violation.line.splitlines(keepends=False),
-                start=violation.line_number - violation.line.count(noqa.NEW_LINE),
+            for idx, text in enumerate(
+                line.splitlines(keepends=False),
+                start=violation.line_number - line.count(noqa.NEW_LINE),
             ):
                 sys.stdout.write(
-                    f"{Fore.BLUE}{idx} | {Style.RESET_ALL}{Fore.RED}{Style.BRIGHT}{line}{Style.RESET_ALL}{noqa.NEW_LINE}",  # noqa: E501
+                    f"{Fore.BLUE}{idx} | {Style.RESET_ALL}{Fore.RED}{Style.BRIGHT}{text}{Style.RESET_ALL}{noqa.NEW_LINE}",  # noqa: E501
                 )
                 # in order to have arrow pointing to the violation, we need to shift
                 # the screen by the length of the line_number as well as 2 spaces
@@ -440,6 +836,98 @@ class Linter:
                     else None
                 )
 
+    @staticmethod
+    def merge_rule_profiles(
+        lint_results: list[LintResult],
+        *,
+        rule_profiles: dict[str, RuleProfile] | None = None,
+    ) -> dict[str, RuleProfile]:
+        """Merge the rule profiles of lint results.
+
+        Parameters:
+        ----------
+        lint_results: list[LintResult]
+            List of lint results.
+        rule_profiles: dict[str, RuleProfile] | None
+            Rule profiles to merge into, a new mapping is created if not provided.
+
+        Returns:
+        -------
+        dict[str, RuleProfile]
+            Rule profiles by rule code.
+        """
+        rule_profiles = {} if rule_profiles is None else rule_profiles
+
+        for lint_result in lint_results:
+            for rule_code, rule_profile in (lint_result.rule_profiles or {}).items():
+                rule_profiles.setdefault(rule_code, RuleProfile()).merge(rule_profile)
+
+        return rule_profiles
+
+    @staticmethod
+    def print_rule_profiles(rule_profiles: dict[str, RuleProfile]) -> None:
+        """Print rule profiles as a table, sorted by the time spent in each rule.
+
+        Parameters:
+        ----------
+        rule_profiles: dict[str, RuleProfile]
+            Rule profiles by rule code.
+
+        Returns:
+        -------
+        None
+        """
+        sys.stdout.write(
+            f"{noqa.NEW_LINE}{'Rule':<8}{'Calls':>12}{'Time (ms)':>12}"
+            f"{'Fixes':>8}{'Fix (ms)':>10}{'Violations':>12}{noqa.NEW_LINE}",
+        )
+
+        for rule_code, rule_profile in sorted(
+            rule_profiles.items(),
+            key=lambda item: item[1].time,
+            reverse=True,
+        ):
+            sys.stdout.write(
+                f"{rule_code:<8}{rule_profile.invocations:>12}"
+                f"{rule_profile.time * 1000:>12.2f}{rule_profile.fix_invocations:>8}"
+                f"{rule_profile.fix_time * 1000:>10.2f}"
+                f"{rule_profile.violations:>12}{noqa.NEW_LINE}",
+            )
+
+    @staticmethod
+    def write_rule_profiles(
+        *,
+        rule_profiles: dict[str, RuleProfile],
+        profile_file: str,
+    ) -> None:
+        """Write rule profiles as JSON, sorted by the time spent in each rule.
+
+        Parameters:
+        ----------
+        rule_profiles: dict[str, RuleProfile]
+            Rule profiles by rule code.
+        profile_file: str
+            Path to the profile file.
+
+        Returns:
+        -------
+        None
+        """
+        pathlib.Path(profile_file).write_text(
+            json.dumps(
+                {
+                    rule_code: dataclasses.asdict(rule_profile)
+                    for rule_code, rule_profile in sorted(
+                        rule_profiles.items(),
+                        key=lambda item: item[1].time,
+                        reverse=True,
+                    )
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
     @staticmethod
     def generate_lint_report(
         *,
@@ -510,7 +998,35 @@ class Linter:
 
         pathlib.Path(report_file).write_text("\n".join(lines), encoding="utf-8")
 
-    def run(self, *, source_file: str, source_code: str) -> LintResult:  # noqa: C901, PLR0912, PLR0915
+    def _file_checkers(self, source_file: str) -> set[BaseChecker]:
+        """Get the checkers enabled for a source file. The rule selection is compiled
+        once per config, checkers are only filtered when rules are selected per file.
+
+        Parameters:
+        ----------
+        source_file: str
+            Path to the source file.
+
+        Returns:
+        -------
+        set[BaseChecker]
+            Checkers enabled for the source file.
+        """
+        rule_selection = selection.compile_rule_selection(
+            self.config.lint,
+            codes=(checker.code for checker in self.checkers),
+        )
+
+        BaseChecker.rule_selection = rule_selection
+
+        if not rule_selection.has_per_file_rules:
+            return self.checkers
+
+        file_rules = rule_selection.file_rules(source_file)
+
+        return {checker for checker in self.checkers if checker.code in file_rules}
+
+    def run(self, *, source_file: str, source_code: str) -> LintResult:
         """Run rules on a source code.
 
         Parameters:
@@ -525,166 +1041,545 @@ class Linter:
         LintResult
             Lint result.
         """
-        fixed_statements: list[str] = []
+        document = noqa.SourceDocument(
+            source_file=source_file,
+            source_code=source_code,
+        )
+
+        BaseChecker.source_file = source_file
+
+        BaseChecker.file_fixes = FixCounter()
+        BaseChecker.statement_fixes = FixCounter()
+
+        BaseChecker.rule_profiles = {} if self.profile_rules else None
+
+        checkers = self._file_checkers(source_file)
 
+        for checker in checkers:
+            checker.reset()
+
+        suppressions = noqa.SuppressionIndex()
+        suppressions.add(document.file_lint_ignores)
+
+        BaseChecker.suppressions = suppressions
+
+        # Statements are linted from scratch when fixing, as fixes depend on the noqa
+        # directives, and when profiling rules
+        statement_cache = (
+            self.statement_cache
+            if not self.config.lint.fix and not self.profile_rules
+            else None
+        )
+
+        if statement_cache is not None:
+            statement_cache.open(source_file)
+
+        violations, _errors, fixed_statements = self._lint_document(
+            document=document,
+            checkers=checkers,
+            dispatcher=RuleDispatcher(checkers),
+            suppressions=suppressions,
+            # Inline sql statements are only parsed once per file, their parse trees
+            # are shared by all checkers as fixes are disabled for inline sql statements
+            inline_sql_parse_trees={},
+            statement_cache=statement_cache,
+        )
+
+        if statement_cache is not None:
+            statement_cache.close()
+
+        fixed_source_code = None
+
+        if BaseChecker.file_fixes.counter > 0:
+            fixed_source_code = (
+                noqa.NEW_LINE
+                + (noqa.NEW_LINE * self.config.format.lines_between_statements)
+            ).join(
+                fixed_statements,
+            ) + noqa.NEW_LINE  # final new line
+
+        noqa.report_unused_lint_ignores(
+            source_file=source_file,
+            lint_ignores=suppressions.directives,
+        )
+
+        unused_lint_ignores = tuple(
+            directive for directive in suppressions.directives if not directive.used
+        )
+
+        return LintResult(
+            source_file=source_file,
+            violations=violations,
+            errors=_errors,
+            fixed_source_code=fixed_source_code,
+            rule_profiles=BaseChecker.rule_profiles,
+            unused_lint_ignores=unused_lint_ignores,
+        )
+
+    def run_stream(
+        self,
+        *,
+        source_file: str,
+        stream: typing.TextIO,
+        chunk_size: int = noqa.DEFAULT_CHUNK_SIZE,
+    ) -> LintResult:
+        """Run rules on a source code read incrementally from a stream.
+
+        Statements are linted as they are read, so memory is bounded by the largest
+        statement rather than by the size of the source code. Violations and errors are
+        located within the whole source code. Fixed source code is not produced.
+
+        Parameters:
+        ----------
+        source_file: str
+            Path to the source file.
+        stream: typing.TextIO
+            Stream to read the source code from.
+        chunk_size: int
+            Number of characters to read at once.
+
+        Returns:
+        -------
+        LintResult
+            Lint result.
+        """
         violations: set[Violation] = set()
         _errors: set[errors.Error] = set()
 
-        BaseChecker.source_code = source_code
         BaseChecker.source_file = source_file
 
         BaseChecker.file_fixes = FixCounter()
         BaseChecker.statement_fixes = FixCounter()
 
-        statements = noqa.extract_statements(
-            source_code=source_code,
+        BaseChecker.rule_profiles = {} if self.profile_rules else None
+
+        checkers = self._file_checkers(source_file)
+
+        for checker in checkers:
+            checker.reset()
+
+        suppressions = noqa.SuppressionIndex()
+
+        BaseChecker.suppressions = suppressions
+
+        dispatcher = RuleDispatcher(checkers)
+
+        inline_sql_parse_trees: dict[str, tuple[ast.RawStmt, ...]] = {}
+
+        for chunk in noqa.read_source_chunks(stream, chunk_size=chunk_size):
+            document = noqa.SourceDocument(
+                source_file=source_file,
+                source_code=chunk.text,
+                start_location=chunk.start_location,
+                start_line_number=chunk.start_line_number,
+            )
+
+            suppressions.add(document.file_lint_ignores)
+
+            chunk_violations, chunk_errors, _ = self._lint_document(
+                document=document,
+                checkers=checkers,
+                dispatcher=dispatcher,
+                suppressions=suppressions,
+                inline_sql_parse_trees=inline_sql_parse_trees,
+            )
+
+            # The chunk is released once linted, the reported text is filled in now
+            # rather than reading the whole source code again when printing
+            for violation in chunk_violations:
+                violation.fill_line(chunk.text, start_location=chunk.start_location)
+
+            violations.update(chunk_violations)
+            _errors.update(
+                error.with_statement(chunk.text, start_location=chunk.start_location)
+                for error in chunk_errors
+            )
+
+            # Inline sql statements rarely repeat across chunks
+            inline_sql_parse_trees.clear()
+
+        noqa.report_unused_lint_ignores(
+            source_file=source_file,
+            lint_ignores=suppressions.directives,
+        )
+
+        unused_lint_ignores = tuple(
+            directive for directive in suppressions.directives if not directive.used
         )
 
-        file_lint_ignores = noqa.extract_file_lint_ignores(
+        return LintResult(
             source_file=source_file,
-            source_code=source_code,
+            violations=violations,
+            errors=_errors,
+            rule_profiles=BaseChecker.rule_profiles,
+            unused_lint_ignores=unused_lint_ignores,
         )
 
-        lint_ignores = file_lint_ignores
+    def _lint_document(  # noqa: PLR0913
+        self,
+        *,
+        document: noqa.SourceDocument,
+        checkers: set[BaseChecker],
+        dispatcher: RuleDispatcher,
+        suppressions: noqa.SuppressionIndex,
+        inline_sql_parse_trees: dict[str, tuple[ast.RawStmt, ...]],
+        statement_cache: cache.StatementCache | None = None,
+    ) -> tuple[set[Violation], set[errors.Error], list[str]]:
+        """Run rules on the statements of a source document.
 
-        for statement in statements:
-            statement_lint_ignores: list[noqa.NoQaDirective] = (
-                noqa.extract_statement_lint_ignores(
-                    statement=statement,
-                    source_code=source_code,
-                )
-            )
+        Parameters:
+        ----------
+        document: noqa.SourceDocument
+            Source document to lint.
+        checkers: set[BaseChecker]
+            Checkers enabled for the source file.
+        dispatcher: RuleDispatcher
+            Dispatcher holding the checkers.
+        suppressions: noqa.SuppressionIndex
+            Index of noqa directives, statement directives are added as encountered.
+        inline_sql_parse_trees: dict[str, tuple[ast.RawStmt, ...]]
+            Parse trees of the inline sql statements already parsed.
+        statement_cache: cache.StatementCache | None
+            Opened cache of the statement results of the source file, if any.
 
-            lint_ignores.extend(statement_lint_ignores)
+        Returns:
+        -------
+        tuple[set[Violation], set[errors.Error], list[str]]
+            Violations, errors and the fixed statements.
+        """
+        fixed_statements: list[str] = []
 
-            BaseChecker.lint_ignores = lint_ignores
+        violations: set[Violation] = set()
+        _errors: set[errors.Error] = set()
 
-            try:
-                parse_tree: tuple[ast.RawStmt, ...] = parser.parse_sql(statement.text)
+        BaseChecker.source_code = document.source_code
+        BaseChecker.line_index = document.line_index
+
+        # Checkers keeping state across statements are run even on cached statements,
+        # when interested in their nodes, so that their state is kept up to date
+        cross_statement_checkers = {
+            checker for checker in checkers if self._is_cross_statement(checker)
+        }
+        cross_statement_dispatcher = RuleDispatcher(cross_statement_checkers)
+        cross_statement_node_types = {
+            node_class.__name__
+            for checker in cross_statement_checkers
+            for node_class in checker.node_types
+        }
+
+        for statement in document.statements:
+            suppressions.add(document.statement_lint_ignores(statement))
+
+            cached_statement = (
+                statement_cache.get(statement.text)
+                if statement_cache is not None
+                else None
+            )
 
-                comments = noqa.extract_comments(
+            if cached_statement is None:
+                statement_result = self._lint_statement(
                     statement=statement,
+                    document=document,
+                    dispatcher=dispatcher,
+                    inline_sql_parse_trees=inline_sql_parse_trees,
                 )
 
-                inline_sql_statements = (
-                    pgrubic_visitors.extract_nested_inline_sql_statements(
-                        node=parse_tree,
-                        raw_stream_factory=self.formatter.create_raw_stream,
+                if statement_cache is not None and statement_result.error is None:
+                    statement_cache.put(
+                        statement.text,
+                        self._dump_statement_result(
+                            statement_result=statement_result,
+                            statement=statement,
+                            document=document,
+                            cross_statement_checkers=cross_statement_checkers,
+                        ),
                     )
+            else:
+                statement_result = self._load_statement_result(
+                    cached_statement=cached_statement,
+                    statement=statement,
+                    document=document,
+                )
+
+                if cross_statement_node_types.intersection(cached_statement[0]):
+                    statement_result.violations.update(
+                        self._lint_statement(
+                            statement=statement,
+                            document=document,
+                            dispatcher=cross_statement_dispatcher,
+                            inline_sql_parse_trees=inline_sql_parse_trees,
+                        ).violations,
+                    )
+
+            if self.config.lint.ignore_noqa:
+                violations.update(statement_result.violations)
+            else:
+                violations.update(
+                    self._skip_suppressed_violations(
+                        violations=statement_result.violations,
+                        suppressions=suppressions,
+                    ),
+                )
+
+            if statement_result.error is not None:
+                _errors.add(statement_result.error)
+
+            fixed_statements.append(statement_result.output)
+
+        return violations, _errors, fixed_statements
+
+    def _lint_statement(
+        self,
+        *,
+        statement: noqa.Statement,
+        document: noqa.SourceDocument,
+        dispatcher: RuleDispatcher,
+        inline_sql_parse_trees: dict[str, tuple[ast.RawStmt, ...]],
+    ) -> StatementResult:
+        """Run rules on a statement and its inline sql statements.
+
+        Parameters:
+        ----------
+        statement: noqa.Statement
+            Statement to lint.
+        document: noqa.SourceDocument
+            Source document of the statement.
+        dispatcher: RuleDispatcher
+            Dispatcher holding the checkers.
+        inline_sql_parse_trees: dict[str, tuple[ast.RawStmt, ...]]
+            Parse trees of the inline sql statements already parsed.
+
+        Returns:
+        -------
+        StatementResult
+            Violations, including suppressed ones, error and output of the statement.
+        """
+        violations: set[Violation] = set()
+        node_types: set[type[ast.Node]] = set()
+
+        try:
+            parse_tree: tuple[ast.RawStmt, ...] = parser.parse_sql(statement.text)
+
+            comments = document.statement_comments(statement)
+
+            inline_sql_statements = pgrubic_visitors.extract_nested_inline_sql_statements(
+                node=parse_tree,
+                raw_stream_factory=self.formatter.create_raw_stream,
+                parse_trees=inline_sql_parse_trees,
+            )
+
+        except parser.ParseError as error:
+            return StatementResult(
+                violations=violations,
+                node_types=node_types,
+                error=errors.Error(
+                    source_file=str(document.source_file),
+                    statement_start_location=statement.start_location + 1,
+                    statement_end_location=statement.end_location,
+                    line_number=document.line_index.line_number(
+                        statement.end_location,
+                    ),
+                    message=str(error),
+                    hint=f"Make sure the statement is valid PostgreSQL statement. If it is, please report this issue at {ISSUES_URL}",  # noqa: E501
+                ),
+                output=statement.with_copy_data(statement.text.strip(noqa.NEW_LINE)),
+            )
+
+        BaseChecker.root_statement = statement.text
+        BaseChecker.statement_location = statement.start_location
+        # Reset statement fixes counter per statement
+        BaseChecker.statement_fixes.reset()
+
+        # Signal that we are processing inline sql statements
+        BaseChecker.in_inline_sql_mode = True
+
+        # Temporarily disable auto fixes, we do not try to fix inline sql statements
+        # inside plpgsql
+        with BaseChecker.disable_auto_fix(self.checkers):
+            for inline_sql_statement in inline_sql_statements:
+                BaseChecker.statement = inline_sql_statement.text
+                violations.update(
+                    self._run_checkers(
+                        dispatcher=dispatcher,
+                        parse_tree=inline_sql_statement.parse_tree,
+                    ),
+                )
+                node_types.update(dispatcher.node_types)
+
+        # We are done processing inline sql statements
+        # Reset in_inline_sql_mode to false
+        BaseChecker.in_inline_sql_mode = False
+
+        BaseChecker.statement_location = statement.start_location
+        BaseChecker.statement = statement.text
+        violations.update(
+            self._run_checkers(
+                dispatcher=dispatcher,
+                parse_tree=parse_tree,
+            ),
+        )
+        node_types.update(dispatcher.node_types)
+
+        # If the statement parse tree has been modified due to fixes,
+        # we output the fixed statement, otherwise we output the original statement
+        if BaseChecker.statement_fixes.counter > 0:
+            try:
+                fixed_statement = self.formatter.format_ast(
+                    source_ast=parse_tree,
+                    source_code=statement.text,
+                    comments=comments,
                 )
 
-            except parser.ParseError as error:
-                _errors.add(
-                    errors.Error(
-                        source_file=str(source_file),
-                        source_code=source_code,
+                if self.config.format.new_line_before_semicolon:
+                    fixed_statement += noqa.NEW_LINE + noqa.SEMI_COLON
+                else:
+                    fixed_statement += noqa.SEMI_COLON
+
+                return StatementResult(
+                    violations=violations,
+                    node_types=node_types,
+                    output=statement.with_copy_data(fixed_statement),
+                )
+            except RecursionError as error:  # pragma: no cover
+                return StatementResult(
+                    violations=violations,
+                    node_types=node_types,
+                    error=errors.Error(
+                        source_file=str(document.source_file),
                         statement_start_location=statement.start_location + 1,
                         statement_end_location=statement.end_location,
-                        statement=statement.text,
+                        line_number=document.line_index.line_number(
+                            statement.end_location,
+                        ),
                         message=str(error),
-                        hint=f"Make sure the statement is valid PostgreSQL statement. If it is, please report this issue at {ISSUES_URL}",  # noqa: E501
+                        hint="Maximum format depth exceeded, reduce deeply nested queries",  # noqa: E501
+                    ),
+                    output=statement.with_copy_data(
+                        statement.text.strip(noqa.NEW_LINE),
                     ),
                 )
-                fixed_statements.append(statement.text.strip(noqa.NEW_LINE))
-                continue
 
-            BaseChecker.root_statement = statement.text
-            BaseChecker.statement_location = statement.start_location
-            # Reset statement fixes counter per statement
-            BaseChecker.statement_fixes.reset()
-
-            # Signal that we are processing inline sql statements
-            BaseChecker.in_inline_sql_mode = True
-
-            # Temporarily disable auto fixes, we do not try to fix inline sql statements
-            # inside plpgsql
-            with BaseChecker.disable_auto_fix(self.checkers):
-                for inline_sql_statement in inline_sql_statements:
-                    BaseChecker.statement = inline_sql_statement
-                    for checker in self.checkers:
-                        checker.violations = set()
-                        checker(parser.parse_sql(inline_sql_statement))
-
-                        if not self.config.lint.ignore_noqa:
-                            self._skip_suppressed_violations(
-                                source_file=source_file,
-                                checker=checker,
-                                lint_ignores=lint_ignores,
-                            )
-
-                        violations.update(checker.violations)
-
-            # We are done processing inline sql statements
-            # Reset in_inline_sql_mode to false
-            BaseChecker.in_inline_sql_mode = False
-
-            BaseChecker.statement_location = statement.start_location
-            BaseChecker.statement = statement.text
-            for checker in self.checkers:
-                checker.violations = set()
+        return StatementResult(
+            violations=violations,
+            node_types=node_types,
+            output=statement.with_copy_data(statement.text.strip(noqa.NEW_LINE)),
+        )
 
-                checker(parse_tree)
+    @staticmethod
+    def _is_cross_statement(checker: BaseChecker) -> bool:
+        """Check if a checker keeps state across the statements of a source file, such
+        checkers reset their state per source file.
+        """
+        return type(checker).reset is not BaseChecker.reset
 
-                if not self.config.lint.ignore_noqa:
-                    self._skip_suppressed_violations(
-                        source_file=source_file,
-                        checker=checker,
-                        lint_ignores=lint_ignores,
-                    )
+    @staticmethod
+    def _dump_statement_result(
+        *,
+        statement_result: StatementResult,
+        statement: noqa.Statement,
+        document: noqa.SourceDocument,
+        cross_statement_checkers: set[BaseChecker],
+    ) -> list[object]:
+        """Serialize the result of a statement for the statement cache. Violations are
+        located relative to the statement, violations of checkers keeping state across
+        statements are left out as they depend on the preceding statements.
 
-                violations.update(checker.violations)
+        Parameters:
+        ----------
+        statement_result: StatementResult
+            Result of the statement.
+        statement: noqa.Statement
+            Linted statement.
+        document: noqa.SourceDocument
+            Source document of the statement.
+        cross_statement_checkers: set[BaseChecker]
+            Checkers keeping state across statements.
 
-            # If the statement parse tree has been modified due to fixes,
-            # we output the fixed statement, otherwise we output the original statement
-            if BaseChecker.statement_fixes.counter > 0:
-                try:
-                    fixed_statement = self.formatter.format_ast(
-                        source_ast=parse_tree,
-                        source_code=statement.text,
-                        comments=comments,
-                    )
+        Returns:
+        -------
+        list[object]
+            Names of the visited node types and the violations of the statement.
+        """
+        cross_statement_codes = {checker.code for checker in cross_statement_checkers}
 
-                    if self.config.format.new_line_before_semicolon:
-                        fixed_statement += noqa.NEW_LINE + noqa.SEMI_COLON
-                    else:
-                        fixed_statement += noqa.SEMI_COLON
-
-                    fixed_statements.append(fixed_statement)
-                except RecursionError as error:  # pragma: no cover
-                    _errors.add(
-                        errors.Error(
-                            source_file=str(source_file),
-                            source_code=source_code,
-                            statement_start_location=statement.start_location + 1,
-                            statement_end_location=statement.end_location,
-                            statement=statement.text,
-                            message=str(error),
-                            hint="Maximum format depth exceeded, reduce deeply nested queries",  # noqa: E501
-                        ),
+        return [
+            sorted(node_class.__name__ for node_class in statement_result.node_types),
+            [
+                (
+                    violation.rule_code,
+                    document.line_index.location(
+                        line_number=violation.line_number,
+                        column_offset=violation.column_offset,
                     )
-                    fixed_statements.append(statement.text.strip(noqa.NEW_LINE))
+                    - statement.start_location,
+                    violation.description,
+                    violation.is_auto_fixable,
+                    violation.is_fix_enabled,
+                    violation.help,
+                )
+                for violation in statement_result.violations
+                if violation.rule_code not in cross_statement_codes
+            ],
+        ]
 
-            else:
-                fixed_statements.append(statement.text.strip(noqa.NEW_LINE))
+    @staticmethod
+    def _load_statement_result(
+        *,
+        cached_statement: list[typing.Any],
+        statement: noqa.Statement,
+        document: noqa.SourceDocument,
+    ) -> StatementResult:
+        """Deserialize the cached result of a statement, locating its violations within
+        the source document.
 
-        fixed_source_code = None
+        Parameters:
+        ----------
+        cached_statement: list[typing.Any]
+            Cached result of the statement.
+        statement: noqa.Statement
+            Statement the result is cached for.
+        document: noqa.SourceDocument
+            Source document of the statement.
 
-        if BaseChecker.file_fixes.counter > 0:
-            fixed_source_code = (
-                noqa.NEW_LINE
-                + (noqa.NEW_LINE * self.config.format.lines_between_statements)
-            ).join(
-                fixed_statements,
-            ) + noqa.NEW_LINE  # final new line
+        Returns:
+        -------
+        StatementResult
+            Result of the statement.
+        """
+        violations: set[Violation] = set()
 
-        noqa.report_unused_lint_ignores(
-            source_file=source_file,
-            lint_ignores=lint_ignores,
-        )
+        for (
+            rule_code,
+            relative_location,
+            description,
+            is_auto_fixable,
+            is_fix_enabled,
+            help_,
+        ) in cached_statement[1]:
+            location = statement.start_location + relative_location
+
+            violations.add(
+                Violation(
+                    rule_code=rule_code,
+                    line_number=document.line_index.line_number(location),
+                    column_offset=document.line_index.column_offset(location),
+                    # Nodes without location are located at the end of the statement
+                    # and reported with the whole statement
+                    line_span=(
+                        (statement.start_location, location)
+                        if relative_location == len(statement.text)
+                        else document.line_index.line_span(location)
+                    ),
+                    statement_location=statement.start_location,
+                    description=description,
+                    is_auto_fixable=is_auto_fixable,
+                    is_fix_enabled=is_fix_enabled,
+                    help=help_,
+                ),
+            )
 
-        return LintResult(
-            source_file=source_file,
+        return StatementResult(
             violations=violations,
-            errors=_errors,
-            fixed_source_code=fixed_source_code,
+            node_types=set(),
+            output=statement.with_copy_data(statement.text.strip(noqa.NEW_LINE)),
         )
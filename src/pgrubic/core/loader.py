@@ -4,39 +4,94 @@ from __future__ import annotations
 
 import os
 import typing
-import fnmatch
 import inspect
+import functools
 import importlib
+import importlib.metadata
 
 from pgrubic import (
     RULES_DIRECTORY,
     RULES_BASE_MODULE,
     FORMATTERS_DIRECTORY,
     FORMATTERS_BASE_MODULE,
+    RULE_PACKS_ENTRY_POINT_GROUP,
+    manifest,
 )
-from pgrubic.core import config, linter
+from pgrubic.core import noqa, config, errors, linter, selection
 
 
-def load_rules(
-    config: config.Config,
-    *,
-    include_deprecated: bool = False,
-) -> set[type[linter.BaseChecker]]:
-    """Load rules.
+class RuleEntry(typing.NamedTuple):
+    """Entry of a rule in the manifest."""
 
-    Parameters:
-    ----------
-    config: config.Config
-        Config.
-    include_deprecated: bool
-        Include deprecated rules.
+    module: str
+    name: str
+    category: str
+    deprecated: bool
+
+
+class RulePack(typing.NamedTuple):
+    """Third-party rules registered under the `pgrubic.rules` entry point group."""
+
+    name: str
+    version: str
+    rules: dict[str, RuleEntry]
+
+
+@functools.cache
+def load_rule_packs() -> tuple[RulePack, ...]:
+    """Load the manifests of the installed rule packs. A rule pack registers a module
+    under the `pgrubic.rules` entry point group, whose `RULES` map its rule codes to
+    entries as in the manifest of the built-in rules. Only the manifests are imported,
+    the rules are imported when selected.
 
     Returns:
     -------
-    set[linter.BaseChecker]
-        Set of rules.
+    tuple[RulePack, ...]
+        Rule packs, sorted by name.
     """
-    rules: set[type[linter.BaseChecker]] = set()
+    rule_packs: list[RulePack] = []
+    rule_codes = set(manifest.RULES)
+
+    for entry_point in sorted(
+        importlib.metadata.entry_points(group=RULE_PACKS_ENTRY_POINT_GROUP),
+        key=lambda entry_point: entry_point.name,
+    ):
+        try:
+            rules = {
+                code: RuleEntry(*entry)
+                for code, entry in entry_point.load().RULES.items()
+            }
+        except Exception as error:
+            msg = f"""Rule pack "{entry_point.name}" cannot be loaded: {error}"""
+            raise errors.RulePackError(msg) from error
+
+        if duplicate_codes := sorted(rule_codes.intersection(rules)):
+            msg = f"""Rule pack "{entry_point.name}" redefines the rules {", ".join(duplicate_codes)}"""  # noqa: E501
+            raise errors.RulePackError(msg)
+
+        rule_codes.update(rules)
+
+        rule_packs.append(
+            RulePack(
+                name=entry_point.name,
+                version=entry_point.dist.version if entry_point.dist else "",
+                rules=rules,
+            ),
+        )
+
+    return tuple(rule_packs)
+
+
+def scan_rules() -> dict[str, RuleEntry]:
+    """Scan the rules directory, importing every rule module, to build the rule entries
+    of the manifest.
+
+    Returns:
+    -------
+    dict[str, RuleEntry]
+        Rule entries by rule code, sorted by rule code.
+    """
+    rules: dict[str, RuleEntry] = {}
 
     for path in sorted(RULES_DIRECTORY.rglob("[!_]*.py"), key=lambda x: x.name):
         module_path = (
@@ -51,38 +106,29 @@ def load_rules(
             module,
             lambda x: inspect.isclass(x) and x.__module__ == module.__name__,  # noqa: B023
         ):
-            if (
-                issubclass(rule, linter.BaseChecker)
-                and (include_deprecated or not rule.deprecation)
-                and not rule.__name__.startswith(
-                    "_",
-                )
-                and (
-                    not config.lint.select
-                    or any(
-                        fnmatch.fnmatch(rule.code, pattern + "*")
-                        for pattern in config.lint.select
-                    )
-                )
-                and not any(
-                    fnmatch.fnmatch(rule.code, pattern + "*")
-                    for pattern in config.lint.ignore
-                )
+            if issubclass(rule, linter.BaseChecker) and not rule.__name__.startswith(
+                "_",
             ):
-                rules.add(rule)
+                rules[rule.code] = RuleEntry(
+                    module=module.__name__,
+                    name=rule.__name__,
+                    category=rule.category,
+                    deprecated=rule.deprecation is not None,
+                )
 
-    return rules
+    return dict(sorted(rules.items()))
 
 
-def load_formatters() -> set[typing.Callable[[], None]]:
-    """Load formatters.
+def scan_formatters() -> dict[str, tuple[str, ...]]:
+    """Scan the formatters directory, importing every formatter module, to build the
+    formatter entries of the manifest.
 
     Returns:
     -------
-    set[typing.Callable[[], None]]
-        Set of formatters.
+    dict[str, tuple[str, ...]]
+        Names of the formatters by module, sorted by module.
     """
-    formatters: set[typing.Callable[[], None]] = set()
+    formatters: dict[str, tuple[str, ...]] = {}
 
     for path in sorted(FORMATTERS_DIRECTORY.rglob("[!_]*.py"), key=lambda x: x.name):
         module_path = (
@@ -93,10 +139,139 @@ def load_formatters() -> set[typing.Callable[[], None]]:
 
         module = importlib.import_module(module_path)
 
-        for _, formatter in inspect.getmembers(
-            module,
-            lambda x: inspect.isfunction(x) and x.__module__ == module.__name__,  # noqa: B023
-        ):
-            formatters.add(formatter)
+        formatters[module.__name__] = tuple(
+            name
+            for name, _ in inspect.getmembers(
+                module,
+                lambda x: inspect.isfunction(x) and x.__module__ == module.__name__,  # noqa: B023
+            )
+        )
+
+    return dict(sorted(formatters.items()))
+
+
+def generate_manifest() -> str:
+    """Generate the source code of the manifest module.
+
+    Returns:
+    -------
+    str
+        Source code of the manifest module.
+    """
+    lines = [
+        '"""Manifest of the built-in rules and formatters.',
+        "",
+        "Generated by `python tools/manifest_generator.py`, do not edit.",
+        '"""',
+        "",
+        "import typing",
+        "",
+        "# Rule code to module, class name, category and whether the rule is deprecated",
+        "RULES: typing.Final[dict[str, tuple[str, str, str, bool]]] = {",
+    ]
+
+    for code, rule in scan_rules().items():
+        lines.extend(
+            [
+                f'    "{code}": (',
+                f'        "{rule.module}",',
+                f'        "{rule.name}",',
+                f'        "{rule.category}",',
+                f"        {rule.deprecated},",
+                "    ),",
+            ],
+        )
+
+    lines.extend(
+        [
+            "}",
+            "",
+            "# Formatter module to the names of its formatters",
+            "FORMATTERS: typing.Final[dict[str, tuple[str, ...]]] = {",
+        ],
+    )
+
+    for module, names in scan_formatters().items():
+        # A single formatter fits on one line, as the formatting of the code would do
+        if len(names) == 1:
+            lines.append(f'    "{module}": ("{names[0]}",),')
+            continue
+
+        lines.extend(
+            [
+                f'    "{module}": (',
+                *(f'        "{name}",' for name in names),
+                "    ),",
+            ],
+        )
+
+    lines.append("}")
+
+    return noqa.NEW_LINE.join(lines) + noqa.NEW_LINE
+
+
+def rule_entries() -> dict[str, RuleEntry]:
+    """Get the entries of the built-in rules and of the rules of the rule packs.
+
+    Returns:
+    -------
+    dict[str, RuleEntry]
+        Rule entries by rule code.
+    """
+    rules = {code: RuleEntry(*entry) for code, entry in manifest.RULES.items()}
+
+    for rule_pack in load_rule_packs():
+        rules.update(rule_pack.rules)
+
+    return rules
+
+
+def load_rules(
+    config: config.Config,
+    *,
+    include_deprecated: bool = False,
+) -> set[type[linter.BaseChecker]]:
+    """Load rules. The built-in rules and the rules of the rule packs are selected from
+    their manifests, only the modules of the selected rules are imported. Rules
+    selected for some source files only, through **per-file-select**, are loaded as
+    well.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+    include_deprecated: bool
+        Include deprecated rules.
+
+    Returns:
+    -------
+    set[linter.BaseChecker]
+        Set of rules.
+    """
+    entries = rule_entries()
+
+    rule_selection = selection.compile_rule_selection(config.lint, codes=entries)
+
+    return {
+        getattr(importlib.import_module(rule.module), rule.name)
+        for code, rule in entries.items()
+        if (include_deprecated or not rule.deprecated) and code in rule_selection.loaded
+    }
+
+
+def load_formatters() -> set[typing.Callable[[], None]]:
+    """Load formatters from the manifest.
+
+    Returns:
+    -------
+    set[typing.Callable[[], None]]
+        Set of formatters.
+    """
+    formatters: set[typing.Callable[[], None]] = set()
+
+    for module_path, names in manifest.FORMATTERS.items():
+        module = importlib.import_module(module_path)
+
+        formatters.update(getattr(module, name) for name in names)
 
     return formatters
@@ -1,15 +1,41 @@
 """Logger."""
 
-import logging
+from __future__ import annotations
 
-from rich.logging import RichHandler
+import typing
+import logging
+import functools
 
 from pgrubic import PACKAGE_NAME
 
+if typing.TYPE_CHECKING:
+    from rich.logging import RichHandler  # pragma: no cover
+
+
+class _LazyRichHandler(logging.Handler):
+    """Handler delegating to a rich handler, only imported once a record is emitted as
+    most runs log nothing.
+    """
+
+    @functools.cached_property
+    def handler(self) -> RichHandler:
+        """Rich handler."""
+        from rich.logging import RichHandler  # noqa: PLC0415
+
+        handler = RichHandler(level=self.level, show_path=False)
+        handler.setFormatter(self.formatter)
+
+        return handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Emit a record with the rich handler."""
+        self.handler.emit(record)
+
+
 logging.basicConfig(
     datefmt="%Y-%m-%dT%H:%M:%S",
     format="%(message)s",
-    handlers=[RichHandler(show_path=False)],
+    handlers=[_LazyRichHandler()],
 )
 
 logger = logging.getLogger(PACKAGE_NAME)
@@ -0,0 +1,860 @@
+"""Language server, speaking the Language Server Protocol over stdio.
+
+Lint violations are published as diagnostics on each edit, documents are formatted
+whole or by range and auto-fixable violations are offered as code actions. Lint and
+format results are kept per statement between edits, so that an edit only reprocesses
+the statements whose text changed.
+"""
+
+from __future__ import annotations
+
+import sys
+import enum
+import json
+import typing
+import contextlib
+import urllib.parse
+import urllib.request
+
+from pglast import parser
+
+import pgrubic
+from pgrubic import PACKAGE_NAME, DOCUMENTATION_URL, RULE_DOCUMENTATION_BASE
+from pgrubic.core import noqa, cache, config, linter, loader, formatter
+from pgrubic.core.logger import logger
+
+JSONRPC_VERSION: typing.Final[str] = "2.0"
+
+CONTENT_LENGTH_HEADER: typing.Final[bytes] = b"content-length"
+
+HEADER_SEPARATOR: typing.Final[bytes] = b"\r\n"
+
+POSITION_ENCODING_UTF16: typing.Final[str] = "utf-16"
+POSITION_ENCODING_UTF32: typing.Final[str] = "utf-32"
+
+# Characters outside of the basic multilingual plane take two UTF-16 code units
+BASIC_MULTILINGUAL_PLANE_END: typing.Final[int] = 0xFFFF
+
+# Documents are synced incrementally, by the changed ranges
+TEXT_DOCUMENT_SYNC_INCREMENTAL: typing.Final[int] = 2
+
+DIAGNOSTIC_TAG_UNNECESSARY: typing.Final[int] = 1
+
+CODE_ACTION_KIND_QUICK_FIX: typing.Final[str] = "quickfix"
+CODE_ACTION_KIND_SOURCE_FIX_ALL: typing.Final[str] = f"source.fixAll.{PACKAGE_NAME}"
+
+
+class ErrorCode(enum.IntEnum):
+    """JSON-RPC and Language Server Protocol error codes."""
+
+    METHOD_NOT_FOUND = -32601
+    INTERNAL_ERROR = -32603
+    SERVER_NOT_INITIALIZED = -32002
+
+
+class DiagnosticSeverity(enum.IntEnum):
+    """Severity of a diagnostic."""
+
+    ERROR = 1
+    WARNING = 2
+    INFORMATION = 3
+    HINT = 4
+
+
+class TextDocument:
+    """A text document opened in the editor, with positions converted from and to
+    locations in its text in the negotiated position encoding.
+    """
+
+    def __init__(
+        self,
+        *,
+        uri: str,
+        text: str,
+        version: int,
+        position_encoding: str = POSITION_ENCODING_UTF16,
+    ) -> None:
+        """Initialize variables."""
+        self.uri = uri
+        self.version = version
+        self.position_encoding = position_encoding
+        self.path = uri_to_path(uri)
+
+        self.text = text
+        self.line_index = noqa.LineIndex(text)
+
+    def location(self, position: dict[str, int]) -> int:
+        """Get the location of a position.
+
+        Parameters:
+        ----------
+        position: dict[str, int]
+            Position, made of a line and a character, both starting at 0.
+
+        Returns:
+        -------
+        int
+            Location in the text.
+        """
+        line_starts = self.line_index.line_starts
+
+        if position["line"] >= len(line_starts):
+            return len(self.text)
+
+        line_start, line_end = self.line_index.line_span(line_starts[position["line"]])
+
+        if self.position_encoding == POSITION_ENCODING_UTF32:
+            return min(line_start + position["character"], line_end)
+
+        location = line_start
+        code_units = 0
+
+        while location < line_end and code_units < position["character"]:
+            code_units += _code_units(self.text[location])
+            location += 1
+
+        return location
+
+    def position(self, location: int) -> dict[str, int]:
+        """Get the position of a location.
+
+        Parameters:
+        ----------
+        location: int
+            Location in the text.
+
+        Returns:
+        -------
+        dict[str, int]
+            Position, made of a line and a character, both starting at 0.
+        """
+        line_start = self.line_index.line_start(location)
+
+        if self.position_encoding == POSITION_ENCODING_UTF32:
+            character = location - line_start
+        else:
+            character = sum(_code_units(char) for char in self.text[line_start:location])
+
+        return {
+            "line": self.line_index.line_number(location) - 1,
+            "character": character,
+        }
+
+    def range(self, start_location: int, end_location: int) -> dict[str, typing.Any]:
+        """Get the range of the text between two locations.
+
+        Parameters:
+        ----------
+        start_location: int
+            Start location.
+        end_location: int
+            End location, excluded.
+
+        Returns:
+        -------
+        dict[str, typing.Any]
+            Range.
+        """
+        return {
+            "start": self.position(start_location),
+            "end": self.position(end_location),
+        }
+
+    def apply_change(self, change: dict[str, typing.Any]) -> None:
+        """Apply a change to the text, replacing the whole text when the change has no
+        range.
+
+        Parameters:
+        ----------
+        change: dict[str, typing.Any]
+            Content change event.
+
+        Returns:
+        -------
+        None
+        """
+        if "range" in change:
+            start_location = self.location(change["range"]["start"])
+            end_location = self.location(change["range"]["end"])
+
+            self.text = (
+                self.text[:start_location] + change["text"] + self.text[end_location:]
+            )
+        else:
+            self.text = change["text"]
+
+        self.line_index = noqa.LineIndex(self.text)
+
+
+def _code_units(char: str) -> int:
+    """Get the number of UTF-16 code units of a character."""
+    return 2 if ord(char) > BASIC_MULTILINGUAL_PLANE_END else 1
+
+
+def uri_to_path(uri: str) -> str:
+    """Convert a document URI to a path, URIs of other schemes than file are kept.
+
+    Parameters:
+    ----------
+    uri: str
+        Document URI.
+
+    Returns:
+    -------
+    str
+        Path to the document.
+    """
+    parsed_uri = urllib.parse.urlparse(uri)
+
+    if parsed_uri.scheme != "file":
+        return uri
+
+    return urllib.request.url2pathname(urllib.parse.unquote(parsed_uri.path))
+
+
+class LanguageServer:
+    """Language server of a single client, reading requests and notifications from
+    `reader` and writing responses and notifications to `writer`.
+    """
+
+    def __init__(
+        self,
+        *,
+        config: config.Config,
+        reader: typing.BinaryIO,
+        writer: typing.BinaryIO,
+    ) -> None:
+        """Initialize variables."""
+        self.reader = reader
+        self.writer = writer
+
+        # Diagnostics are published without fixing, fixes are offered as code actions
+        self.config = config.model_copy(deep=True)
+        self.config.lint.fix = False
+
+        self.fix_config = config.model_copy(deep=True)
+        self.fix_config.lint.fix = True
+
+        self.rules = {rule.code: rule for rule in loader.load_rules(config=self.config)}
+
+        self.lint_statement_cache = cache.MemoryStatementCache(
+            config_digest=cache.lint_config_digest(self.config),
+        )
+        self.linter = linter.Linter(
+            config=self.config,
+            formatters=loader.load_formatters,
+            statement_cache=self.lint_statement_cache,
+        )
+
+        for rule in self.rules.values():
+            self.linter.checkers.add(rule(config=self.config))
+
+        self.format_statement_cache = cache.MemoryStatementCache(
+            config_digest=cache.format_config_digest(self.config),
+        )
+        self.formatter = formatter.Formatter(
+            config=self.config,
+            formatters=loader.load_formatters,
+            statement_cache=self.format_statement_cache,
+        )
+
+        self.position_encoding = POSITION_ENCODING_UTF16
+        self.documents: dict[str, TextDocument] = {}
+        self.lint_results: dict[str, linter.LintResult] = {}
+
+        self.initialized = False
+        self.shutdown = False
+        self.exited = False
+
+        self.handlers: dict[
+            str,
+            typing.Callable[[dict[str, typing.Any]], typing.Any],
+        ] = {
+            "initialize": self._initialize,
+            "initialized": self._ignore,
+            "shutdown": self._shutdown,
+            "exit": self._exit,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didSave": self._ignore,
+            "textDocument/didClose": self._did_close,
+            "textDocument/formatting": self._formatting,
+            "textDocument/rangeFormatting": self._range_formatting,
+            "textDocument/codeAction": self._code_action,
+        }
+
+    def serve(self) -> int:
+        """Handle messages until the client exits or closes the input.
+
+        Returns:
+        -------
+        int
+            Exit code, 0 if the client asked to shut down before exiting.
+        """
+        while not self.exited and (message := self.read_message()) is not None:
+            self.handle(message)
+
+        return 0 if self.shutdown else 1
+
+    def read_message(self) -> dict[str, typing.Any] | None:
+        """Read a message.
+
+        Returns:
+        -------
+        dict[str, typing.Any] | None
+            Message, None at the end of the input.
+        """
+        content_length = None
+
+        while True:
+            header = self.reader.readline()
+
+            if not header:
+                return None
+
+            header = header.strip()
+
+            if not header:
+                break
+
+            name, _, value = header.partition(b":")
+
+            if name.strip().lower() == CONTENT_LENGTH_HEADER:
+                content_length = int(value)
+
+        if content_length is None:
+            return None
+
+        message: dict[str, typing.Any] = json.loads(
+            self.reader.read(content_length).decode("utf-8"),
+        )
+
+        return message
+
+    def send_message(self, message: dict[str, typing.Any]) -> None:
+        """Write a message.
+
+        Parameters:
+        ----------
+        message: dict[str, typing.Any]
+            Message.
+
+        Returns:
+        -------
+        None
+        """
+        body = json.dumps(
+            {"jsonrpc": JSONRPC_VERSION, **message},
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        self.writer.write(
+            b"Content-Length: "
+            + str(len(body)).encode("ascii")
+            + HEADER_SEPARATOR
+            + HEADER_SEPARATOR
+            + body,
+        )
+        self.writer.flush()
+
+    def notify(self, method: str, params: dict[str, typing.Any]) -> None:
+        """Send a notification.
+
+        Parameters:
+        ----------
+        method: str
+            Method of the notification.
+        params: dict[str, typing.Any]
+            Parameters of the notification.
+
+        Returns:
+        -------
+        None
+        """
+        self.send_message({"method": method, "params": params})
+
+    def handle(self, message: dict[str, typing.Any]) -> None:
+        """Handle a request or a notification, responses from the client are ignored.
+
+        Parameters:
+        ----------
+        message: dict[str, typing.Any]
+            Message.
+
+        Returns:
+        -------
+        None
+        """
+        method = message.get("method")
+
+        if method is None:
+            return
+
+        is_request = "id" in message
+        handler = self.handlers.get(method)
+
+        if not self.initialized and method not in ("initialize", "exit"):
+            if is_request:
+                self._respond_error(
+                    message["id"],
+                    code=ErrorCode.SERVER_NOT_INITIALIZED,
+                    error_message="Server not initialized",
+                )
+            return
+
+        if handler is None:
+            if is_request:
+                self._respond_error(
+                    message["id"],
+                    code=ErrorCode.METHOD_NOT_FOUND,
+                    error_message=f"Method not found: {method}",
+                )
+            return
+
+        try:
+            result = handler(message.get("params") or {})
+        except Exception as error:  # noqa: BLE001
+            logger.exception("Failed to handle %s", method)
+
+            if is_request:
+                self._respond_error(
+                    message["id"],
+                    code=ErrorCode.INTERNAL_ERROR,
+                    error_message=str(error),
+                )
+            return
+
+        if is_request:
+            self.send_message({"id": message["id"], "result": result})
+
+    def _respond_error(
+        self,
+        request_id: int | str,
+        *,
+        code: ErrorCode,
+        error_message: str,
+    ) -> None:
+        """Respond to a request with an error."""
+        self.send_message(
+            {"id": request_id, "error": {"code": code, "message": error_message}},
+        )
+
+    def _ignore(self, _params: dict[str, typing.Any]) -> None:
+        """Ignore a notification."""
+
+    def _initialize(self, params: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        """Negotiate the position encoding and return the server capabilities."""
+        position_encodings = (
+            params.get("capabilities", {}).get("general", {}).get("positionEncodings")
+            or []
+        )
+
+        # Locations in the text are code points, so are UTF-32 positions
+        if POSITION_ENCODING_UTF32 in position_encodings:
+            self.position_encoding = POSITION_ENCODING_UTF32
+
+        self.initialized = True
+
+        return {
+            "capabilities": {
+                "positionEncoding": self.position_encoding,
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": TEXT_DOCUMENT_SYNC_INCREMENTAL,
+                },
+                "documentFormattingProvider": True,
+                "documentRangeFormattingProvider": True,
+                "codeActionProvider": {
+                    "codeActionKinds": [
+                        CODE_ACTION_KIND_QUICK_FIX,
+                        CODE_ACTION_KIND_SOURCE_FIX_ALL,
+                    ],
+                },
+            },
+            "serverInfo": {"name": PACKAGE_NAME, "version": pgrubic.__version__},
+        }
+
+    def _shutdown(self, _params: dict[str, typing.Any]) -> None:
+        """Prepare to exit."""
+        self.shutdown = True
+
+    def _exit(self, _params: dict[str, typing.Any]) -> None:
+        """Stop serving."""
+        self.exited = True
+
+    def _did_open(self, params: dict[str, typing.Any]) -> None:
+        """Lint an opened document."""
+        text_document = params["textDocument"]
+
+        document = TextDocument(
+            uri=text_document["uri"],
+            text=text_document["text"],
+            version=text_document.get("version", 0),
+            position_encoding=self.position_encoding,
+        )
+        self.documents[document.uri] = document
+
+        self._publish_diagnostics(document)
+
+    def _did_change(self, params: dict[str, typing.Any]) -> None:
+        """Apply the changes to a document and lint it again."""
+        document = self.documents[params["textDocument"]["uri"]]
+
+        for change in params["contentChanges"]:
+            document.apply_change(change)
+
+        document.version = params["textDocument"].get("version", document.version)
+
+        self._publish_diagnostics(document)
+
+    def _did_close(self, params: dict[str, typing.Any]) -> None:
+        """Forget a closed document and clear its diagnostics."""
+        document = self.documents.pop(params["textDocument"]["uri"])
+        self.lint_results.pop(document.uri, None)
+
+        self.lint_statement_cache.discard(document.path)
+        self.format_statement_cache.discard(document.path)
+
+        self.notify(
+            "textDocument/publishDiagnostics",
+            {"uri": document.uri, "diagnostics": []},
+        )
+
+    def _publish_diagnostics(self, document: TextDocument) -> None:
+        """Lint a document and publish its diagnostics."""
+        try:
+            lint_result = self.linter.run(
+                source_file=document.path,
+                source_code=document.text,
+            )
+        # The source code cannot be tokenized, such as while a string is being typed
+        except parser.ParseError as error:
+            self.lint_results.pop(document.uri, None)
+
+            location = (
+                min(error.args[1], len(document.text))
+                if len(error.args) > 1 and isinstance(error.args[1], int)
+                else 0
+            )
+
+            diagnostics = [
+                {
+                    "range": document.range(location, location),
+                    "severity": DiagnosticSeverity.ERROR,
+                    "source": PACKAGE_NAME,
+                    "message": str(error.args[0]),
+                },
+            ]
+        else:
+            self.lint_results[document.uri] = lint_result
+            diagnostics = _diagnostics(document, lint_result)
+
+        self.notify(
+            "textDocument/publishDiagnostics",
+            {
+                "uri": document.uri,
+                "version": document.version,
+                "diagnostics": diagnostics,
+            },
+        )
+
+    def _formatting(self, params: dict[str, typing.Any]) -> list[dict[str, typing.Any]]:
+        """Format a document."""
+        document = self.documents[params["textDocument"]["uri"]]
+
+        format_result = self.formatter.format(
+            source_file=document.path,
+            source_code=document.text,
+        )
+
+        if format_result.errors or format_result.formatted_source_code == document.text:
+            return []
+
+        return [
+            {
+                "range": document.range(0, len(document.text)),
+                "newText": format_result.formatted_source_code,
+            },
+        ]
+
+    def _range_formatting(
+        self,
+        params: dict[str, typing.Any],
+    ) -> list[dict[str, typing.Any]]:
+        """Format the statements of a document overlapping a range."""
+        document = self.documents[params["textDocument"]["uri"]]
+
+        start_location = document.location(params["range"]["start"])
+        end_location = document.location(params["range"]["end"])
+
+        source_document = noqa.SourceDocument(
+            source_file=document.path,
+            source_code=document.text,
+        )
+
+        if source_document.is_file_format_skip:
+            return []
+
+        statements = [
+            statement
+            for statement in source_document.statements
+            if statement.start_location <= end_location
+            and statement.end_location >= start_location
+        ]
+
+        if not statements:
+            return []
+
+        # Leading new lines and spaces are left as they are, so that the statements
+        # stay separated from the previous ones
+        first_statement = statements[0]
+        span_start = (
+            first_statement.start_location
+            + len(first_statement.text)
+            - len(first_statement.text.lstrip())
+        )
+
+        last_statement = statements[-1]
+        span_end = last_statement.end_location
+
+        if last_statement.copy_data:
+            span_end += len(noqa.NEW_LINE) + len(last_statement.copy_data)
+
+        # Formatted apart from the document, so that the statements of the whole
+        # document stay in the statement cache
+        formatted_source_code, _errors = formatter.Formatter.run(
+            source_file=document.path,
+            source_code=document.text[span_start:span_end],
+            config=self.config,
+        )
+        formatted_source_code = formatted_source_code.removesuffix(noqa.NEW_LINE)
+
+        if _errors or formatted_source_code == document.text[span_start:span_end]:
+            return []
+
+        return [
+            {
+                "range": document.range(span_start, span_end),
+                "newText": formatted_source_code,
+            },
+        ]
+
+    def _code_action(self, params: dict[str, typing.Any]) -> list[dict[str, typing.Any]]:
+        """Offer fixes of the auto-fixable violations of the diagnostics in context,
+        and of every auto-fixable violation of the document.
+        """
+        document = self.documents[params["textDocument"]["uri"]]
+        lint_result = self.lint_results.get(document.uri)
+
+        only = params.get("context", {}).get("only")
+        diagnostics = [
+            diagnostic
+            for diagnostic in params.get("context", {}).get("diagnostics", [])
+            if diagnostic.get("source") == PACKAGE_NAME
+            and diagnostic.get("data", {}).get("fixable")
+        ]
+
+        actions: list[dict[str, typing.Any]] = []
+
+        for rule_code in dict.fromkeys(diagnostic["code"] for diagnostic in diagnostics):
+            edit = self._fix_edit(document, rule_codes={rule_code})
+
+            if edit is not None:
+                actions.append(
+                    {
+                        "title": f"Fix {rule_code} ({linter.RULE_METADATA[rule_code].name})",  # noqa: E501
+                        "kind": CODE_ACTION_KIND_QUICK_FIX,
+                        "diagnostics": [
+                            diagnostic
+                            for diagnostic in diagnostics
+                            if diagnostic["code"] == rule_code
+                        ],
+                        "isPreferred": True,
+                        "edit": edit,
+                    },
+                )
+
+        fixable_rule_codes = {
+            violation.rule_code
+            for violation in (lint_result.violations if lint_result else set())
+            if violation.is_auto_fixable and violation.is_fix_enabled
+        }
+
+        if fixable_rule_codes:
+            edit = self._fix_edit(document, rule_codes=fixable_rule_codes)
+
+            if edit is not None:
+                actions.append(
+                    {
+                        "title": "Fix all auto-fixable violations",
+                        "kind": CODE_ACTION_KIND_SOURCE_FIX_ALL,
+                        "edit": edit,
+                    },
+                )
+
+        if only:
+            actions = [
+                action
+                for action in actions
+                if any(action["kind"].startswith(kind) for kind in only)
+            ]
+
+        return actions
+
+    def _fix_edit(
+        self,
+        document: TextDocument,
+        *,
+        rule_codes: set[str],
+    ) -> dict[str, typing.Any] | None:
+        """Get the edit fixing the violations of rules in a document, if any."""
+        fix_linter = linter.Linter(
+            config=self.fix_config,
+            formatters=loader.load_formatters,
+        )
+
+        for rule_code in rule_codes:
+            fix_linter.checkers.add(self.rules[rule_code](config=self.fix_config))
+
+        lint_result = fix_linter.run(
+            source_file=document.path,
+            source_code=document.text,
+        )
+
+        if (
+            lint_result.fixed_source_code is None
+            or lint_result.fixed_source_code == document.text
+        ):
+            return None
+
+        return {
+            "changes": {
+                document.uri: [
+                    {
+                        "range": document.range(0, len(document.text)),
+                        "newText": lint_result.fixed_source_code,
+                    },
+                ],
+            },
+        }
+
+
+def _diagnostics(
+    document: TextDocument,
+    lint_result: linter.LintResult,
+) -> list[dict[str, typing.Any]]:
+    """Get the diagnostics of the violations, errors and unused noqa directives of a
+    lint result.
+
+    Parameters:
+    ----------
+    document: TextDocument
+        Linted document.
+    lint_result: linter.LintResult
+        Lint result of the document.
+
+    Returns:
+    -------
+    list[dict[str, typing.Any]]
+        Diagnostics.
+    """
+    diagnostics: list[dict[str, typing.Any]] = []
+
+    for violation in sorted(
+        lint_result.violations,
+        key=lambda violation: (
+            violation.line_number,
+            violation.column_offset,
+            violation.rule_code,
+        ),
+    ):
+        location = document.line_index.location(
+            line_number=violation.line_number,
+            column_offset=violation.column_offset,
+        )
+
+        message = violation.description
+
+        if violation.help:
+            message += f"{noqa.NEW_LINE}{violation.help}"
+
+        diagnostics.append(
+            {
+                "range": document.range(
+                    location,
+                    document.line_index.line_span(location)[1],
+                ),
+                "severity": DiagnosticSeverity.WARNING,
+                "code": violation.rule_code,
+                "codeDescription": {
+                    "href": f"{DOCUMENTATION_URL}/{RULE_DOCUMENTATION_BASE}/{violation.rule_category}/{violation.rule_name}",  # noqa: E501
+                },
+                "source": PACKAGE_NAME,
+                "message": message,
+                "data": {
+                    "fixable": violation.is_auto_fixable and violation.is_fix_enabled,
+                },
+            },
+        )
+
+    diagnostics.extend(
+        {
+            "range": document.range(
+                error.statement_start_location - 1,
+                error.statement_end_location,
+            ),
+            "severity": DiagnosticSeverity.ERROR,
+            "source": PACKAGE_NAME,
+            "message": error.message,
+        }
+        for error in sorted(
+            lint_result.errors,
+            key=lambda error: error.statement_start_location,
+        )
+    )
+
+    for directive in lint_result.unused_lint_ignores:
+        location = document.line_index.location(
+            line_number=directive.line_number,
+            column_offset=directive.column_offset,
+        )
+
+        diagnostics.append(
+            {
+                "range": document.range(
+                    location,
+                    document.line_index.line_span(location)[1],
+                ),
+                "severity": DiagnosticSeverity.INFORMATION,
+                "tags": [DIAGNOSTIC_TAG_UNNECESSARY],
+                "source": PACKAGE_NAME,
+                "message": f"Unused {noqa.LINT_IGNORE_DIRECTIVE} directive (unused: {directive.rule})",  # noqa: E501
+            },
+        )
+
+    return diagnostics
+
+
+def serve(config: config.Config) -> int:
+    """Serve a client over stdio.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    int
+        Exit code.
+    """
+    language_server = LanguageServer(
+        config=config,
+        reader=sys.stdin.buffer,
+        writer=sys.stdout.buffer,
+    )
+
+    # Anything else written to stdout, such as unused noqa directives, would corrupt
+    # the messages
+    with contextlib.redirect_stdout(sys.stderr):
+        return language_server.serve()
@@ -1,9 +1,13 @@
 """Handling noqa comments."""
 
+import re
 import sys
+import bisect
 import typing
 import pathlib
+import functools
 import dataclasses
+from collections import abc
 
 from pglast import parser
 from colorama import Fore, Style
@@ -18,6 +22,9 @@ SQL_COMMENT: typing.Final[str] = "SQL_COMMENT"
 C_COMMENT: typing.Final[str] = "C_COMMENT"
 BEGIN_BLOCK: typing.Final[str] = "BEGIN_P"
 END_BLOCK: typing.Final[str] = "END_P"
+ATOMIC: typing.Final[str] = "ATOMIC"
+COPY: typing.Final[str] = "COPY"
+CASE: typing.Final[str] = "CASE"
 
 LINT_IGNORE_DIRECTIVE: typing.Final[str] = "noqa"
 FORMAT_IGNORE_DIRECTIVE: typing.Final[str] = "fmt"
@@ -25,6 +32,20 @@ SEMI_COLON: typing.Final[str] = ";"
 NEW_LINE: typing.Final[str] = "\n"
 SPACE: typing.Final[str] = " "
 
+# Number of characters read at once when streaming a source code
+DEFAULT_CHUNK_SIZE: typing.Final[int] = 1024 * 1024
+
+
+# `COPY ... FROM stdin;` statement, followed by data rows terminated by a `\.` line
+COPY_FROM_STDIN: typing.Final[re.Pattern[str]] = re.compile(
+    r"^COPY\b[^;]*\bFROM\s+STDIN\b[^;]*;[ \t]*\n",
+    re.IGNORECASE | re.MULTILINE,
+)
+COPY_DATA_TERMINATOR: typing.Final[re.Pattern[str]] = re.compile(
+    r"^\\\.$",
+    re.MULTILINE,
+)
+
 
 class Statement(typing.NamedTuple):
     """Representation of an SQL statement."""
@@ -32,19 +53,592 @@ class Statement(typing.NamedTuple):
     start_location: int
     end_location: int
     text: str
+    # Data rows, including the terminator, following a `COPY ... FROM stdin` statement
+    copy_data: str = ""
+
+    def with_copy_data(self, text: str) -> str:
+        """Append the COPY data rows of the statement, if any, to its output text."""
+        if not self.copy_data:
+            return text
+
+        return text + NEW_LINE + self.copy_data
+
+
+class LineIndex:
+    """Index of the line start locations of a source code, built once per source code
+    so that line numbers, column offsets and lines can be derived from a location without
+    rescanning the source code.
+
+    The source code may be a part of a larger source code, starting at `start_location`
+    on line `start_line_number`, in which case locations are those of the larger source
+    code.
+    """
+
+    def __init__(
+        self,
+        source_code: str,
+        *,
+        start_location: int = 0,
+        start_line_number: int = 1,
+    ) -> None:
+        """Build the sorted line start locations."""
+        self.source_code = source_code
+        self.start_location = start_location
+        self.start_line_number = start_line_number
+        self.line_starts: list[int] = [start_location]
+        self.line_starts.extend(
+            start_location + match.end() for match in re.finditer(NEW_LINE, source_code)
+        )
+
+    def line_number(self, location: int) -> int:
+        """Get the line number, starting at 1, of a location."""
+        return (
+            bisect.bisect_right(self.line_starts, location) + self.start_line_number - 1
+        )
+
+    def line_start(self, location: int) -> int:
+        """Get the location of the start of the line of a location."""
+        return self.line_starts[bisect.bisect_right(self.line_starts, location) - 1]
+
+    def column_offset(self, location: int) -> int:
+        """Get the column offset, starting at 1, of a location."""
+        return location - self.line_start(location) + 1
+
+    def location(self, *, line_number: int, column_offset: int) -> int:
+        """Get the location of a line number and column offset."""
+        return self.line_starts[line_number - self.start_line_number] + column_offset - 1
+
+    def line_span(self, location: int) -> tuple[int, int]:
+        """Get the start and end locations of the line, without the new line, of a
+        location.
+        """
+        line_index = bisect.bisect_right(self.line_starts, location)
+
+        line_end = (
+            self.line_starts[line_index] - 1
+            if line_index < len(self.line_starts)
+            else self.start_location + len(self.source_code)
+        )
+
+        return self.line_starts[line_index - 1], line_end
+
+    def line(self, location: int) -> str:
+        """Get the line, without the new line, of a location."""
+        line_start, line_end = self.line_span(location)
+
+        return self.source_code[
+            line_start - self.start_location : line_end - self.start_location
+        ]
+
+
+class SourceChunk(typing.NamedTuple):
+    """Complete statements read from a stream, located within the whole source code."""
+
+    text: str
+    start_location: int
+    start_line_number: int
+
+
+def _scan_complete_tokens(source_code: str) -> list[parser.Token]:
+    """Scan the tokens of a partially read source code.
+
+    An unterminated string, quoted identifier or comment at the end of what has been read
+    so far fails the scan, only the source code before it is scanned.
+
+    Parameters:
+    ----------
+    source_code: str
+        Partially read source code.
+
+    Returns:
+    -------
+    list[parser.Token]
+        Tokens of the source code before any unterminated token.
+    """
+    scan_end = len(source_code)
+
+    while True:
+        try:
+            return parser.scan(source_code[:scan_end])
+        except parser.ParseError as error:
+            location = error.args[1] if len(error.args) > 1 else None
+
+            if not isinstance(location, int) or location >= scan_end:
+                return []
+
+            scan_end = location
+
+
+def _find_chunk_end(source_code: str) -> int | None:
+    """Find the end of the last complete statement of a partially read source code.
+
+    Only semi-colons ending a line end a chunk, so that chunks start on a new line and
+    their lines are complete. The end includes the new line following the semi-colon,
+    so that the statements of the following chunk start where they would when reading
+    the whole source code at once. Semi-colons inside parentheses or
+    `BEGIN ATOMIC ... END` blocks do not terminate statements.
+
+    Parameters:
+    ----------
+    source_code: str
+        Partially read source code.
+
+    Returns:
+    -------
+    int | None
+        End of the last complete statement, None if there is no complete statement yet.
+    """
+    tokens = _scan_complete_tokens(source_code)
+
+    chunk_end = None
+    parenthesis_depth = 0
+    case_depth = 0
+    inside_atomic_block = False
+    previous_token_name = None
+
+    for token in tokens:
+        if token.name == ATOMIC and previous_token_name == BEGIN_BLOCK:
+            inside_atomic_block = True
+        elif token.name == CASE:
+            case_depth += 1
+        elif token.name == END_BLOCK:
+            if case_depth:
+                case_depth -= 1
+            else:
+                inside_atomic_block = False
+        elif token.name == ASCII_OPEN_PARENTHESIS:
+            parenthesis_depth += 1
+        elif token.name == ASCII_CLOSE_PARENTHESIS:
+            parenthesis_depth -= 1
+        elif (
+            token.name == ASCII_SEMI_COLON
+            and not inside_atomic_block
+            and parenthesis_depth == 0
+            and source_code[token.end + 1 : token.end + 2] == NEW_LINE
+        ):
+            chunk_end = token.end + 2
+
+        previous_token_name = token.name
+
+    return chunk_end
+
+
+def _find_copy_statement(
+    source_code: str,
+    location: int = 0,
+) -> re.Match[str] | None:
+    """Find the next `COPY ... FROM stdin` statement.
+
+    Lines looking like one inside a comment, a string or a dollar-quoted body are
+    skipped, the source code is tokenized from the statement boundary at **location**
+    up to the end of each match to tell.
+
+    Parameters:
+    ----------
+    source_code: str
+        Source code to find the statement in.
+    location: int
+        Location of a statement boundary to search from.
+
+    Returns:
+    -------
+    re.Match[str] | None
+        Match of the statement, None if there is none.
+    """
+    search_location = location
+
+    while copy_statement := COPY_FROM_STDIN.search(source_code, search_location):
+        semi_colon = source_code.index(SEMI_COLON, copy_statement.start())
+
+        token_names = {
+            token.start + location: token.name
+            for token in _scan_complete_tokens(
+                source_code[location : copy_statement.end()],
+            )
+            if token.name not in (C_COMMENT, SQL_COMMENT)
+        }
+
+        previous_token_name = ASCII_SEMI_COLON
+
+        for start, name in token_names.items():
+            if start >= copy_statement.start():
+                break
+
+            previous_token_name = name
+
+        # COPY starts a statement and the semi-colon ends it
+        if (
+            previous_token_name == ASCII_SEMI_COLON
+            and token_names.get(copy_statement.start()) == COPY
+            and token_names.get(semi_colon) == ASCII_SEMI_COLON
+        ):
+            return copy_statement
+
+        # A match inside a comment may span a COPY statement starting on a later line
+        search_location = copy_statement.start() + 1
+
+    return None
+
+
+def read_source_chunks(
+    stream: typing.TextIO,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> abc.Iterator[SourceChunk]:
+    """Read a source code incrementally, in chunks of complete statements.
+
+    Only the statements being read are held in memory, which is bounded by the largest
+    statement rather than by the size of the source code.
+
+    Parameters:
+    ----------
+    stream: typing.TextIO
+        Stream to read the source code from.
+
+    chunk_size: int
+        Number of characters to read at once.
+
+    Yields:
+    ------
+    SourceChunk
+        Chunk of complete statements.
+    """
+    buffer = ""
+    start_location = 0
+    start_line_number = 1
+    read_size = chunk_size
+    inside_copy_data = False
+
+    while True:
+        data = stream.read(read_size)
+        buffer += data
+
+        chunk_start_location = start_location
+
+        while True:
+            if inside_copy_data:
+                # Data rows are skipped up to their terminator without being tokenized,
+                # the last line is kept as it may be an incomplete terminator
+                terminator = COPY_DATA_TERMINATOR.search(buffer)
+
+                if terminator is not None and terminator.end() < len(buffer):
+                    skip_end = terminator.end() + 1
+                    inside_copy_data = False
+                else:
+                    skip_end = buffer.rfind(NEW_LINE) + 1
+
+                start_location += skip_end
+                start_line_number += buffer.count(NEW_LINE, 0, skip_end)
+                buffer = buffer[skip_end:]
+
+                if inside_copy_data:
+                    break
+
+            copy_statement = _find_copy_statement(buffer)
+
+            if copy_statement is not None:
+                # The chunk ends with the COPY statement, its data rows are skipped
+                chunk_end: int | None = copy_statement.end()
+                inside_copy_data = True
+            else:
+                chunk_end = _find_chunk_end(buffer)
+
+            if chunk_end is None:
+                break
+
+            chunk = SourceChunk(
+                text=buffer[:chunk_end],
+                start_location=start_location,
+                start_line_number=start_line_number,
+            )
+            buffer = buffer[chunk_end:]
+
+            yield chunk
+
+            start_location += len(chunk.text)
+            start_line_number += chunk.text.count(NEW_LINE)
+
+        if not data:
+            break
+
+        # When a statement is larger than what has been read so far, read as much again
+        # so that it is rescanned a logarithmic number of times
+        read_size = (
+            chunk_size
+            if start_location > chunk_start_location
+            else max(chunk_size, len(buffer))
+        )
+
+    # Data rows of a COPY statement without terminator are not statements
+    if buffer and not inside_copy_data:
+        yield SourceChunk(
+            text=buffer,
+            start_location=start_location,
+            start_line_number=start_line_number,
+        )
+
+
+def find_copy_data_blocks(source_code: str) -> list[tuple[int, int]]:
+    """Find the data rows following `COPY ... FROM stdin` statements.
+
+    Data rows are found with a plain scan for their terminator line, without being
+    tokenized.
+
+    Parameters:
+    ----------
+    source_code: str
+        Source code to find the data rows in.
+
+    Returns:
+    -------
+    list[tuple[int, int]]
+        Start and end locations of the data rows, including their terminator.
+    """
+    copy_data_blocks: list[tuple[int, int]] = []
+
+    location = 0
+
+    while copy_statement := _find_copy_statement(source_code, location):
+        terminator = COPY_DATA_TERMINATOR.search(source_code, copy_statement.end())
+
+        if terminator is None:
+            break
+
+        copy_data_blocks.append((copy_statement.end(), terminator.end()))
+
+        location = terminator.end()
+
+    return copy_data_blocks
 
 
 def extract_statements(
     *,
     source_code: str,
+    tokens: list[parser.Token] | None = None,
 ) -> list[Statement]:
     """Extract statements from source code.
 
+    Data rows of `COPY ... FROM stdin` statements are attached to their statement, without
+    being tokenized.
+
     Parameters:
     ----------
     source_code: str
         Source code to extract statements from.
 
+    tokens: list[parser.Token] | None
+        Tokens of the source code, used when falling back to tokenizing the source code.
+
+    Returns:
+    -------
+    list[Statement]
+        List of statements.
+    """
+    copy_data_blocks = find_copy_data_blocks(source_code)
+
+    if not copy_data_blocks:
+        return _extract_sql_statements(source_code=source_code, tokens=tokens)
+
+    statements: list[Statement] = []
+
+    segment_start = 0
+
+    for data_start, data_end in copy_data_blocks:
+        # The segment ends with the semi-colon of the COPY statement, whose following
+        # new line is skipped as for any other statement
+        segment_statements = _extract_sql_statements(
+            source_code=source_code[segment_start : data_start - 1],
+        )
+
+        statements.extend(
+            _locate_statements(segment_statements[:-1], start_location=segment_start),
+        )
+        statements.extend(
+            statement._replace(copy_data=source_code[data_start:data_end])
+            for statement in _locate_statements(
+                segment_statements[-1:],
+                start_location=segment_start,
+            )
+        )
+
+        segment_start = data_end + 1
+
+    if segment_start < len(source_code):
+        statements.extend(
+            _locate_statements(
+                _extract_sql_statements(source_code=source_code[segment_start:]),
+                start_location=segment_start,
+            ),
+        )
+
+    return statements
+
+
+def _locate_statements(
+    statements: list[Statement],
+    *,
+    start_location: int,
+) -> list[Statement]:
+    """Locate statements of a segment within the whole source code."""
+    if not start_location:
+        return statements
+
+    return [
+        statement._replace(
+            start_location=statement.start_location + start_location,
+            end_location=statement.end_location + start_location,
+        )
+        for statement in statements
+    ]
+
+
+def _extract_sql_statements(
+    *,
+    source_code: str,
+    tokens: list[parser.Token] | None = None,
+) -> list[Statement]:
+    """Extract statements from source code without COPY data rows.
+
+    Statements are split by libpg_query in a single parse of the source code. When the
+    source code contains an invalid statement, we fall back to tokenizing the whole source
+    code so that only the invalid statements fail to parse later on.
+
+    Parameters:
+    ----------
+    source_code: str
+        Source code to extract statements from.
+
+    tokens: list[parser.Token] | None
+        Tokens of the source code, used when falling back to tokenizing the source code.
+
+    Returns:
+    -------
+    list[Statement]
+        List of statements.
+    """
+    try:
+        statement_slices = typing.cast(
+            tuple[slice, ...],
+            parser.split(source_code, only_slices=True),
+        )
+    except parser.ParseError:
+        return _extract_statements_from_tokens(source_code=source_code, tokens=tokens)
+
+    if not statement_slices:
+        return _extract_statements_from_tokens(source_code=source_code, tokens=tokens)
+
+    return _extract_statements_from_slices(
+        source_code=source_code,
+        statement_slices=statement_slices,
+        tokens=tokens,
+    )
+
+
+def _extract_statements_from_slices(
+    *,
+    source_code: str,
+    statement_slices: tuple[slice, ...],
+    tokens: list[parser.Token] | None = None,
+) -> list[Statement]:
+    """Extract statements from source code given the slices of its statements.
+
+    Only the gaps between the slices, made of whitespaces, comments and semi-colons, are
+    tokenized. Statements carry the same boundaries as when tokenizing the whole source
+    code.
+
+    Parameters:
+    ----------
+    source_code: str
+        Source code to extract statements from.
+
+    statement_slices: tuple[slice, ...]
+        Slices of the statements, excluding the terminating semi-colons.
+
+    tokens: list[parser.Token] | None
+        Tokens of the source code. When not given, only the gaps are scanned.
+
+    Returns:
+    -------
+    list[Statement]
+        List of statements.
+    """
+    statements: list[Statement] = []
+
+    statement_start_location = 0
+
+    gap_starts = [0, *(statement_slice.stop for statement_slice in statement_slices)]
+    gap_ends = [
+        *(statement_slice.start for statement_slice in statement_slices),
+        len(source_code),
+    ]
+
+    last_gap = len(statement_slices)
+
+    token_starts = [token.start for token in tokens] if tokens is not None else []
+
+    for gap, (gap_start, gap_end) in enumerate(zip(gap_starts, gap_ends, strict=True)):
+        # Locations of the gap tokens are relative to the token offset
+        if tokens is not None:
+            gap_tokens = tokens[
+                bisect.bisect_left(token_starts, gap_start) : bisect.bisect_left(
+                    token_starts,
+                    gap_end,
+                )
+            ]
+            token_offset = 0
+        else:
+            gap_tokens = (
+                parser.scan(source_code[gap_start:gap_end]) if gap_end > gap_start else []
+            )
+            token_offset = gap_start
+
+        for token in gap_tokens:
+            # Check if we have reached a semi-colon or the end of the source code
+            if token.name == ASCII_SEMI_COLON or (
+                gap == last_gap and token is gap_tokens[-1]
+            ):
+                # In order to include the last character, we need to increase the end
+                # location by 1
+                actual_end_location = token_offset + token.end + 1
+
+                statements.append(
+                    Statement(
+                        start_location=statement_start_location,
+                        end_location=actual_end_location,
+                        text=source_code[statement_start_location:actual_end_location],
+                    ),
+                )
+                # Move to the next statement
+                statement_start_location = actual_end_location + 1
+
+        # The last statement is not terminated by a semi-colon
+        if gap == last_gap and not gap_tokens:
+            statements.append(
+                Statement(
+                    start_location=statement_start_location,
+                    end_location=gap_start,
+                    text=source_code[statement_start_location:gap_start],
+                ),
+            )
+
+    return statements
+
+
+def _extract_statements_from_tokens(
+    *,
+    source_code: str,
+    tokens: list[parser.Token] | None = None,
+) -> list[Statement]:
+    """Extract statements from source code by tokenizing the whole source code.
+
+    Parameters:
+    ----------
+    source_code: str
+        Source code to extract statements from.
+
+    tokens: list[parser.Token] | None
+        Tokens of the source code. Scanned from the source code when not given.
+
     Returns:
     -------
     list[Statement]
@@ -54,7 +648,8 @@ def extract_statements(
 
     statement_start_location = 0
 
-    tokens: list[parser.Token] = parser.scan(source_code)
+    if tokens is None:
+        tokens = parser.scan(source_code)
 
     inside_block = False  # Tracks if we are inside BEGIN ... END block
 
@@ -148,10 +743,98 @@ class NoQaDirective:
     used: bool = False
 
 
+class SuppressionIndex:
+    """Index of noqa directives, keyed by statement location and rule for statement
+    directives and by rule for file directives.
+    """
+
+    def __init__(self) -> None:
+        """Initialize variables."""
+        self.directives: list[NoQaDirective] = []
+        self._file_directives: dict[str, list[NoQaDirective]] = {}
+        self._statement_directives: dict[tuple[int, str], list[NoQaDirective]] = {}
+
+    def add(self, directives: list[NoQaDirective]) -> None:
+        """Add noqa directives to the index.
+
+        Parameters:
+        ----------
+        directives: list[NoQaDirective]
+            List of noqa directives.
+
+        Returns:
+        -------
+        None
+        """
+        for directive in directives:
+            self.directives.append(directive)
+
+            if directive.source_file is not None:
+                self._file_directives.setdefault(directive.rule, []).append(directive)
+            else:
+                self._statement_directives.setdefault(
+                    (directive.location, directive.rule),
+                    [],
+                ).append(directive)
+
+    def _get_directives(self, *, location: int, rule: str) -> list[NoQaDirective]:
+        """Get the noqa directives matching a rule in the statement at location."""
+        return [
+            *self._file_directives.get(rule, ()),
+            *self._file_directives.get(A_STAR, ()),
+            *self._statement_directives.get((location, rule), ()),
+            *self._statement_directives.get((location, A_STAR), ()),
+        ]
+
+    def is_suppressed(self, *, location: int, rule: str) -> bool:
+        """Check if a rule is suppressed in the statement at location.
+
+        Parameters:
+        ----------
+        location: int
+            Location of the statement.
+
+        rule: str
+            Rule code.
+
+        Returns:
+        -------
+        bool
+            True if the rule is suppressed, False otherwise.
+        """
+        return bool(self._get_directives(location=location, rule=rule))
+
+    def suppress(self, *, location: int, rule: str) -> bool:
+        """Check if a rule is suppressed in the statement at location, marking the
+        matching noqa directives as used.
+
+        Parameters:
+        ----------
+        location: int
+            Location of the statement.
+
+        rule: str
+            Rule code.
+
+        Returns:
+        -------
+        bool
+            True if the rule is suppressed, False otherwise.
+        """
+        directives = self._get_directives(location=location, rule=rule)
+
+        for directive in directives:
+            directive.used = True
+
+        return bool(directives)
+
+
 def extract_statement_lint_ignores(
     *,
     statement: Statement,
     source_code: str,
+    line_index: LineIndex | None = None,
+    tokens: list[parser.Token] | None = None,
 ) -> list[NoQaDirective]:
     """Extract lint ignores from SQL statement.
 
@@ -163,6 +846,12 @@ def extract_statement_lint_ignores(
     source_code: str
         Source code to construct the line number and column offset of lint ignores from.
 
+    line_index: LineIndex | None
+        Line index of the source code. Built from the source code when not given.
+
+    tokens: list[parser.Token] | None
+        Tokens of the statement. Scanned from the statement when not given.
+
     Returns:
     -------
     list[NoQaDirective]
@@ -170,12 +859,16 @@ def extract_statement_lint_ignores(
     """
     statement_lint_ignores: list[NoQaDirective] = []
 
-    for token in parser.scan(statement.text):
+    if line_index is None:
+        line_index = LineIndex(source_code)
+
+    if tokens is None:
+        tokens = parser.scan(statement.text)
+
+    for token in tokens:
         if token.name == SQL_COMMENT:
             actual_start_location = statement.start_location + token.start
 
-            line_number = source_code[:actual_start_location].count(NEW_LINE) + 1
-
             # Here, we extract last comment because we can have a comment followed
             # by another comment e.g -- new table -- noqa: US005
             comment = (
@@ -194,13 +887,10 @@ def extract_statement_lint_ignores(
                 statement_lint_ignores.extend(
                     NoQaDirective(
                         location=statement.start_location,
-                        line_number=line_number,
-                        # Calculate column offset as the position within the line where
+                        line_number=line_index.line_number(actual_start_location),
+                        # Column offset is the position within the line where
                         # our directive starts
-                        column_offset=(
-                            actual_start_location
-                            - source_code.rfind(NEW_LINE, 0, actual_start_location)
-                        ),
+                        column_offset=line_index.column_offset(actual_start_location),
                         rule=rule,
                     )
                     for rule in rules
@@ -213,6 +903,7 @@ def extract_file_lint_ignores(
     *,
     source_file: str,
     source_code: str,
+    tokens: list[parser.Token] | None = None,
 ) -> list[NoQaDirective]:
     """Extract lint ignores from the start of a source file.
 
@@ -224,6 +915,9 @@ def extract_file_lint_ignores(
     source_code: str
         Source code to extract lint ignores from.
 
+    tokens: list[parser.Token] | None
+        Tokens of the source code. Scanned from the source code when not given.
+
     Returns:
     -------
     list[NoQaDirective]
@@ -231,7 +925,10 @@ def extract_file_lint_ignores(
     """
     file_ignores: list[NoQaDirective] = []
 
-    for token in parser.scan(source_code):
+    if tokens is None:
+        tokens = parser.scan(source_code)
+
+    for token in tokens:
         if token.start == 0 and token.name == SQL_COMMENT:
             # In order to include the last character, we need to increase the end
             # location by one
@@ -269,6 +966,7 @@ def extract_file_lint_ignores(
 def check_file_format_skip(
     *,
     source_code: str,
+    tokens: list[parser.Token] | None = None,
 ) -> bool:
     """Check if formatting should be skipped for source code.
 
@@ -277,12 +975,18 @@ def check_file_format_skip(
     source_code: str
         Source code to check file format skip for.
 
+    tokens: list[parser.Token] | None
+        Tokens of the source code. Scanned from the source code when not given.
+
     Returns:
     -------
     bool
         True if format skip is found, False otherwise.
     """
-    for token in parser.scan(source_code):
+    if tokens is None:
+        tokens = parser.scan(source_code)
+
+    for token in tokens:
         if token.start == 0 and token.name == SQL_COMMENT:
             # In order to include the last character, we need to increase the end
             # location by one
@@ -308,6 +1012,7 @@ def check_file_format_skip(
 def _check_statement_format_skip(
     *,
     statement: Statement,
+    tokens: list[parser.Token] | None = None,
 ) -> bool:
     """Check if formatting should be skipped for SQL statement.
 
@@ -316,12 +1021,18 @@ def _check_statement_format_skip(
     statement: Statement
         Statement to check if formatting should be skipped.
 
+    tokens: list[parser.Token] | None
+        Tokens of the statement. Scanned from the statement when not given.
+
     Returns:
     -------
     bool
         True if format skip is found, False otherwise.
     """
-    for token in parser.scan(statement.text):
+    if tokens is None:
+        tokens = parser.scan(statement.text)
+
+    for token in tokens:
         if token.name == SQL_COMMENT:
             # In order to include the last character, we need to increase the end
             # location by one
@@ -375,7 +1086,11 @@ class Comment(typing.NamedTuple):
     continue_previous: bool
 
 
-def extract_comments(*, statement: Statement) -> list[Comment]:
+def extract_comments(
+    *,
+    statement: Statement,
+    tokens: list[parser.Token] | None = None,
+) -> list[Comment]:
     """Extract comments from SQL statement.
 
     Parameters:
@@ -383,6 +1098,9 @@ def extract_comments(*, statement: Statement) -> list[Comment]:
     statement: Statement
         Statement to extract comments from.
 
+    tokens: list[parser.Token] | None
+        Tokens of the statement. Scanned from the statement when not given.
+
     Returns:
     -------
     list[Comment]
@@ -393,7 +1111,10 @@ def extract_comments(*, statement: Statement) -> list[Comment]:
     # respective statement
     continue_previous = True
 
-    for token in parser.scan(statement.text):
+    if tokens is None:
+        tokens = parser.scan(statement.text)
+
+    for token in tokens:
         if token.name in (C_COMMENT, SQL_COMMENT):
             comment = statement.text[token.start : (token.end + 1)]
             comments.append(
@@ -407,6 +1128,155 @@ def extract_comments(*, statement: Statement) -> list[Comment]:
     return comments
 
 
+class SourceDocument:
+    """A source code tokenized once, lazily exposing its statements, comments, noqa
+    directives and format skip directives.
+
+    The source code may be a chunk of a larger source code, starting at `start_location`
+    on line `start_line_number`, in which case statements are located within the larger
+    source code.
+    """
+
+    def __init__(
+        self,
+        *,
+        source_file: str,
+        source_code: str,
+        start_location: int = 0,
+        start_line_number: int = 1,
+    ) -> None:
+        """Initialize variables."""
+        self.source_file = source_file
+        self.source_code = source_code
+        self.start_location = start_location
+        self.start_line_number = start_line_number
+
+    @functools.cached_property
+    def line_index(self) -> LineIndex:
+        """Line index of the source code."""
+        return LineIndex(
+            self.source_code,
+            start_location=self.start_location,
+            start_line_number=self.start_line_number,
+        )
+
+    @functools.cached_property
+    def copy_data_blocks(self) -> list[tuple[int, int]]:
+        """Locations of the data rows of `COPY ... FROM stdin` statements."""
+        return find_copy_data_blocks(self.source_code)
+
+    @functools.cached_property
+    def tokens(self) -> list[parser.Token]:
+        """Tokens of the source code, COPY data rows are not tokenized."""
+        if not self.copy_data_blocks:
+            return parser.scan(self.source_code)
+
+        tokens: list[parser.Token] = []
+
+        segment_start = 0
+
+        for data_start, data_end in [
+            *self.copy_data_blocks,
+            (len(self.source_code) + 1, len(self.source_code)),
+        ]:
+            tokens.extend(
+                token._replace(
+                    start=token.start + segment_start,
+                    end=token.end + segment_start,
+                )
+                for token in parser.scan(self.source_code[segment_start : data_start - 1])
+            )
+
+            segment_start = data_end + 1
+
+        return tokens
+
+    @functools.cached_property
+    def statements(self) -> list[Statement]:
+        """Statements of the source code."""
+        statements = extract_statements(source_code=self.source_code, tokens=self.tokens)
+
+        if not self.start_location:
+            return statements
+
+        return [
+            statement._replace(
+                start_location=statement.start_location + self.start_location,
+                end_location=statement.end_location + self.start_location,
+            )
+            for statement in statements
+        ]
+
+    @functools.cached_property
+    def _comment_tokens(self) -> list[parser.Token]:
+        """Comment tokens of the source code."""
+        return [token for token in self.tokens if token.name in (C_COMMENT, SQL_COMMENT)]
+
+    @functools.cached_property
+    def _comment_token_starts(self) -> list[int]:
+        """Start locations of the comment tokens of the source code."""
+        return [token.start for token in self._comment_tokens]
+
+    @functools.cached_property
+    def file_lint_ignores(self) -> list[NoQaDirective]:
+        """File-level noqa directives."""
+        # File-level directives are only found at the start of the source code
+        if self.start_location:
+            return []
+
+        return extract_file_lint_ignores(
+            source_file=self.source_file,
+            source_code=self.source_code,
+            tokens=self.tokens,
+        )
+
+    @functools.cached_property
+    def is_file_format_skip(self) -> bool:
+        """Whether formatting should be skipped for the source code."""
+        return check_file_format_skip(source_code=self.source_code, tokens=self.tokens)
+
+    def statement_comment_tokens(self, statement: Statement) -> list[parser.Token]:
+        """Get the comment tokens of a statement, located relative to the statement."""
+        statement_start = statement.start_location - self.start_location
+
+        start = bisect.bisect_left(self._comment_token_starts, statement_start)
+        end = bisect.bisect_left(
+            self._comment_token_starts,
+            statement.end_location - self.start_location,
+        )
+
+        return [
+            token._replace(
+                start=token.start - statement_start,
+                end=token.end - statement_start,
+            )
+            for token in self._comment_tokens[start:end]
+        ]
+
+    def statement_lint_ignores(self, statement: Statement) -> list[NoQaDirective]:
+        """Get the noqa directives of a statement."""
+        return extract_statement_lint_ignores(
+            statement=statement,
+            source_code=self.source_code,
+            line_index=self.line_index,
+            tokens=self.statement_comment_tokens(statement),
+        )
+
+    def statement_comments(self, statement: Statement) -> list[Comment]:
+        """Get the comments of a statement."""
+        return extract_comments(
+            statement=statement,
+            tokens=self.statement_comment_tokens(statement),
+        )
+
+    def is_statement_format_skip(self, statement: Statement) -> bool:
+        """Check if formatting should be skipped for a statement."""
+        return self.is_file_format_skip or _check_statement_format_skip(
+            statement=statement,
+            tokens=self.statement_comment_tokens(statement),
+        )
+
+
 def report_unused_lint_ignores(
     *,
     source_file: str,
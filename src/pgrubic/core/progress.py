@@ -0,0 +1,69 @@
+"""Progress of processed sources."""
+
+import sys
+import time
+
+# Bytes in a megabyte
+MEGABYTE = 1_000_000
+
+# Erase the current line of the terminal
+ERASE_LINE = "\r\x1b[K"
+
+
+class Progress:
+    """Report the number of processed sources and the throughput on a single line."""
+
+    def __init__(self, *, total_sources: int, enabled: bool) -> None:
+        """Initialize variables."""
+        self.total_sources = total_sources
+        self.enabled = enabled
+        self.processed_sources = 0
+        self.processed_bytes = 0
+        self.start_time = time.perf_counter()
+
+    def advance(self, *, size: int) -> None:
+        """Record a processed source and report the progress. Only called when the
+        progress is enabled, so that sources are not measured otherwise.
+
+        Parameters:
+        ----------
+        size: int
+            Size of the processed source, in bytes.
+
+        Returns:
+        -------
+        None
+        """
+        self.processed_sources += 1
+        self.processed_bytes += size
+
+        elapsed = max(time.perf_counter() - self.start_time, sys.float_info.epsilon)
+
+        sys.stderr.write(
+            f"{ERASE_LINE}{self.processed_sources}/{self.total_sources} file(s)"
+            f" | {self.processed_sources / elapsed:.1f} files/s"
+            f" | {self.processed_bytes / MEGABYTE / elapsed:.2f} MB/s",
+        )
+        sys.stderr.flush()
+
+    def finish(self) -> None:
+        """End the progress line.
+
+        Returns:
+        -------
+        None
+        """
+        if self.enabled and self.processed_sources:
+            sys.stderr.write("\n")
+            sys.stderr.flush()
+
+    def clear(self) -> None:
+        """Erase the progress line, so that other output starts on a clean line.
+
+        Returns:
+        -------
+        None
+        """
+        if self.enabled and self.processed_sources:
+            sys.stderr.write(ERASE_LINE)
+            sys.stderr.flush()
@@ -0,0 +1,254 @@
+"""Rule selection, compiled once per config."""
+
+from __future__ import annotations
+
+import os
+import re
+import typing
+import fnmatch
+import pathlib
+import functools
+
+if typing.TYPE_CHECKING:
+    from collections import abc  # pragma: no cover
+
+    from pgrubic.core import config  # pragma: no cover
+
+
+class RuleState(typing.NamedTuple):
+    """Whether a rule is enabled, and whether its fix is enabled."""
+
+    enabled: bool
+    fix_enabled: bool
+
+
+def _matches(code: str, patterns: abc.Iterable[str]) -> bool:
+    """Check if a rule code matches any of the rule aliases or prefixes."""
+    return any(fnmatch.fnmatch(code, pattern + "*") for pattern in patterns)
+
+
+def _is_selected(
+    code: str,
+    *,
+    select: abc.Collection[str],
+    ignore: abc.Iterable[str],
+) -> bool:
+    """Check if a rule code is selected, **ignore** takes precedence over **select**."""
+    return (not select or _matches(code, select)) and not _matches(code, ignore)
+
+
+def _compile_globs(globs: abc.Iterable[str]) -> list[re.Pattern[str]]:
+    """Compile file patterns."""
+    return [re.compile(fnmatch.translate(os.path.normcase(glob))) for glob in globs]
+
+
+class RuleSelection:
+    """Rule selection compiled from the config. Rule codes are matched against the
+    rule aliases and prefixes once, and the per file patterns are compiled into one
+    matcher, so that selecting the rules of a source file is a lookup.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        select: tuple[str, ...],
+        ignore: tuple[str, ...],
+        fixable: tuple[str, ...],
+        unfixable: tuple[str, ...],
+        per_file_select: tuple[tuple[str, tuple[str, ...]], ...],
+        per_file_ignores: tuple[tuple[str, tuple[str, ...]], ...],
+        codes: frozenset[str],
+    ) -> None:
+        """Compile the rule selection of rule codes."""
+        self.select = select
+        self.ignore = ignore
+
+        self.rules: dict[str, RuleState] = {
+            code: RuleState(
+                enabled=_is_selected(code, select=select, ignore=ignore),
+                fix_enabled=_is_selected(code, select=fixable, ignore=unfixable),
+            )
+            for code in sorted(codes)
+        }
+
+        self.enabled: frozenset[str] = frozenset(
+            code for code, rule_state in self.rules.items() if rule_state.enabled
+        )
+
+        self.fix_enabled: frozenset[str] = frozenset(
+            code for code, rule_state in self.rules.items() if rule_state.fix_enabled
+        )
+
+        self.per_file_select = per_file_select
+        self.per_file_ignores = per_file_ignores
+
+        self.per_file_select_globs = _compile_globs(
+            glob for glob, _ in self.per_file_select
+        )
+        self.per_file_ignores_globs = _compile_globs(
+            glob for glob, _ in self.per_file_ignores
+        )
+
+        # Most source files match none of the per file patterns, a single match
+        # against all of them tells so
+        self.per_file_matcher: re.Pattern[str] | None = (
+            re.compile(
+                "|".join(
+                    pattern.pattern
+                    for pattern in (
+                        *self.per_file_select_globs,
+                        *self.per_file_ignores_globs,
+                    )
+                ),
+            )
+            if self.per_file_select or self.per_file_ignores
+            else None
+        )
+
+        # Enabled rules by the indexes of the matched per file patterns
+        self.file_rules_by_matches: dict[
+            tuple[tuple[int, ...], tuple[int, ...]],
+            frozenset[str],
+        ] = {((), ()): self.enabled}
+
+    @property
+    def has_per_file_rules(self) -> bool:
+        """Whether rules are selected per file."""
+        return self.per_file_matcher is not None
+
+    @functools.cached_property
+    def loaded(self) -> frozenset[str]:
+        """Rules enabled for at least one source file."""
+        return self.enabled | frozenset(
+            code
+            for code in self.rules
+            for _, select in self.per_file_select
+            if _is_selected(code, select=select, ignore=self.ignore)
+        )
+
+    def file_rules(self, source_file: str) -> frozenset[str]:
+        """Get the rules enabled for a source file.
+
+        Parameters:
+        ----------
+        source_file: str
+            Path to the source file.
+
+        Returns:
+        -------
+        frozenset[str]
+            Codes of the enabled rules.
+        """
+        if self.per_file_matcher is None:
+            return self.enabled
+
+        paths = [os.path.normcase(source_file)]
+
+        # Per file patterns may be relative to the current working directory
+        path = pathlib.Path(source_file)
+
+        if path.is_absolute() and path.is_relative_to(pathlib.Path.cwd()):
+            paths.append(os.path.normcase(path.relative_to(pathlib.Path.cwd())))
+
+        if not any(self.per_file_matcher.match(path) for path in paths):
+            return self.enabled
+
+        matches = (
+            tuple(
+                index
+                for index, pattern in enumerate(self.per_file_select_globs)
+                if any(pattern.match(path) for path in paths)
+            ),
+            tuple(
+                index
+                for index, pattern in enumerate(self.per_file_ignores_globs)
+                if any(pattern.match(path) for path in paths)
+            ),
+        )
+
+        if matches not in self.file_rules_by_matches:
+            select_indexes, ignore_indexes = matches
+
+            select = (
+                [
+                    pattern
+                    for index in select_indexes
+                    for pattern in self.per_file_select[index][1]
+                ]
+                if select_indexes
+                else self.select
+            )
+            ignore = [
+                *self.ignore,
+                *(
+                    pattern
+                    for index in ignore_indexes
+                    for pattern in self.per_file_ignores[index][1]
+                ),
+            ]
+
+            self.file_rules_by_matches[matches] = frozenset(
+                code
+                for code in self.rules
+                if _is_selected(code, select=select, ignore=ignore)
+            )
+
+        return self.file_rules_by_matches[matches]
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_rule_selection(  # noqa: PLR0913
+    *,
+    select: tuple[str, ...],
+    ignore: tuple[str, ...],
+    fixable: tuple[str, ...],
+    unfixable: tuple[str, ...],
+    per_file_select: tuple[tuple[str, tuple[str, ...]], ...],
+    per_file_ignores: tuple[tuple[str, tuple[str, ...]], ...],
+    codes: frozenset[str],
+) -> RuleSelection:
+    """Compile a rule selection, once per distinct settings."""
+    return RuleSelection(
+        select=select,
+        ignore=ignore,
+        fixable=fixable,
+        unfixable=unfixable,
+        per_file_select=per_file_select,
+        per_file_ignores=per_file_ignores,
+        codes=codes,
+    )
+
+
+def compile_rule_selection(
+    lint: config.Lint,
+    *,
+    codes: abc.Iterable[str],
+) -> RuleSelection:
+    """Compile the rule selection of the lint config for rule codes. Selections are
+    compiled once per distinct settings, even as the config is updated.
+
+    Parameters:
+    ----------
+    lint: config.Lint
+        Lint config.
+    codes: abc.Iterable[str]
+        Rule codes.
+
+    Returns:
+    -------
+    RuleSelection
+        Rule selection.
+    """
+    return _compile_rule_selection(
+        select=tuple(lint.select),
+        ignore=tuple(lint.ignore),
+        fixable=tuple(lint.fixable),
+        unfixable=tuple(lint.unfixable),
+        per_file_select=tuple(
+            (glob, tuple(patterns)) for glob, patterns in lint.per_file_select.items()
+        ),
+        per_file_ignores=tuple(
+            (glob, tuple(patterns)) for glob, patterns in lint.per_file_ignores.items()
+        ),
+        codes=frozenset(codes),
+    )
@@ -10,6 +10,13 @@ from pgrubic.core import formatter
 RawStreamFactory = typing.Callable[[], formatter.RawStream]
 
 
+class InlineSQLStatement(typing.NamedTuple):
+    """Representation of an inline SQL statement."""
+
+    text: str
+    parse_tree: tuple[ast.RawStmt, ...]
+
+
 class InlineSQLVisitor(visitors.Visitor):
     """Visitor for extracting inline SQL statements from PLpgSQL and function calls."""
 
@@ -120,11 +127,18 @@ def extract_nested_inline_sql_statements(
     *,
     node: tuple[ast.RawStmt, ...],
     raw_stream_factory: RawStreamFactory,
-) -> list[str]:
+    parse_trees: dict[str, tuple[ast.RawStmt, ...]] | None = None,
+) -> list[InlineSQLStatement]:
     """Extract nested inline SQL statements from PLpgSQL and function calls
     using iterative breadth-first walk.
+
+    Identical statements are only reported once, and are parsed once across calls
+    sharing the same `parse_trees`.
     """
-    statements: list[str] = []
+    if parse_trees is None:
+        parse_trees = {}
+
+    statements: dict[str, InlineSQLStatement] = {}
 
     queue = deque([node])
 
@@ -135,8 +149,16 @@ def extract_nested_inline_sql_statements(
             node=current_tree,
             raw_stream_factory=raw_stream_factory,
         ):
-            statements.append(statement)
-            child_tree = parser.parse_sql(statement)
-            queue.append(child_tree)
+            if statement in statements:
+                continue
+
+            if statement not in parse_trees:
+                parse_trees[statement] = parser.parse_sql(statement)
+
+            statements[statement] = InlineSQLStatement(
+                text=statement,
+                parse_tree=parse_trees[statement],
+            )
+            queue.append(parse_trees[statement])
 
-    return statements
+    return list(statements.values())
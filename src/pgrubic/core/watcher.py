@@ -0,0 +1,394 @@
+"""Watching of sources for changes, with inotify on Linux and polling otherwise."""
+
+import os
+import sys
+import time
+import errno
+import ctypes
+import select
+import struct
+import typing
+import fnmatch
+import pathlib
+import contextlib
+import ctypes.util
+from collections import abc
+
+from pgrubic.core import filters
+
+# Seconds between two scans of the sources when polling
+POLL_INTERVAL: typing.Final[float] = 0.5
+
+# Seconds without changes after which changes are reported, so that the many events
+# of a single save are reported at once
+DEBOUNCE_INTERVAL: typing.Final[float] = 0.05
+
+# inotify events, see inotify(7)
+IN_CLOSE_WRITE: typing.Final[int] = 0x00000008
+IN_MOVED_TO: typing.Final[int] = 0x00000080
+IN_CREATE: typing.Final[int] = 0x00000100
+IN_Q_OVERFLOW: typing.Final[int] = 0x00004000
+IN_IGNORED: typing.Final[int] = 0x00008000
+IN_ISDIR: typing.Final[int] = 0x40000000
+
+INOTIFY_WATCH_MASK: typing.Final[int] = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+INOTIFY_EVENT: typing.Final[struct.Struct] = struct.Struct("iIII")
+
+INOTIFY_READ_SIZE: typing.Final[int] = 64 * 1024
+
+
+def _source_files(
+    sources: tuple[pathlib.Path, ...],
+    *,
+    extension: str,
+) -> abc.Iterator[pathlib.Path]:
+    """Yield the files of sources with an extension.
+
+    Parameters:
+    ----------
+    sources: tuple[pathlib.Path, ...]
+        Files and directories.
+    extension: str
+        File extension.
+
+    Returns:
+    -------
+    abc.Iterator[pathlib.Path]
+        Files with the extension.
+    """
+    for source in sources:
+        if source.is_dir():
+            yield from source.glob(f"**/*.{extension}")
+
+        elif source.suffix == f".{extension}":
+            yield source
+
+
+class PollingWatcher:
+    """Watcher scanning the sources for changed modified times and sizes."""
+
+    def __init__(
+        self,
+        sources: tuple[pathlib.Path, ...],
+        *,
+        extension: str = "sql",
+        interval: float = POLL_INTERVAL,
+    ) -> None:
+        """Take a first snapshot of the sources."""
+        self.sources = sources
+        self.extension = extension
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> dict[pathlib.Path, tuple[int, int]]:
+        """Return the modified time and size of each file of the sources."""
+        snapshot: dict[pathlib.Path, tuple[int, int]] = {}
+
+        for path in _source_files(self.sources, extension=self.extension):
+            # Files may be removed while scanning
+            with contextlib.suppress(OSError):
+                file_stat = path.stat()
+                snapshot[path] = (file_stat.st_mtime_ns, file_stat.st_size)
+
+        return snapshot
+
+    def wait(self) -> set[pathlib.Path]:
+        """Wait for files of the sources to change.
+
+        Returns:
+        -------
+        set[pathlib.Path]
+            Changed and added files.
+        """
+        while True:
+            time.sleep(self.interval)
+
+            snapshot = self._snapshot()
+
+            changed_files = {
+                path
+                for path, file_stat in snapshot.items()
+                if self.snapshot.get(path) != file_stat
+            }
+
+            self.snapshot = snapshot
+
+            if changed_files:
+                return changed_files
+
+    def close(self) -> None:
+        """Stop watching.
+
+        Returns:
+        -------
+        None
+        """
+
+
+class InotifyWatcher:
+    """Watcher receiving the changes of the directories of the sources from inotify,
+    directories created while watching are watched as well. Hidden and excluded
+    directories, such as `.git` or `.venv`, are not watched.
+    """
+
+    def __init__(
+        self,
+        sources: tuple[pathlib.Path, ...],
+        *,
+        extension: str = "sql",
+        exclude: list[str] | None = None,
+    ) -> None:
+        """Watch the directories of the sources."""
+        self.sources = sources
+        self.extension = extension
+        self.exclude = exclude or []
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        self.fd: int = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        if self.fd < 0:
+            error_number = ctypes.get_errno()
+            raise OSError(error_number, os.strerror(error_number))
+
+        self.directories: dict[int, pathlib.Path] = {}
+
+        for source in self.sources:
+            if source.is_dir():
+                self._watch_tree(source)
+            else:
+                self._watch(source.parent)
+
+    def _watch(self, directory: pathlib.Path) -> None:
+        """Watch a directory, raising OSError when it cannot be watched, such as when
+        the watch limit is reached.
+        """
+        watch_descriptor = self.libc.inotify_add_watch(
+            self.fd,
+            os.fsencode(directory),
+            INOTIFY_WATCH_MASK,
+        )
+
+        if watch_descriptor < 0:
+            error_number = ctypes.get_errno()
+
+            # Directories may be removed before being watched
+            if error_number in (errno.ENOENT, errno.ENOTDIR):
+                return
+
+            raise OSError(error_number, os.strerror(error_number))
+
+        self.directories[watch_descriptor] = directory
+
+    def _is_skipped(self, directory: pathlib.Path) -> bool:
+        """Check if a directory is hidden or excluded."""
+        return directory.name.startswith(".") or any(
+            fnmatch.fnmatch(f"{directory}{os.sep}", pattern) for pattern in self.exclude
+        )
+
+    def _watch_tree(self, directory: pathlib.Path) -> set[pathlib.Path]:
+        """Watch a directory and its subdirectories.
+
+        Parameters:
+        ----------
+        directory: pathlib.Path
+            Directory.
+
+        Returns:
+        -------
+        set[pathlib.Path]
+            Files already in the directory and its subdirectories.
+        """
+        files: set[pathlib.Path] = set()
+
+        for root, directory_names, file_names in os.walk(directory):
+            directory_names[:] = [
+                directory_name
+                for directory_name in directory_names
+                if not self._is_skipped(pathlib.Path(root) / directory_name)
+            ]
+
+            self._watch(pathlib.Path(root))
+            files.update(pathlib.Path(root) / file_name for file_name in file_names)
+
+        return files
+
+    def _is_watched(self, path: pathlib.Path) -> bool:
+        """Check if a file is one of the sources or in one of the directories of the
+        sources, with the extension.
+        """
+        return path.suffix == f".{self.extension}" and any(
+            path == source or path.is_relative_to(source) for source in self.sources
+        )
+
+    def _read_events(self) -> tuple[set[pathlib.Path], bool]:
+        """Read the pending events.
+
+        Returns:
+        -------
+        tuple[set[pathlib.Path], bool]
+            Changed files, and whether events were lost.
+        """
+        changed_files: set[pathlib.Path] = set()
+
+        try:
+            buffer = os.read(self.fd, INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return changed_files, False
+
+        offset = 0
+
+        while offset < len(buffer):
+            watch_descriptor, mask, _, name_length = INOTIFY_EVENT.unpack_from(
+                buffer,
+                offset,
+            )
+            offset += INOTIFY_EVENT.size
+
+            name = buffer[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                return changed_files, True
+
+            if mask & IN_IGNORED:
+                self.directories.pop(watch_descriptor, None)
+                continue
+
+            directory = self.directories.get(watch_descriptor)
+
+            if directory is None:
+                continue
+
+            path = directory / os.fsdecode(name)
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not self._is_skipped(path):
+                    changed_files.update(self._watch_tree(path))
+                continue
+
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changed_files.add(path)
+
+        return changed_files, False
+
+    def wait(self) -> set[pathlib.Path]:
+        """Wait for files of the sources to change.
+
+        Returns:
+        -------
+        set[pathlib.Path]
+            Changed and added files.
+        """
+        changed_files: set[pathlib.Path] = set()
+
+        while True:
+            select.select([self.fd], [], [])
+
+            # Events are read until none follow within the debounce interval
+            while select.select([self.fd], [], [], DEBOUNCE_INTERVAL)[0]:
+                events, lost = self._read_events()
+
+                if lost:
+                    # Every file of the sources is reported when events were lost
+                    events = set(_source_files(self.sources, extension=self.extension))
+
+                changed_files.update(events)
+
+            changed_files = {path for path in changed_files if self._is_watched(path)}
+
+            if changed_files:
+                return changed_files
+
+    def close(self) -> None:
+        """Stop watching.
+
+        Returns:
+        -------
+        None
+        """
+        os.close(self.fd)
+
+
+def create_watcher(
+    sources: tuple[pathlib.Path, ...],
+    *,
+    extension: str = "sql",
+    exclude: list[str] | None = None,
+) -> InotifyWatcher | PollingWatcher:
+    """Create a watcher of sources, using inotify on Linux when available and polling
+    otherwise.
+
+    Parameters:
+    ----------
+    sources: tuple[pathlib.Path, ...]
+        Files and directories to watch.
+    extension: str
+        File extension of the watched files.
+    exclude: list[str] | None
+        List of file patterns to exclude, directories matching them are not watched.
+
+    Returns:
+    -------
+    InotifyWatcher | PollingWatcher
+        Watcher.
+    """
+    if sys.platform == "linux":
+        # inotify may be unavailable, such as when the watch limit is reached
+        with contextlib.suppress(OSError, AttributeError):
+            return InotifyWatcher(sources, extension=extension, exclude=exclude)
+
+    return PollingWatcher(sources, extension=extension)
+
+
+def watch_sources(
+    *,
+    sources: tuple[pathlib.Path, ...],
+    include: list[str],
+    exclude: list[str],
+    respect_gitignore: bool,
+) -> abc.Generator[set[pathlib.Path]]:
+    """Yield the included sources changed since the previous ones were yielded, until
+    interrupted.
+
+    Parameters:
+    ----------
+    sources: tuple[pathlib.Path, ...]
+        Files and directories to watch.
+    include: list[str]
+        List of file patterns to include.
+    exclude: list[str]
+        List of file patterns to exclude.
+    respect_gitignore: bool
+        Whether to respect gitignore.
+
+    Returns:
+    -------
+    abc.Generator[set[pathlib.Path]]
+        Changed sources.
+    """
+    watcher = create_watcher(sources, exclude=exclude)
+
+    try:
+        while True:
+            try:
+                changed_files = watcher.wait()
+            # inotify may reach the watch limit as directories are created
+            except OSError:
+                watcher.close()
+                watcher = PollingWatcher(sources)
+                continue
+
+            # Only the changed files are filtered, the sources are not walked again
+            changed_sources = filters.filter_sources(
+                sources=tuple(path for path in changed_files if path.is_file()),
+                include=include,
+                exclude=exclude,
+                respect_gitignore=respect_gitignore,
+            )
+
+            if changed_sources:
+                yield changed_sources
+    finally:
+        watcher.close()
@@ -0,0 +1,225 @@
+"""Worker processes, each holding a linter or formatter built once per process."""
+
+from __future__ import annotations
+
+import io
+import os
+import signal
+import typing
+import pathlib
+import multiprocessing
+
+from pgrubic.core import noqa, cache, config, linter, loader, formatter
+
+
+class _Worker:
+    """State of the current worker process, set by the pool initializers."""
+
+    linter: typing.ClassVar[linter.Linter]
+    formatter: typing.ClassVar[formatter.Formatter]
+    format_cache: typing.ClassVar[cache.Cache]
+
+    # Whether sources are linted incrementally, as they are read
+    stream: typing.ClassVar[bool] = False
+
+    lint_cache: typing.ClassVar[cache.LintCache]
+
+    # Whether lint results are read from the cache
+    read_lint_cache: typing.ClassVar[bool] = True
+
+
+def _ignore_interrupts() -> None:
+    """Ignore interrupts in worker processes, the main process handles them and
+    terminates the pool.
+    """
+    if multiprocessing.parent_process() is not None:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def initialize_linter(
+    config: config.Config,
+    *,
+    profile_rules: bool = False,
+    stream: bool = False,
+) -> None:
+    """Build the linter of the current worker process.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+    profile_rules: bool
+        Whether to profile the rules.
+    stream: bool
+        Whether to lint sources incrementally, as they are read.
+
+    Returns:
+    -------
+    None
+    """
+    _ignore_interrupts()
+
+    _Worker.linter = linter.Linter(
+        config=config,
+        formatters=loader.load_formatters,
+        profile_rules=profile_rules,
+        statement_cache=cache.StatementCache(
+            config=config,
+            name="linter",
+            config_digest=cache.lint_config_digest(config),
+            read=not config.lint.no_cache,
+        ),
+    )
+    _Worker.stream = stream
+
+    _Worker.lint_cache = cache.LintCache(config=config)
+    # Rules must run to be profiled
+    _Worker.read_lint_cache = not config.lint.no_cache and not profile_rules
+
+    for rule in loader.load_rules(config=config):
+        _Worker.linter.checkers.add(rule(config=config))
+
+
+def initialize_formatter(config: config.Config) -> None:
+    """Build the formatter of the current worker process.
+
+    Parameters:
+    ----------
+    config: config.Config
+        Config.
+
+    Returns:
+    -------
+    None
+    """
+    _ignore_interrupts()
+
+    _Worker.formatter = formatter.Formatter(
+        config=config,
+        formatters=loader.load_formatters,
+        statement_cache=cache.StatementCache(
+            config=config,
+            name="formatter",
+            config_digest=cache.format_config_digest(config),
+            read=not config.format.no_cache,
+        ),
+    )
+    _Worker.format_cache = cache.Cache(config=config)
+
+
+def _read_lint_cache(*, key: str, source_file: str) -> linter.LintResult | None:
+    """Read the cached lint result of a source file, if any, reporting its unused noqa
+    directives as linting would.
+    """
+    if not _Worker.read_lint_cache:
+        return None
+
+    lint_result = _Worker.lint_cache.read(key=key, source_file=source_file)
+
+    if lint_result is not None:
+        noqa.report_unused_lint_ignores(
+            source_file=source_file,
+            lint_ignores=list(lint_result.unused_lint_ignores),
+        )
+
+    return lint_result
+
+
+def lint_source(source_file: str) -> linter.LintResult:
+    """Read and lint a source file with the linter of the current worker process,
+    unless its lint result is cached.
+
+    The source file is read once, the lint result is cached under the hash of the
+    content it was linted from. When streaming, the source file is hashed by blocks to
+    look up the cache, then hashed again as it is linted.
+
+    Parameters:
+    ----------
+    source_file: str
+        Path to the source file.
+
+    Returns:
+    -------
+    linter.LintResult
+        Lint result.
+    """
+    source = pathlib.Path(source_file)
+
+    if _Worker.stream:
+        lint_result = _read_lint_cache(
+            key=_Worker.lint_cache.key(source),
+            source_file=source_file,
+        )
+
+        if lint_result is not None:
+            return lint_result
+
+        hasher = _Worker.lint_cache.hasher(source)
+
+        with (
+            source.open("rb") as file,
+            io.TextIOWrapper(
+                io.BufferedReader(cache.HashingReader(file, hasher=hasher)),
+                encoding="utf-8",
+            ) as stream,
+        ):
+            lint_result = _Worker.linter.run_stream(
+                source_file=source_file,
+                stream=stream,
+            )
+
+        key = hasher.hexdigest()
+    else:
+        content = source.read_bytes()
+        key = _Worker.lint_cache.key(source, content=content)
+
+        lint_result = _read_lint_cache(key=key, source_file=source_file)
+
+        if lint_result is not None:
+            return lint_result
+
+        lint_result = _Worker.linter.run(
+            source_file=source_file,
+            # Same newline translation as reading in text mode
+            source_code=content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n"),
+        )
+
+    _Worker.lint_cache.write(key=key, lint_result=lint_result)
+
+    return lint_result
+
+
+def format_source(source_file: str) -> formatter.FormatResult:
+    """Read and format a source file with the formatter of the current worker process.
+
+    The format result carries the hash digest of the source file content once
+    formatted, so that the cache can be written without reading the file again.
+
+    Parameters:
+    ----------
+    source_file: str
+        Path to the source file.
+
+    Returns:
+    -------
+    formatter.FormatResult
+        Format result.
+    """
+    content = pathlib.Path(source_file).read_bytes()
+
+    # Same newline translation as reading in text mode
+    source_code = content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+    format_result = _Worker.formatter.format(
+        source_file=source_file,
+        source_code=source_code,
+    )
+
+    if format_result.formatted_source_code != source_code:
+        # Content as written in text mode
+        content = format_result.formatted_source_code.replace(
+            "\n",
+            os.linesep,
+        ).encode("utf-8")
+
+    return format_result._replace(digest=_Worker.format_cache.hash_digest(content))
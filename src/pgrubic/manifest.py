@@ -0,0 +1,769 @@
+"""Manifest of the built-in rules and formatters.
+
+Generated by `python tools/manifest_generator.py`, do not edit.
+"""
+
+import typing
+
+# Rule code to module, class name, category and whether the rule is deprecated
+RULES: typing.Final[dict[str, tuple[str, str, str, bool]]] = {
+    "CT001": (
+        "pgrubic.rules.constraint.CT001",
+        "CascadeUpdate",
+        "constraint",
+        False,
+    ),
+    "CT002": (
+        "pgrubic.rules.constraint.CT002",
+        "CascadeDelete",
+        "constraint",
+        False,
+    ),
+    "CT003": (
+        "pgrubic.rules.constraint.CT003",
+        "IdentityGeneratedByDefault",
+        "constraint",
+        False,
+    ),
+    "CT004": (
+        "pgrubic.rules.constraint.CT004",
+        "RemoveConstraint",
+        "constraint",
+        False,
+    ),
+    "CT005": (
+        "pgrubic.rules.constraint.CT005",
+        "DuplicatePrimaryKeyColumn",
+        "constraint",
+        False,
+    ),
+    "CT006": (
+        "pgrubic.rules.constraint.CT006",
+        "DuplicateUniqueKeyColumn",
+        "constraint",
+        False,
+    ),
+    "GN001": (
+        "pgrubic.rules.general.GN001",
+        "TableInheritance",
+        "general",
+        False,
+    ),
+    "GN002": (
+        "pgrubic.rules.general.GN002",
+        "CreateRule",
+        "general",
+        False,
+    ),
+    "GN003": (
+        "pgrubic.rules.general.GN003",
+        "SqlAsciiEncoding",
+        "general",
+        False,
+    ),
+    "GN004": (
+        "pgrubic.rules.general.GN004",
+        "MissingPrimaryKey",
+        "general",
+        False,
+    ),
+    "GN005": (
+        "pgrubic.rules.general.GN005",
+        "IndexElementsMoreThanThree",
+        "general",
+        False,
+    ),
+    "GN006": (
+        "pgrubic.rules.general.GN006",
+        "CreateEnum",
+        "general",
+        False,
+    ),
+    "GN007": (
+        "pgrubic.rules.general.GN007",
+        "MissingReplaceInFunction",
+        "general",
+        False,
+    ),
+    "GN008": (
+        "pgrubic.rules.general.GN008",
+        "MissingReplaceInProcedure",
+        "general",
+        False,
+    ),
+    "GN009": (
+        "pgrubic.rules.general.GN009",
+        "DuplicateColumn",
+        "general",
+        False,
+    ),
+    "GN010": (
+        "pgrubic.rules.general.GN010",
+        "TableColumnConflict",
+        "general",
+        False,
+    ),
+    "GN011": (
+        "pgrubic.rules.general.GN011",
+        "MissingRequiredColumn",
+        "general",
+        False,
+    ),
+    "GN012": (
+        "pgrubic.rules.general.GN012",
+        "RequiredColumnRemoval",
+        "general",
+        False,
+    ),
+    "GN013": (
+        "pgrubic.rules.general.GN013",
+        "NullableRequiredColumn",
+        "general",
+        False,
+    ),
+    "GN014": (
+        "pgrubic.rules.general.GN014",
+        "SelectInto",
+        "general",
+        False,
+    ),
+    "GN015": (
+        "pgrubic.rules.general.GN015",
+        "DropCascade",
+        "general",
+        False,
+    ),
+    "GN016": (
+        "pgrubic.rules.general.GN016",
+        "ConstantGeneratedColumn",
+        "general",
+        False,
+    ),
+    "GN017": (
+        "pgrubic.rules.general.GN017",
+        "IdColumn",
+        "general",
+        False,
+    ),
+    "GN018": (
+        "pgrubic.rules.general.GN018",
+        "MultiColumnPartitioning",
+        "general",
+        False,
+    ),
+    "GN019": (
+        "pgrubic.rules.general.GN019",
+        "UnloggedTable",
+        "general",
+        False,
+    ),
+    "GN020": (
+        "pgrubic.rules.general.GN020",
+        "CurrentTime",
+        "general",
+        False,
+    ),
+    "GN021": (
+        "pgrubic.rules.general.GN021",
+        "NullConstraint",
+        "general",
+        False,
+    ),
+    "GN022": (
+        "pgrubic.rules.general.GN022",
+        "UpdateWithoutWhereClause",
+        "general",
+        False,
+    ),
+    "GN023": (
+        "pgrubic.rules.general.GN023",
+        "DeleteWithoutWhereClause",
+        "general",
+        False,
+    ),
+    "GN024": (
+        "pgrubic.rules.general.GN024",
+        "NullComparison",
+        "general",
+        False,
+    ),
+    "GN025": (
+        "pgrubic.rules.general.GN025",
+        "DuplicateIndex",
+        "general",
+        False,
+    ),
+    "GN026": (
+        "pgrubic.rules.general.GN026",
+        "NotIn",
+        "general",
+        False,
+    ),
+    "GN027": (
+        "pgrubic.rules.general.GN027",
+        "YodaCondition",
+        "general",
+        False,
+    ),
+    "GN028": (
+        "pgrubic.rules.general.GN028",
+        "Asterisk",
+        "general",
+        False,
+    ),
+    "GN029": (
+        "pgrubic.rules.general.GN029",
+        "MissingReplaceInView",
+        "general",
+        False,
+    ),
+    "GN030": (
+        "pgrubic.rules.general.GN030",
+        "MissingReplaceInTrigger",
+        "general",
+        False,
+    ),
+    "GN031": (
+        "pgrubic.rules.general.GN031",
+        "StringifiedNull",
+        "general",
+        False,
+    ),
+    "GN032": (
+        "pgrubic.rules.general.GN032",
+        "DuplicateIndexColumn",
+        "general",
+        False,
+    ),
+    "GN033": (
+        "pgrubic.rules.general.GN033",
+        "InsertWithoutTargetColumns",
+        "general",
+        False,
+    ),
+    "GN034": (
+        "pgrubic.rules.general.GN034",
+        "TypedTable",
+        "general",
+        False,
+    ),
+    "GN035": (
+        "pgrubic.rules.general.GN035",
+        "InlineSqlFunctionBodyWrongLanguage",
+        "general",
+        False,
+    ),
+    "GN036": (
+        "pgrubic.rules.general.GN036",
+        "SelfAssigningColumn",
+        "general",
+        False,
+    ),
+    "NM001": (
+        "pgrubic.rules.naming.NM001",
+        "InvalidIndexName",
+        "naming",
+        False,
+    ),
+    "NM002": (
+        "pgrubic.rules.naming.NM002",
+        "InvalidPrimaryKeyName",
+        "naming",
+        False,
+    ),
+    "NM003": (
+        "pgrubic.rules.naming.NM003",
+        "InvalidUniqueKeyName",
+        "naming",
+        False,
+    ),
+    "NM004": (
+        "pgrubic.rules.naming.NM004",
+        "InvalidForeignKeyName",
+        "naming",
+        False,
+    ),
+    "NM005": (
+        "pgrubic.rules.naming.NM005",
+        "InvalidCheckConstraintName",
+        "naming",
+        False,
+    ),
+    "NM006": (
+        "pgrubic.rules.naming.NM006",
+        "InvalidExclusionConstraintName",
+        "naming",
+        False,
+    ),
+    "NM007": (
+        "pgrubic.rules.naming.NM007",
+        "InvalidSequenceName",
+        "naming",
+        False,
+    ),
+    "NM008": (
+        "pgrubic.rules.naming.NM008",
+        "ImplicitConstraintName",
+        "naming",
+        False,
+    ),
+    "NM009": (
+        "pgrubic.rules.naming.NM009",
+        "InvalidPartitionName",
+        "naming",
+        False,
+    ),
+    "NM010": (
+        "pgrubic.rules.naming.NM010",
+        "NonSnakeCaseIdentifier",
+        "naming",
+        False,
+    ),
+    "NM011": (
+        "pgrubic.rules.naming.NM011",
+        "KeywordIdentifier",
+        "naming",
+        False,
+    ),
+    "NM012": (
+        "pgrubic.rules.naming.NM012",
+        "SpecialCharacterInIdentifier",
+        "naming",
+        False,
+    ),
+    "NM013": (
+        "pgrubic.rules.naming.NM013",
+        "PgPrefixIdentifier",
+        "naming",
+        False,
+    ),
+    "NM014": (
+        "pgrubic.rules.naming.NM014",
+        "SingleLetterIdentifier",
+        "naming",
+        False,
+    ),
+    "NM015": (
+        "pgrubic.rules.naming.NM015",
+        "TimestampColumnWithoutSuffix",
+        "naming",
+        False,
+    ),
+    "NM016": (
+        "pgrubic.rules.naming.NM016",
+        "DateColumnWithoutSuffix",
+        "naming",
+        False,
+    ),
+    "QY001": (
+        "pgrubic.rules.query.QY001",
+        "OrdinalNumberGroupBy",
+        "query",
+        False,
+    ),
+    "QY002": (
+        "pgrubic.rules.query.QY002",
+        "OrdinalNumberOrderBy",
+        "query",
+        False,
+    ),
+    "SM001": (
+        "pgrubic.rules.schema.SM001",
+        "SchemaUnqualifiedObject",
+        "schema",
+        False,
+    ),
+    "SM002": (
+        "pgrubic.rules.schema.SM002",
+        "DisallowedSchema",
+        "schema",
+        False,
+    ),
+    "ST001": (
+        "pgrubic.rules.security.ST001",
+        "ExtensionWhitelist",
+        "security",
+        False,
+    ),
+    "ST002": (
+        "pgrubic.rules.security.ST002",
+        "ProceduralLanguageWhitelist",
+        "security",
+        False,
+    ),
+    "ST003": (
+        "pgrubic.rules.security.ST003",
+        "SecurityDefinerFunctionNoExplicitSearchPath",
+        "security",
+        False,
+    ),
+    "ST004": (
+        "pgrubic.rules.security.ST004",
+        "SecurityDefinerFunctionTempSchemaOrder",
+        "security",
+        False,
+    ),
+    "ST005": (
+        "pgrubic.rules.security.ST005",
+        "SecurityDefinerFunctionNonTempSchema",
+        "security",
+        False,
+    ),
+    "TP001": (
+        "pgrubic.rules.typing.TP001",
+        "TimestampWithoutTimezone",
+        "typing",
+        False,
+    ),
+    "TP002": (
+        "pgrubic.rules.typing.TP002",
+        "TimeWithTimeZone",
+        "typing",
+        False,
+    ),
+    "TP003": (
+        "pgrubic.rules.typing.TP003",
+        "TimestampWithTimezoneWithPrecision",
+        "typing",
+        False,
+    ),
+    "TP004": (
+        "pgrubic.rules.typing.TP004",
+        "Char",
+        "typing",
+        False,
+    ),
+    "TP005": (
+        "pgrubic.rules.typing.TP005",
+        "Varchar",
+        "typing",
+        False,
+    ),
+    "TP006": (
+        "pgrubic.rules.typing.TP006",
+        "Money",
+        "typing",
+        False,
+    ),
+    "TP007": (
+        "pgrubic.rules.typing.TP007",
+        "Serial",
+        "typing",
+        False,
+    ),
+    "TP008": (
+        "pgrubic.rules.typing.TP008",
+        "Json",
+        "typing",
+        False,
+    ),
+    "TP009": (
+        "pgrubic.rules.typing.TP009",
+        "Integer",
+        "typing",
+        False,
+    ),
+    "TP010": (
+        "pgrubic.rules.typing.TP010",
+        "Smallint",
+        "typing",
+        False,
+    ),
+    "TP011": (
+        "pgrubic.rules.typing.TP011",
+        "Float",
+        "typing",
+        False,
+    ),
+    "TP012": (
+        "pgrubic.rules.typing.TP012",
+        "Xml",
+        "typing",
+        False,
+    ),
+    "TP013": (
+        "pgrubic.rules.typing.TP013",
+        "Hstore",
+        "typing",
+        False,
+    ),
+    "TP014": (
+        "pgrubic.rules.typing.TP014",
+        "DisallowedDataType",
+        "typing",
+        False,
+    ),
+    "TP015": (
+        "pgrubic.rules.typing.TP015",
+        "WronglyTypedRequiredColumn",
+        "typing",
+        False,
+    ),
+    "TP016": (
+        "pgrubic.rules.typing.TP016",
+        "NumericWithPrecision",
+        "typing",
+        False,
+    ),
+    "TP017": (
+        "pgrubic.rules.typing.TP017",
+        "NullableBooleanField",
+        "typing",
+        False,
+    ),
+    "US001": (
+        "pgrubic.rules.unsafe.US001",
+        "DropColumn",
+        "unsafe",
+        False,
+    ),
+    "US002": (
+        "pgrubic.rules.unsafe.US002",
+        "ColumnDataTypeChange",
+        "unsafe",
+        False,
+    ),
+    "US003": (
+        "pgrubic.rules.unsafe.US003",
+        "ColumnRename",
+        "unsafe",
+        False,
+    ),
+    "US004": (
+        "pgrubic.rules.unsafe.US004",
+        "AddingAutoIncrementColumn",
+        "unsafe",
+        False,
+    ),
+    "US005": (
+        "pgrubic.rules.unsafe.US005",
+        "AddingAutoIncrementIdentityColumn",
+        "unsafe",
+        False,
+    ),
+    "US006": (
+        "pgrubic.rules.unsafe.US006",
+        "AddingStoredGeneratedColumn",
+        "unsafe",
+        False,
+    ),
+    "US007": (
+        "pgrubic.rules.unsafe.US007",
+        "DropTablespace",
+        "unsafe",
+        False,
+    ),
+    "US008": (
+        "pgrubic.rules.unsafe.US008",
+        "DropDatabase",
+        "unsafe",
+        False,
+    ),
+    "US009": (
+        "pgrubic.rules.unsafe.US009",
+        "DropSchema",
+        "unsafe",
+        False,
+    ),
+    "US010": (
+        "pgrubic.rules.unsafe.US010",
+        "NotNullConstraintOnExistingColumn",
+        "unsafe",
+        False,
+    ),
+    "US011": (
+        "pgrubic.rules.unsafe.US011",
+        "NewNotNullColumnWithVolatileDefault",
+        "unsafe",
+        True,
+    ),
+    "US012": (
+        "pgrubic.rules.unsafe.US012",
+        "ValidatingForeignKeyConstraintOnExistingRows",
+        "unsafe",
+        False,
+    ),
+    "US013": (
+        "pgrubic.rules.unsafe.US013",
+        "ValidatingCheckConstraintOnExistingRows",
+        "unsafe",
+        False,
+    ),
+    "US014": (
+        "pgrubic.rules.unsafe.US014",
+        "UniqueKeyConstraintCreatingIndex",
+        "unsafe",
+        False,
+    ),
+    "US015": (
+        "pgrubic.rules.unsafe.US015",
+        "PrimaryKeyConstraintCreatingIndex",
+        "unsafe",
+        False,
+    ),
+    "US016": (
+        "pgrubic.rules.unsafe.US016",
+        "NonConcurrentIndexCreation",
+        "unsafe",
+        False,
+    ),
+    "US017": (
+        "pgrubic.rules.unsafe.US017",
+        "IndexMovementToTablespace",
+        "unsafe",
+        False,
+    ),
+    "US018": (
+        "pgrubic.rules.unsafe.US018",
+        "IndexesMovementToTablespace",
+        "unsafe",
+        False,
+    ),
+    "US019": (
+        "pgrubic.rules.unsafe.US019",
+        "NonConcurrentIndexDrop",
+        "unsafe",
+        False,
+    ),
+    "US020": (
+        "pgrubic.rules.unsafe.US020",
+        "NonConcurrentReindex",
+        "unsafe",
+        False,
+    ),
+    "US021": (
+        "pgrubic.rules.unsafe.US021",
+        "DropTable",
+        "unsafe",
+        False,
+    ),
+    "US022": (
+        "pgrubic.rules.unsafe.US022",
+        "RenameTable",
+        "unsafe",
+        False,
+    ),
+    "US023": (
+        "pgrubic.rules.unsafe.US023",
+        "TableMovementToTablespace",
+        "unsafe",
+        False,
+    ),
+    "US024": (
+        "pgrubic.rules.unsafe.US024",
+        "TablesMovementToTablespace",
+        "unsafe",
+        False,
+    ),
+    "US025": (
+        "pgrubic.rules.unsafe.US025",
+        "Cluster",
+        "unsafe",
+        False,
+    ),
+    "US026": (
+        "pgrubic.rules.unsafe.US026",
+        "VacuumFull",
+        "unsafe",
+        False,
+    ),
+    "US027": (
+        "pgrubic.rules.unsafe.US027",
+        "NonConcurrentDetachPartition",
+        "unsafe",
+        False,
+    ),
+    "US028": (
+        "pgrubic.rules.unsafe.US028",
+        "NonConcurrentRefreshMaterializedView",
+        "unsafe",
+        False,
+    ),
+    "US029": (
+        "pgrubic.rules.unsafe.US029",
+        "TruncateTable",
+        "unsafe",
+        False,
+    ),
+    "US030": (
+        "pgrubic.rules.unsafe.US030",
+        "MismatchColumnInDataTypeChange",
+        "unsafe",
+        False,
+    ),
+    "US031": (
+        "pgrubic.rules.unsafe.US031",
+        "NewColumnWithVolatileDefault",
+        "unsafe",
+        False,
+    ),
+}
+
+# Formatter module to the names of its formatters
+FORMATTERS: typing.Final[dict[str, tuple[str, ...]]] = {
+    "pgrubic.formatters.ddl.column": ("column_def",),
+    "pgrubic.formatters.ddl.constraint": (
+        "constraint",
+        "constraint_def_elem",
+    ),
+    "pgrubic.formatters.ddl.database": (
+        "create_db_stmt_def_elem",
+        "drop_db_stmt",
+        "drop_db_stmt_def_elem",
+    ),
+    "pgrubic.formatters.ddl.enum": (
+        "alter_enum_stmt",
+        "create_enum_stmt",
+    ),
+    "pgrubic.formatters.ddl.function": (
+        "alter_function_stmt",
+        "create_function_option",
+        "create_function_stmt",
+    ),
+    "pgrubic.formatters.ddl.index": ("index_stmt",),
+    "pgrubic.formatters.ddl.owner": ("alter_owner_stmt",),
+    "pgrubic.formatters.ddl.rename": ("rename_stmt",),
+    "pgrubic.formatters.ddl.schema": (
+        "alter_object_schema_stmt",
+        "create_schema_stmt",
+    ),
+    "pgrubic.formatters.ddl.table": (
+        "alter_table_stmt",
+        "create_foreign_table_stmt",
+        "create_stmt",
+        "create_table_as_stmt",
+        "into_clause",
+        "partition_spec",
+    ),
+    "pgrubic.formatters.ddl.view": ("view_stmt",),
+    "pgrubic.formatters.dml.boolean": (
+        "bool_expr",
+        "bool_expr_needs_to_be_wrapped_in_parens",
+    ),
+    "pgrubic.formatters.dml.cte": (
+        "common_table_expr",
+        "with_clause",
+    ),
+    "pgrubic.formatters.dml.delete": ("delete_stmt",),
+    "pgrubic.formatters.dml.insert": (
+        "infer_clause",
+        "insert_stmt",
+        "on_conflict_clause",
+    ),
+    "pgrubic.formatters.dml.join": ("join_expr",),
+    "pgrubic.formatters.dml.select": (
+        "range_subselect",
+        "select_stmt",
+        "sub_link",
+        "subexpression_needs_parentheses",
+    ),
+    "pgrubic.formatters.dml.typecast": (
+        "char_has_default_length",
+        "is_char_type",
+        "is_native_cast",
+        "is_string_constant",
+        "native_cast_argument_needs_parentheses",
+        "type_cast",
+    ),
+    "pgrubic.formatters.dml.update": ("update_stmt",),
+}
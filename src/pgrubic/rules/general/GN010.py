@@ -28,18 +28,16 @@ class TableColumnConflict(linter.BaseChecker):
         table_name: str,
         line_number: int,
         column_offset: int,
-        line: str,
+        line_span: tuple[int, int],
         statement_location: int,
     ) -> None:
         """Register the violation."""
         self.violations.add(
             linter.Violation(
                 rule_code=self.code,
-                rule_name=self.name,
-                rule_category=self.category,
                 line_number=line_number,
                 column_offset=column_offset,
-                line=line,
+                line_span=line_span,
                 statement_location=statement_location,
                 description=f"Table name `{table_name}` conflicts with the"
                 " name of its column(s)",
@@ -62,7 +60,7 @@ class TableColumnConflict(linter.BaseChecker):
                 table_name=node.relation.relname,
                 line_number=self.line_number,
                 column_offset=self.column_offset,
-                line=self.line,
+                line_span=self.line_span,
                 statement_location=self.statement_location,
             )
 
@@ -83,6 +81,6 @@ class TableColumnConflict(linter.BaseChecker):
                 table_name=node.relation.relname,
                 line_number=self.line_number,
                 column_offset=self.column_offset,
-                line=self.line,
+                line_span=self.line_span,
                 statement_location=self.statement_location,
             )
@@ -34,18 +34,16 @@ class DropCascade(linter.BaseChecker):
         object_name: str,
         line_number: int,
         column_offset: int,
-        line: str,
+        line_span: tuple[int, int],
         statement_location: int,
     ) -> None:
         """Register violation."""
         self.violations.add(
             linter.Violation(
                 rule_code=self.code,
-                rule_name=self.name,
-                rule_category=self.category,
                 line_number=line_number,
                 column_offset=column_offset,
-                line=line,
+                line_span=line_span,
                 statement_location=statement_location,
                 description=f"Drop cascade on `{object_name}` detected",
                 is_auto_fixable=self.is_auto_fixable,
@@ -68,7 +66,7 @@ class DropCascade(linter.BaseChecker):
                     object_name=get_fully_qualified_name(object_names),
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                 )
 
@@ -96,7 +94,7 @@ class DropCascade(linter.BaseChecker):
                 object_name=node.name,
                 line_number=self.line_number,
                 column_offset=self.column_offset,
-                line=self.line,
+                line_span=self.line_span,
                 statement_location=self.statement_location,
             )
 
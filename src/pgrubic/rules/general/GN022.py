@@ -30,11 +30,9 @@ class UpdateWithoutWhereClause(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description="Found UPDATE without a WHERE clause",
                     is_auto_fixable=self.is_auto_fixable,
@@ -31,6 +31,10 @@ class DuplicateIndex(linter.BaseChecker):
         super().__init__(config=config)
         self.seen_indexes: list[tuple[object, object, object, object]] = []
 
+    def reset(self) -> None:
+        """Forget the indexes seen in the previous source file."""
+        self.seen_indexes = []
+
     def visit_IndexStmt(
         self,
         ancestors: visitors.Ancestor,
@@ -48,11 +52,9 @@ class DuplicateIndex(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description="Duplicate index detected",
                     is_auto_fixable=self.is_auto_fixable,
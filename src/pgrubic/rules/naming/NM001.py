@@ -38,11 +38,9 @@ class InvalidIndexName(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description=f"Index `{node.idxname}` does not follow naming"
                     f" convention `{self.config.lint.regex_index}`",
@@ -38,11 +38,9 @@ class InvalidSequenceName(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description=f"Sequence `{node.sequence.relname}` does not follow"
                     f" naming convention `{self.config.lint.regex_sequence}`",
@@ -65,11 +63,9 @@ class InvalidSequenceName(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description=f"Sequence `{node.newname}` does not follow"
                     f" naming convention `{self.config.lint.regex_sequence}`",
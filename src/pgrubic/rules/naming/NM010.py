@@ -44,7 +44,7 @@ class NonSnakeCaseIdentifier(CheckIdentifier):
         identifier: str,
         line_number: int,
         column_offset: int,
-        line: str,
+        line_span: tuple[int, int],
         statement_location: int,
     ) -> None:
         """Check if identifier is not in snake case."""
@@ -52,11 +52,9 @@ class NonSnakeCaseIdentifier(CheckIdentifier):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=line_number,
                     column_offset=column_offset,
-                    line=line,
+                    line_span=line_span,
                     statement_location=statement_location,
                     description=f"Identifier `{identifier}` should be in snake case",
                     is_auto_fixable=self.is_auto_fixable,
@@ -36,7 +36,7 @@ class KeywordIdentifier(CheckIdentifier):
         identifier: str,
         line_number: int,
         column_offset: int,
-        line: str,
+        line_span: tuple[int, int],
         statement_location: int,
     ) -> None:
         """Check for keywords used as identifiers."""
@@ -53,11 +53,9 @@ class KeywordIdentifier(CheckIdentifier):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=line_number,
                     column_offset=column_offset,
-                    line=line,
+                    line_span=line_span,
                     statement_location=statement_location,
                     description=f"Keyword `{identifier}` used as an identifier",
                     is_auto_fixable=self.is_auto_fixable,
@@ -28,7 +28,7 @@ class SpecialCharacterInIdentifier(CheckIdentifier):
         identifier: str,
         line_number: int,
         column_offset: int,
-        line: str,
+        line_span: tuple[int, int],
         statement_location: int,
     ) -> None:
         """Checks for identifiers with special characters."""
@@ -36,11 +36,9 @@ class SpecialCharacterInIdentifier(CheckIdentifier):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=line_number,
                     column_offset=column_offset,
-                    line=line,
+                    line_span=line_span,
                     statement_location=statement_location,
                     description=f"Special characters in identifier `{identifier}`",
                     is_auto_fixable=self.is_auto_fixable,
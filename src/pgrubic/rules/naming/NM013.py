@@ -36,7 +36,7 @@ class PgPrefixIdentifier(CheckIdentifier):
         identifier: str,
         line_number: int,
         column_offset: int,
-        line: str,
+        line_span: tuple[int, int],
         statement_location: int,
     ) -> None:
         """Checks for identifiers prefix with pg_."""
@@ -44,11 +44,9 @@ class PgPrefixIdentifier(CheckIdentifier):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=line_number,
                     column_offset=column_offset,
-                    line=line,
+                    line_span=line_span,
                     statement_location=statement_location,
                     description="Identifier should not use prefix `pg_`",
                     is_auto_fixable=self.is_auto_fixable,
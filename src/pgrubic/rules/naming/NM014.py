@@ -25,7 +25,7 @@ class SingleLetterIdentifier(CheckIdentifier):
         identifier: str,
         line_number: int,
         column_offset: int,
-        line: str,
+        line_span: tuple[int, int],
         statement_location: int,
     ) -> None:
         """Checks for identifiers with single letter."""
@@ -33,11 +33,9 @@ class SingleLetterIdentifier(CheckIdentifier):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=line_number,
                     column_offset=column_offset,
-                    line=line,
+                    line_span=line_span,
                     statement_location=statement_location,
                     description=f"Single letter identifier `{identifier}`"
                     " is not descriptive enough",
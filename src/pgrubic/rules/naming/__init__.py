@@ -21,7 +21,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
         identifier: str,
         line_number: int,
         column_offset: int,
-        line: str,
+        line_span: tuple[int, int],
         statement_location: int,
     ) -> None:
         """Check identifier for violations."""
@@ -36,7 +36,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.relation.relname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -50,7 +50,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.colname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -64,7 +64,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.view.relname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -78,7 +78,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.idxname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -92,7 +92,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.sequence.relname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -106,7 +106,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.schemaname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -120,7 +120,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.funcname[-1].sval,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -135,7 +135,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
                 identifier=node.conname,
                 line_number=self.line_number,
                 column_offset=self.column_offset,
-                line=self.line,
+                line_span=self.line_span,
                 statement_location=self.statement_location,
             )
 
@@ -149,7 +149,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.dbname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -163,7 +163,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.role,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -177,7 +177,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.tablespacename,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -191,7 +191,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.trigname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -205,7 +205,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.typeName[-1].sval,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -219,7 +219,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.rulename,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -233,7 +233,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.rel.relname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -247,7 +247,7 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.typevar.relname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
 
@@ -261,6 +261,6 @@ class CheckIdentifier(abc.ABC, linter.BaseChecker, metaclass=ABCBaseCheckerMeta)
             identifier=node.newname,
             line_number=self.line_number,
             column_offset=self.column_offset,
-            line=self.line,
+            line_span=self.line_span,
             statement_location=self.statement_location,
         )
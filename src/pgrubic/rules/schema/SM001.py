@@ -33,11 +33,9 @@ class SchemaUnqualifiedObject(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description=f"Database object `{node.typeName[0].sval}`"
                     " should be schema qualified",
@@ -56,11 +54,9 @@ class SchemaUnqualifiedObject(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description=f"Database object `{function_name[0].sval}`"
                     " should be schema qualified",
@@ -123,11 +119,9 @@ class SchemaUnqualifiedObject(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description=f"Database object `{node.relname}`"
                     " should be schema qualified",
@@ -153,11 +147,9 @@ class SchemaUnqualifiedObject(linter.BaseChecker):
                 self.violations.add(
                     linter.Violation(
                         rule_code=self.code,
-                        rule_name=self.name,
-                        rule_category=self.category,
                         line_number=self.line_number,
                         column_offset=self.column_offset,
-                        line=self.line,
+                        line_span=self.line_span,
                         statement_location=self.statement_location,
                         description=f"Database object `{object_names[-1].sval}`"
                         " should be schema qualified",
@@ -209,11 +201,9 @@ class SchemaUnqualifiedObject(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description=f"Database object `{node.objname[0].sval}`"
                     " should be schema qualified",
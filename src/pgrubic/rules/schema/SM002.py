@@ -46,11 +46,9 @@ class DisallowedSchema(linter.BaseChecker):
                     self.violations.add(
                         linter.Violation(
                             rule_code=self.code,
-                            rule_name=self.name,
-                            rule_category=self.category,
                             line_number=self.line_number,
                             column_offset=self.column_offset,
-                            line=self.line,
+                            line_span=self.line_span,
                             statement_location=self.statement_location,
                             description=f"Schema '{node.schemaname}' is disallowed in"
                             f" config with reason: '{schema.reason}'"
@@ -86,11 +84,9 @@ class DisallowedSchema(linter.BaseChecker):
                 self.violations.add(
                     linter.Violation(
                         rule_code=self.code,
-                        rule_name=self.name,
-                        rule_category=self.category,
                         line_number=self.line_number,
                         column_offset=self.column_offset,
-                        line=self.line,
+                        line_span=self.line_span,
                         statement_location=self.statement_location,
                         description=f"Schema '{schema_name}' is disallowed in"
                         f" config with reason: '{schema.reason}'"
@@ -126,11 +122,9 @@ class DisallowedSchema(linter.BaseChecker):
                 self.violations.add(
                     linter.Violation(
                         rule_code=self.code,
-                        rule_name=self.name,
-                        rule_category=self.category,
                         line_number=self.line_number,
                         column_offset=self.column_offset,
-                        line=self.line,
+                        line_span=self.line_span,
                         statement_location=self.statement_location,
                         description=f"Schema '{schema_name}' is disallowed in"
                         f" config with reason: '{schema.reason}'"
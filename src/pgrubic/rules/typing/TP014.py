@@ -36,11 +36,9 @@ class DisallowedDataType(linter.BaseChecker):
                 self.violations.add(
                     linter.Violation(
                         rule_code=self.code,
-                        rule_name=self.name,
-                        rule_category=self.category,
                         line_number=self.line_number,
                         column_offset=self.column_offset,
-                        line=self.line,
+                        line_span=self.line_span,
                         statement_location=self.statement_location,
                         description=f"Data type '{node.names[-1].sval}' is disallowed"
                         f" in config with reason: '{data_type.reason}', use"
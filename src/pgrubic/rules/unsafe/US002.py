@@ -44,11 +44,9 @@ class ColumnDataTypeChange(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description="Column data type change is not safe",
                     is_auto_fixable=self.is_auto_fixable,
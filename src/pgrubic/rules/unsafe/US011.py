@@ -66,11 +66,9 @@ It is no longer available for linting and will be removed in a future release.""
                 self.violations.add(
                     linter.Violation(
                         rule_code=self.code,
-                        rule_name=self.name,
-                        rule_category=self.category,
                         line_number=self.line_number,
                         column_offset=self.column_offset,
-                        line=self.line,
+                        line_span=self.line_span,
                         statement_location=self.statement_location,
                         description="New not-null column with volatile default",
                         is_auto_fixable=self.is_auto_fixable,
@@ -38,11 +38,9 @@ class MismatchColumnInDataTypeChange(linter.BaseChecker):
             self.violations.add(
                 linter.Violation(
                     rule_code=self.code,
-                    rule_name=self.name,
-                    rule_category=self.category,
                     line_number=self.line_number,
                     column_offset=self.column_offset,
-                    line=self.line,
+                    line_span=self.line_span,
                     statement_location=self.statement_location,
                     description=f"Column `{alter_table_cmd.node.name}` in data type"
                     f" change does not match column `{node.fields[-1].sval}`"
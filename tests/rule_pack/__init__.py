@@ -0,0 +1 @@
+"""Rule pack registered by the tests."""
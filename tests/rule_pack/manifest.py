@@ -0,0 +1,12 @@
+"""Manifest of the rule pack."""
+
+import typing
+
+RULES: typing.Final[dict[str, tuple[str, str, str, bool]]] = {
+    "XP001": (
+        "tests.rule_pack.table.XP001",
+        "TruncateTable",
+        "table",
+        False,
+    ),
+}
@@ -0,0 +1,28 @@
+"""Checker for truncate table."""
+
+from pglast import ast, visitors
+
+from pgrubic.core import linter
+
+
+class TruncateTable(linter.BaseChecker):
+    """Checks for truncation of tables."""
+
+    def visit_TruncateStmt(
+        self,
+        ancestors: visitors.Ancestor,
+        node: ast.TruncateStmt,
+    ) -> None:
+        """Visit TruncateStmt."""
+        self.violations.add(
+            linter.Violation(
+                rule_code=self.code,
+                line_number=self.line_number,
+                column_offset=self.column_offset,
+                line_span=self.line_span,
+                statement_location=self.statement_location,
+                description="Truncate table",
+                is_auto_fixable=self.is_auto_fixable,
+                is_fix_enabled=self.is_fix_enabled,
+            ),
+        )
@@ -0,0 +1 @@
+"""Rules for tables."""
@@ -5,6 +5,10 @@ import typing
 import pathlib
 from unittest.mock import patch
 
+import pytest
+import msgpack
+
+import pgrubic
 from pgrubic import core
 from pgrubic.core import noqa
 
@@ -231,6 +235,226 @@ def test_source_invalidated_in_cache_by_config(
     assert len(sources_to_be_formatted) == 1
 
 
+def test_cache_file_read_once(tmp_path: pathlib.Path, cache: core.Cache) -> None:
+    """Test cache file is read once per run."""
+    source = tmp_path / SOURCE_FILE
+    source.write_text("SELECT a = NULL;")
+
+    core.Cache(config=cache.config).write(sources={source})
+
+    with patch("msgpack.unpack", wraps=msgpack.unpack) as unpack:
+        assert not cache.filter_sources(sources={source})
+        assert not cache.filter_sources(sources={source})
+
+    unpack.assert_called_once()
+
+
+def test_cache_write_with_hashed_contents(
+    tmp_path: pathlib.Path,
+    cache: core.Cache,
+) -> None:
+    """Test cache write uses the given hash digests instead of reading sources."""
+    source_code: str = "SELECT a = NULL;"
+
+    source = tmp_path / SOURCE_FILE
+    source.write_text(source_code)
+
+    with patch.object(pathlib.Path, "read_bytes") as read_bytes:
+        cache.write(
+            sources={source},
+            hashed_contents={
+                str(source.resolve()): cache.hash_digest(source_code.encode("utf-8")),
+            },
+        )
+
+    read_bytes.assert_not_called()
+
+    assert not core.Cache(config=cache.config).filter_sources(sources={source})
+
+
+def test_cache_evicts_missing_sources(
+    tmp_path: pathlib.Path,
+    cache: core.Cache,
+) -> None:
+    """Test cache entries of sources that no longer exist are evicted."""
+    source_1 = tmp_path / "source_1.sql"
+    source_1.write_text("SELECT 1;")
+
+    source_2 = tmp_path / "source_2.sql"
+    source_2.write_text("SELECT 2;")
+
+    cache.write(sources={source_1, source_2})
+
+    source_2.unlink()
+
+    cache.write(sources={source_1})
+
+    assert set(core.Cache(config=cache.config)._read()) == {  # noqa: SLF001
+        str(source_1.resolve()),
+    }
+
+
+def test_cache_evicts_unseen_sources(
+    tmp_path: pathlib.Path,
+    cache: core.Cache,
+) -> None:
+    """Test cache entries of sources not seen for too many runs are evicted."""
+    source_1 = tmp_path / "source_1.sql"
+    source_1.write_text("SELECT 1;")
+
+    source_2 = tmp_path / "source_2.sql"
+    source_2.write_text("SELECT 2;")
+
+    source_3 = tmp_path / "source_3.sql"
+    source_3.write_text("SELECT 3;")
+
+    cache.write(sources={source_1, source_2})
+
+    with patch.object(core.cache, "MAX_UNSEEN_RUNS", 2):
+        # source_1 is seen, source_3 is formatted and source_2 is not seen
+        for _ in range(3):
+            run_cache = core.Cache(config=cache.config)
+            assert run_cache.filter_sources(sources={source_1}) == set()
+            run_cache.write(sources={source_3})
+
+    assert set(core.Cache(config=cache.config)._read()) == {  # noqa: SLF001
+        str(source_1.resolve()),
+        str(source_3.resolve()),
+    }
+
+
+def test_cache_usage_and_clean(tmp_path: pathlib.Path, cache: core.Cache) -> None:
+    """Test cache usage and clean, directories holding other files are kept."""
+    source = tmp_path / SOURCE_FILE
+    source.write_text("SELECT 1;")
+
+    cache.write(sources={source})
+
+    old_version = tmp_path / "0.0.1"
+    old_version.mkdir()
+    (old_version / cache.cache_file.name).write_bytes(b"cache")
+
+    cache_usage = core.cache.usage(cache.config)
+
+    assert set(cache_usage) == {"0.0.1", pgrubic.__version__}
+    assert cache_usage["0.0.1"] == core.cache.CacheUsage(files=1, size=5)
+
+    removed = core.cache.clean(cache.config)
+
+    assert removed.files == 2  # noqa: PLR2004
+    assert not core.cache.usage(cache.config)
+    assert source.exists()
+
+
+def test_cache_prune(tmp_path: pathlib.Path, cache: core.Cache) -> None:
+    """Test cache prune removes other versions, old and least recently used files."""
+    old_version = tmp_path / "0.0.1"
+    old_version.mkdir()
+    (old_version / cache.cache_file.name).write_bytes(b"cache")
+
+    cache.cache_dir.mkdir(parents=True)
+
+    cache_files = [cache.cache_dir / f"{index:020x}" for index in range(3)]
+
+    for index, cache_file in enumerate(cache_files):
+        cache_file.write_bytes(b"0" * 10)
+        os.utime(cache_file, (1602179630 + index, 1602179630 + index))
+
+    os.utime(cache_files[2], None)
+
+    assert core.cache.prune(cache.config) == core.cache.CacheUsage(files=1, size=5)
+
+    assert core.cache.prune(cache.config, max_age=60) == core.cache.CacheUsage(
+        files=2,
+        size=20,
+    )
+    assert cache_files[2].exists()
+
+    assert core.cache.prune(cache.config, max_size=10) == core.cache.CacheUsage()
+
+    assert core.cache.prune(cache.config, max_size=0) == core.cache.CacheUsage(
+        files=1,
+        size=10,
+    )
+
+
+def test_cache_evict(tmp_path: pathlib.Path, cache: core.Cache) -> None:
+    """Test cache evict removes unused lint results and statement tables, at most once
+    per eviction interval.
+    """
+    assert core.cache.evict(cache.config) == core.cache.CacheUsage()
+
+    source = tmp_path / SOURCE_FILE
+    source.write_text("SELECT 1;")
+
+    cache.write(sources={source})
+    os.utime(cache.cache_file, (1602179630, 1602179630))
+
+    lint_cache = core.LintCache(config=cache.config)
+    lint_cache.cache_dir.mkdir(parents=True)
+
+    cache_files = [lint_cache.cache_dir / f"{index:064x}" for index in range(2)]
+
+    for cache_file in cache_files:
+        cache_file.write_bytes(b"0" * 10)
+
+    os.utime(cache_files[0], (1602179630, 1602179630))
+
+    assert core.cache.evict(cache.config) == core.cache.CacheUsage(files=1, size=10)
+    assert not cache_files[0].exists()
+    assert cache_files[1].exists()
+    assert cache.cache_file.exists()
+
+    os.utime(cache_files[1], (1602179630, 1602179630))
+
+    assert core.cache.evict(cache.config) == core.cache.CacheUsage()
+    assert cache_files[1].exists()
+
+
+@pytest.mark.parametrize(
+    ("value", "size"),
+    [("100", 100), ("500K", 500_000), ("1.5m", 1_500_000), ("1G", 1_000_000_000)],
+)
+def test_parse_size(value: str, size: int) -> None:
+    """Test parse size."""
+    assert core.cache.parse_size(value) == size
+
+
+@pytest.mark.parametrize(
+    ("value", "age"),
+    [("90", 90), ("30m", 1800), ("12h", 43200), ("2d", 172800), ("1w", 604800)],
+)
+def test_parse_age(value: str, age: float) -> None:
+    """Test parse age."""
+    assert core.cache.parse_age(value) == age
+
+
+@pytest.mark.parametrize("value", ["", "M", "10X", "-1d"])
+def test_parse_invalid_quantity(value: str) -> None:
+    """Test parse invalid size and age."""
+    with pytest.raises(ValueError, match="Invalid value"):
+        core.cache.parse_size(value)
+
+    with pytest.raises(ValueError, match="Invalid value"):
+        core.cache.parse_age(value)
+
+
+@pytest.mark.parametrize(
+    ("size", "formatted_size"),
+    [(100, "100 B"), (1500, "1.5 KB"), (2_000_000, "2.0 MB"), (10**9, "1.0 GB")],
+)
+def test_format_size(size: int, formatted_size: str) -> None:
+    """Test format size."""
+    assert core.cache.format_size(size) == formatted_size
+
+
+def test_config_digest_serializes_paths() -> None:
+    """Test config digest serializes values that are not natively serializable."""
+    assert core.cache._config_digest(  # noqa: SLF001
+        {"cache_dir": pathlib.Path("a")},
+    ) == core.cache._config_digest({"cache_dir": "a"})  # noqa: SLF001
+
+
 def test_cache_directory_from_environment_variable_default_in_config(
     tmp_path: pathlib.Path,
 ) -> None:
@@ -259,3 +483,118 @@ def test_cache_directory_from_environment_variable_non_default_in_config(
     ):
         cache = core.Cache(config=config)
         assert cache.config.cache_dir != tmp_path
+
+
+def test_lint_cache_round_trip(tmp_path: pathlib.Path, linter: core.Linter) -> None:
+    """Test lint results are read back from the lint cache."""
+    source_code: str = "SELECT a = NULL; -- noqa: GN001\nSELECT b FROM;\n"
+
+    source = tmp_path / SOURCE_FILE
+    source.write_text(source_code)
+
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+    lint_cache = core.LintCache(config=config)
+
+    key = lint_cache.key(source)
+
+    assert lint_cache.read(key=key, source_file=str(source)) is None
+
+    lint_result = linter.run(source_file=str(source), source_code=source_code)
+
+    lint_cache.write(key=key, lint_result=lint_result)
+
+    cached_lint_result = lint_cache.read(key=key, source_file=str(source))
+
+    assert cached_lint_result is not None
+    assert cached_lint_result.violations == lint_result.violations
+    assert cached_lint_result.errors == lint_result.errors
+    assert cached_lint_result.unused_lint_ignores == lint_result.unused_lint_ignores
+
+
+def test_lint_cache_key_invalidated(tmp_path: pathlib.Path) -> None:
+    """Test lint cache key changes with the content of the source and the config."""
+    source = tmp_path / SOURCE_FILE
+    source.write_text("SELECT a = NULL;")
+
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+
+    key = core.LintCache(config=config).key(source)
+
+    # Fields that do not affect lint results
+    config.lint.no_cache = True
+    config.format.check = True
+
+    assert core.LintCache(config=config).key(source) == key
+
+    config.lint.target_postgres_version = 17
+
+    assert core.LintCache(config=config).key(source) != key
+
+    config.lint.target_postgres_version = 14
+    source.write_text("SELECT b = NULL;")
+
+    assert core.LintCache(config=config).key(source) != key
+
+
+def test_lint_cache_skips_fixed_results(tmp_path: pathlib.Path) -> None:
+    """Test lint results with fixes are not cached."""
+    source = tmp_path / SOURCE_FILE
+    source.write_text("SELECT a = NULL;")
+
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+    lint_cache = core.LintCache(config=config)
+
+    key = lint_cache.key(source)
+
+    lint_cache.write(
+        key=key,
+        lint_result=core.linter.LintResult(
+            source_file=str(source),
+            violations=set(),
+            errors=set(),
+            fixed_source_code="SELECT a IS NULL;\n",
+        ),
+    )
+
+    assert lint_cache.read(key=key, source_file=str(source)) is None
+
+
+def test_lint_cache_key_per_file_rules(tmp_path: pathlib.Path) -> None:
+    """Test lint cache key differs for the same content linted with other rules."""
+    selected_source = tmp_path / "selected" / SOURCE_FILE
+    selected_source.parent.mkdir()
+    selected_source.write_text("SELECT a = NULL;")
+
+    source = tmp_path / SOURCE_FILE
+    source.write_text("SELECT a = NULL;")
+
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+    config.lint.per_file_select = {"*/selected/*.sql": ["GN024"]}
+
+    lint_cache = core.LintCache(config=config)
+
+    assert lint_cache.key(selected_source) != lint_cache.key(source)
+
+
+@pytest.mark.parametrize(
+    "statement_cache",
+    [
+        core.cache.StatementCache(
+            config=core.parse_config(),
+            name="linter",
+            config_digest=b"",
+        ),
+        core.cache.MemoryStatementCache(config_digest=b""),
+    ],
+)
+def test_statement_cache_close_without_open(
+    statement_cache: core.cache.StatementCache,
+) -> None:
+    """Test closing a statement cache without an opened table does nothing."""
+    statement_cache.close()
+
+    assert not statement_cache.entries
@@ -1,20 +1,24 @@
 """Test cli."""
 
 import os
+import json
 import pathlib
+from collections import abc
 from unittest.mock import patch
 
 import click
 import pytest
 from click import testing
 
+import pgrubic
 from tests import TEST_FILE
 from pgrubic import (
     DOCUMENTATION_URL,
     RULE_DOCUMENTATION_BASE,
     WORKERS_ENVIRONMENT_VARIABLE,
+    core,
 )
-from pgrubic.core import noqa, config, linter
+from pgrubic.core import noqa, config, errors, linter
 from pgrubic.__main__ import cli
 
 
@@ -260,6 +264,87 @@ Total errors: **0**
     assert pathlib.Path(report_file).read_text() == expected_lint_report
 
 
+def test_cli_lint_profile_rules(tmp_path: pathlib.Path) -> None:
+    """Test cli lint with profile rules."""
+    runner = testing.CliRunner()
+
+    file_fail = tmp_path / TEST_FILE
+    file_fail.write_text("SELECT a = NULL;")
+    profile_file = tmp_path / "profile.json"
+
+    result = runner.invoke(
+        cli,
+        ["lint", str(file_fail), "--profile-rules-json", str(profile_file)],
+    )
+
+    assert result.exit_code == 1
+    assert "Violations" in result.output
+    assert "GN024" in result.output
+
+    rule_profiles = json.loads(profile_file.read_text())
+
+    assert rule_profiles["GN024"]["violations"] == 1
+    assert rule_profiles["GN024"]["invocations"] > 0
+
+
+def test_cli_lint_progress(tmp_path: pathlib.Path) -> None:
+    """Test cli lint with progress."""
+    runner = testing.CliRunner()
+
+    for index in range(2):
+        (tmp_path / f"{index}{TEST_FILE}").write_text("SELECT a = NULL;")
+
+    result = runner.invoke(cli, ["lint", str(tmp_path), "--progress"])
+
+    assert result.exit_code == 1
+    assert "2/2 file(s)" in result.output
+    assert "files/s" in result.output
+    assert "Found 2 violation(s)" in result.output
+
+
+def test_cli_lint_stream(tmp_path: pathlib.Path) -> None:
+    """Test cli lint with stream."""
+    runner = testing.CliRunner()
+
+    file_fail = tmp_path / TEST_FILE
+    file_fail.write_text("SELECT 1;\n\nSELECT a = NULL;\n")
+
+    result = runner.invoke(cli, ["lint", str(file_fail), "--stream"])
+
+    assert result.exit_code == 1
+    assert f"{file_fail}:3:10:" in result.output
+    assert "Found 1 violation(s)" in result.output
+
+    result = runner.invoke(cli, ["lint", str(file_fail), "--stream", "--fix"])
+
+    assert result.exit_code == 1
+    assert "Fixes cannot be applied when linting files incrementally" in result.output
+
+
+def test_cli_lint_watch(tmp_path: pathlib.Path) -> None:
+    """Test cli lint with watch lints the changed files again until interrupted."""
+    runner = testing.CliRunner()
+
+    file_fail = tmp_path / TEST_FILE
+    file_fail.write_text("SELECT a = NULL;\n")
+
+    def watch_sources(**_: object) -> abc.Iterator[set[pathlib.Path]]:
+        """Fix the file, then interrupt the watch."""
+        file_fail.write_text("SELECT a IS NULL;\n")
+        yield {file_fail}
+        raise KeyboardInterrupt
+
+    with patch.object(core.watcher, "watch_sources", side_effect=watch_sources):
+        result = runner.invoke(cli, ["lint", str(file_fail), "--watch"])
+
+    assert result.exit_code == 0
+    assert "Found 1 violation(s)" in result.output
+    assert result.output.count("Watching for file changes...") == 2  # noqa: PLR2004
+    assert result.output.rstrip().endswith(
+        "All checks passed!\nWatching for file changes...",
+    )
+
+
 def test_cli_lint_no_violations(tmp_path: pathlib.Path) -> None:
     """Test cli lint with add_file_level_general_noqa."""
     runner = testing.CliRunner()
@@ -350,6 +435,23 @@ def test_cli_lint_parse_error(tmp_path: pathlib.Path) -> None:
     assert result.exit_code == 1
 
 
+def test_cli_lint_rule_pack_error(tmp_path: pathlib.Path) -> None:
+    """Test cli lint exits on rule packs that cannot be loaded."""
+    runner = testing.CliRunner()
+
+    (tmp_path / TEST_FILE).write_text("SELECT 1;")
+
+    with patch.object(
+        core.loader,
+        "load_rule_packs",
+        side_effect=errors.RulePackError('Rule pack "broken" cannot be loaded'),
+    ):
+        result = runner.invoke(cli, ["lint", str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert 'Rule pack "broken" cannot be loaded' in result.output
+
+
 def test_cli_lint_missing_config_error(tmp_path: pathlib.Path) -> None:
     """Test cli lint missing config error."""
     config_content = """
@@ -610,6 +712,40 @@ def test_cli_format_check(tmp_path: pathlib.Path) -> None:
     assert result.exit_code == 1
 
 
+def test_cli_format_progress(tmp_path: pathlib.Path) -> None:
+    """Test cli format with progress."""
+    runner = testing.CliRunner()
+
+    for index in range(2):
+        (tmp_path / f"{index}{TEST_FILE}").write_text("select 1;")
+
+    result = runner.invoke(cli, ["format", str(tmp_path), "--progress", "--no-cache"])
+
+    assert result.exit_code == 0
+    assert "2/2 file(s)" in result.output
+    assert "2 file(s) reformatted" in result.output
+
+
+def test_cli_format_watch(tmp_path: pathlib.Path) -> None:
+    """Test cli format with watch formats the changed files again."""
+    runner = testing.CliRunner()
+
+    file_fail = tmp_path / TEST_FILE
+    file_fail.write_text("select 1;\n")
+
+    def watch_sources(**_: object) -> abc.Iterator[set[pathlib.Path]]:
+        """Change the file once."""
+        file_fail.write_text("select 2;\n")
+        yield {file_fail}
+
+    with patch.object(core.watcher, "watch_sources", side_effect=watch_sources):
+        result = runner.invoke(cli, ["format", str(file_fail), "--watch"])
+
+    assert result.exit_code == 0
+    assert result.output.count("1 file(s) reformatted") == 2  # noqa: PLR2004
+    assert file_fail.read_text() == "SELECT 2;\n"
+
+
 def test_cli_format_check_parse_error(tmp_path: pathlib.Path) -> None:
     """Test cli format check parse error."""
     runner = testing.CliRunner()
@@ -646,6 +782,92 @@ def test_cli_format_diff(tmp_path: pathlib.Path) -> None:
     assert result.exit_code == 1
 
 
+def test_cli_format_check_cache(tmp_path: pathlib.Path) -> None:
+    """Test cli format check caches only sources already formatted."""
+    runner = testing.CliRunner()
+
+    directory = tmp_path / "sub"
+    directory.mkdir()
+
+    file_pass = directory / "pass.sql"
+    file_pass.write_text(f"SELECT 1;{noqa.NEW_LINE}")
+
+    file_fail = directory / "fail.sql"
+    file_fail.write_text("select 1;")
+
+    with patch.dict(
+        "os.environ",
+        {core.cache.CACHE_DIR_ENVIRONMENT_VARIABLE: str(tmp_path / "cache")},
+    ):
+        result = runner.invoke(cli, ["format", str(directory), "--check"])
+
+        assert result.exit_code == 1
+
+        assert core.Cache(config=core.parse_config()).filter_sources(
+            sources={file_pass, file_fail},
+        ) == {file_fail}
+
+        result = runner.invoke(cli, ["format", str(file_pass), "--check"])
+
+        assert result.exit_code == 0
+
+
+def test_cli_lsp() -> None:
+    """Test cli lsp serves the language server with the config."""
+    runner = testing.CliRunner()
+
+    with patch("pgrubic.core.lsp.serve", return_value=0) as serve:
+        result = runner.invoke(cli, ["lsp", "--config", "lint.select = ['GN024']"])
+
+    assert result.exit_code == 0
+    (config_,) = serve.call_args.args
+    assert config_.lint.select == ["GN024"]
+
+
+def test_cli_cache(tmp_path: pathlib.Path) -> None:
+    """Test cli cache stats, prune and clean."""
+    runner = testing.CliRunner()
+
+    source = tmp_path / TEST_FILE
+    source.write_text(f"SELECT 1;{noqa.NEW_LINE}")
+
+    cache_dir = tmp_path / "cache"
+
+    with patch.dict(
+        "os.environ",
+        {core.cache.CACHE_DIR_ENVIRONMENT_VARIABLE: str(cache_dir)},
+    ):
+        result = runner.invoke(cli, ["cache", "stats"])
+
+        assert result.exit_code == 0
+        assert result.output == (
+            f"Cache directory: {cache_dir}{noqa.NEW_LINE}No cache found{noqa.NEW_LINE}"
+        )
+
+        runner.invoke(cli, ["format", str(source)])
+
+        result = runner.invoke(cli, ["cache", "stats"])
+
+        assert result.exit_code == 0
+        assert f"{pgrubic.__version__} (current): " in result.output
+
+        result = runner.invoke(cli, ["cache", "prune", "--max-size", "1M"])
+
+        assert result.exit_code == 0
+        assert result.output == f"Removed 0 file(s), 0 B{noqa.NEW_LINE}"
+
+        result = runner.invoke(cli, ["cache", "prune", "--max-age", "1x"])
+
+        assert result.exit_code == 2  # noqa: PLR2004
+        assert "Invalid value '1x'" in result.output
+
+        result = runner.invoke(cli, ["cache", "clean"])
+
+        assert result.exit_code == 0
+        assert result.output.startswith("Removed ")
+        assert not cache_dir.exists()
+
+
 def test_cli_format_no_cache(tmp_path: pathlib.Path) -> None:
     """Test cli format with no cache."""
     runner = testing.CliRunner()
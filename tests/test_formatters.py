@@ -114,6 +114,79 @@ def test_format_parse_error(formatter: core.Formatter) -> None:
     assert len(formatting_result.errors) == 1
 
 
+def test_format_preserves_copy_data(formatter: core.Formatter) -> None:
+    """Test data rows of COPY FROM stdin statements are kept as is."""
+    source_code = """copy tbl (a, b) from stdin;
+1\tit's; a 'row
+2\t/* not a comment
+\\.
+select 1;
+"""
+
+    formatting_result = formatter.format(source_file=TEST_FILE, source_code=source_code)
+
+    assert not formatting_result.errors
+    assert (
+        formatting_result.formatted_source_code
+        == """COPY tbl (a, b) FROM STDIN;
+1\tit's; a 'row
+2\t/* not a comment
+\\.
+
+SELECT 1;
+"""
+    )
+
+
+def test_format_with_statement_cache(tmp_path: pathlib.Path) -> None:
+    """Test formatted statements are answered from the statement cache."""
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+
+    statement_cache = core.cache.StatementCache(
+        config=config,
+        name="formatter",
+        config_digest=core.cache.format_config_digest(config),
+    )
+    formatter = core.Formatter(
+        config=config,
+        formatters=core.load_formatters,
+        statement_cache=statement_cache,
+    )
+
+    formatting_result = formatter.format(
+        source_file=TEST_FILE,
+        source_code="select 1;\nselect b from;\n",
+    )
+
+    assert len(formatting_result.errors) == 1
+
+    formatting_result = formatter.format(
+        source_file=TEST_FILE,
+        source_code="select 1;\nselect 3;\n",
+    )
+
+    statement_cache.open(TEST_FILE)
+
+    # Statements that failed to parse, or are no longer in the source, are not kept
+    assert statement_cache.get("select 1;") == "SELECT 1;"
+    assert statement_cache.get("select 3;") == "SELECT 3;"
+    assert statement_cache.get("select b from;") is None
+
+    statement_cache.close()
+
+    statement_cache.open(TEST_FILE)
+    statement_cache.put("select 1;", "SELECT cached;")
+    statement_cache.close()
+
+    formatting_result = formatter.format(
+        source_file=TEST_FILE,
+        source_code="select 1;\n",
+    )
+
+    assert formatting_result.formatted_source_code == f"SELECT cached;{noqa.NEW_LINE}"
+
+
 def test_new_line_before_semicolon(formatter: core.Formatter) -> None:
     """Test new line before semicolon."""
     source_code = "select 1;"
@@ -1,9 +1,17 @@
 """Test linter."""
 
+import io
+import time
+import pickle
 import pathlib
+import itertools
+from unittest.mock import patch
 
+from pglast import ast, parser
+
+from tests import conftest
 from pgrubic import DOCUMENTATION_URL, RULE_DOCUMENTATION_BASE, core
-from pgrubic.core import noqa
+from pgrubic.core import noqa, visitors
 
 SOURCE_FILE = "linter.sql"
 
@@ -113,6 +121,37 @@ def test_lint_parse_error(linter: core.Linter) -> None:
 
     assert len(linting_result.errors) == 1
 
+    error = next(iter(linting_result.errors))
+
+    assert error.statement is None
+
+    statement_error = error.with_statement(source_code)
+
+    assert statement_error.statement == source_code
+    assert statement_error.with_statement("") is statement_error
+
+
+def test_linter_ignore_noqa(linter: core.Linter) -> None:
+    """Test suppressed violations are reported when noqa directives are ignored."""
+    linter.config.lint.ignore_noqa = True
+
+    try:
+        linting_result = linter.run(
+            source_file=SOURCE_FILE,
+            source_code="SELECT a = NULL; -- noqa: GN024",
+        )
+    finally:
+        linter.config.lint.ignore_noqa = False
+
+    (violation,) = linting_result.violations
+
+    assert violation.rule_code == "GN024"
+    assert violation != violation.rule_code
+    assert repr(violation) == (
+        "Violation(rule_code='GN024', line_number=1, column_offset=10,"
+        f" description={violation.description!r})"
+    )
+
 
 def test_new_line_before_semicolon(
     linter: core.Linter,
@@ -147,6 +186,45 @@ def test_fix_enablement(
     assert linting_result.fixed_source_code == f"SELECT a IS NULL;{noqa.NEW_LINE}"
 
 
+def test_linter_per_file_rules() -> None:
+    """Test rules are selected per source file without reloading the checkers."""
+    config = core.parse_config()
+    config.lint.select = ["GN024"]
+    config.lint.per_file_select = {"*selected.sql": ["CT"]}
+    config.lint.per_file_ignores = {"*ignored.sql": ["GN024"]}
+
+    linter = core.Linter(config=config, formatters=core.load_formatters)
+
+    for rule in core.load_rules(config=config):
+        linter.checkers.add(rule(config=config))
+
+    source_code = (
+        "SELECT a = NULL; ALTER TABLE tbl ADD CONSTRAINT fk FOREIGN KEY (a) "
+        "REFERENCES ref (a) ON UPDATE CASCADE;"
+    )
+
+    assert {
+        violation.rule_code
+        for violation in linter.run(
+            source_file=SOURCE_FILE,
+            source_code=source_code,
+        ).violations
+    } == {"GN024"}
+
+    assert {
+        violation.rule_code
+        for violation in linter.run(
+            source_file="selected.sql",
+            source_code=source_code,
+        ).violations
+    } == {"CT001"}
+
+    assert not linter.run(
+        source_file="ignored.sql",
+        source_code=source_code,
+    ).violations
+
+
 def test_linter_generate_lint_report(
     linter: core.Linter,
     tmp_path: pathlib.Path,
@@ -192,3 +270,357 @@ Total errors: **1**
 """  # noqa: E501
 
     assert report_file.read_text() == expected_lint_report
+
+
+def test_rule_dispatcher_handlers_in_rule_order(linter: core.Linter) -> None:
+    """Test rule dispatcher orders handlers by rule code."""
+    dispatcher = core.linter.RuleDispatcher(linter.checkers)
+
+    for handlers in dispatcher.handlers.values():
+        codes = [handler.__self__.code for handler in handlers]  # type: ignore[attr-defined]
+        assert codes == sorted(codes)
+
+
+def test_rule_dispatcher_matches_individual_checkers(linter: core.Linter) -> None:
+    """Test a single dispatched walk finds the same violations as one walk per checker."""
+    linter.config.lint.fix = False
+    source_code = """CREATE TABLE tbl (id serial PRIMARY KEY, created_at timestamp);
+SELECT * FROM tbl WHERE a = NULL;
+"""
+
+    linting_result = linter.run(source_file=SOURCE_FILE, source_code=source_code)
+
+    expected_violations: set[core.linter.Violation] = set()
+
+    for checker in linter.checkers:
+        checker.violations = set()
+
+    for statement in noqa.extract_statements(source_code=source_code):
+        core.BaseChecker.statement = statement.text
+        core.BaseChecker.root_statement = statement.text
+        core.BaseChecker.statement_location = statement.start_location
+        for checker in linter.checkers:
+            checker.violations = set()
+            checker(parser.parse_sql(statement.text))
+            expected_violations.update(checker.violations)
+
+    assert linting_result.violations == expected_violations
+
+
+def _walk_each_checker(
+    dispatcher: core.linter.RuleDispatcher,
+    node: tuple[ast.RawStmt, ...] | ast.Node,
+) -> object:
+    """Walk the node once per checker, in rule order."""
+    dispatcher.root = node
+    dispatcher.node_types = set()
+
+    for checker in dispatcher.checkers:
+        checker.violations = set()
+        checker(node)
+
+    return node
+
+
+def test_rule_dispatcher_matches_individual_checkers_when_fixing(
+    linter: core.Linter,
+) -> None:
+    """Test dispatched walks find the same violations and fixes as one walk per checker,
+    in rule order, on the rule test cases.
+    """
+    for rule, test_id, test_case in conftest.load_test_cases(
+        test_case_type=conftest.TestCaseType.RULE,
+        directory=pathlib.Path("tests/fixtures/rules"),
+    ):
+        if not isinstance(test_case, dict) or not test_case.get("sql_fail"):
+            continue
+
+        with conftest.update_config(
+            config=linter.config,
+            overrides=test_case.get("config", {}),
+        ):
+            linter.config.lint.fix = True
+
+            lint_result = linter.run(
+                source_file=f"{rule}.sql",
+                source_code=test_case["sql_fail"],
+            )
+
+            with patch.object(
+                core.linter.RuleDispatcher,
+                "__call__",
+                _walk_each_checker,
+            ):
+                expected_lint_result = linter.run(
+                    source_file=f"{rule}.sql",
+                    source_code=test_case["sql_fail"],
+                )
+
+        assert lint_result.violations == expected_lint_result.violations, test_id
+        assert lint_result.fixed_source_code == expected_lint_result.fixed_source_code, (
+            test_id
+        )
+
+
+def test_rule_dispatcher_node_types(linter: core.Linter) -> None:
+    """Test rule dispatcher collects the walked node types and resets violations."""
+    # Set the state shared by the checkers
+    linter.run(source_file=SOURCE_FILE, source_code="SELECT 1;")
+
+    checkers = {checker.code: checker for checker in linter.checkers}
+    dispatcher = core.linter.RuleDispatcher(linter.checkers)
+
+    dispatcher(parser.parse_sql("SELECT a = NULL;"))
+
+    assert checkers["GN024"].violations
+
+    dispatcher(parser.parse_sql("SELECT 1;"))
+
+    assert checkers["US001"].node_types == frozenset({ast.AlterTableCmd})
+    assert ast.AlterTableCmd not in dispatcher.node_types
+    assert ast.SelectStmt in dispatcher.node_types
+    assert not checkers["GN024"].violations
+
+
+def test_linter_violation_location(
+    linter: core.Linter,
+) -> None:
+    """Test violation location is resolved against the source file."""
+    linter.config.lint.fix = False
+    linting_result = linter.run(
+        source_file=SOURCE_FILE,
+        source_code="SELECT 1;\n\nSELECT a\n  FROM tbl WHERE b = NULL;\n",
+    )
+
+    violation = next(
+        violation
+        for violation in linting_result.violations
+        if violation.rule_code == "GN024"
+    )
+
+    expected_line_number = 4
+    expected_column_offset = 20
+
+    assert violation.line_number == expected_line_number
+    assert violation.column_offset == expected_column_offset
+    assert violation.line is None
+
+    violation.fill_line("SELECT 1;\n\nSELECT a\n  FROM tbl WHERE b = NULL;\n")
+
+    assert violation.line == "  FROM tbl WHERE b = NULL;"
+
+
+def test_linter_violations_pickled_compactly(linter: core.Linter) -> None:
+    """Test violations of a rule share its metadata once pickled."""
+    linter.config.lint.fix = False
+    linting_result = linter.run(
+        source_file=SOURCE_FILE,
+        source_code="SELECT a = NULL;\nSELECT b = NULL;\n",
+    )
+
+    unpickled_result = pickle.loads(pickle.dumps(linting_result))  # noqa: S301
+
+    violations = [
+        violation
+        for violation in unpickled_result.violations
+        if violation.rule_code == "GN024"
+    ]
+
+    expected_violations = 2
+
+    assert unpickled_result.violations == linting_result.violations
+    assert len(violations) == expected_violations
+    assert violations[0].rule is violations[1].rule
+    assert violations[0].rule_name == "null-comparison"
+    assert violations[0].description is violations[1].description
+
+
+def test_inline_sql_statements_parsed_once(linter: core.Linter) -> None:
+    """Test identical inline sql statements are deduplicated and parsed once."""
+    source_code = """
+DO $$
+BEGIN
+    UPDATE tbl SET a = NULL WHERE b = NULL;
+    UPDATE tbl SET a = NULL WHERE b = NULL;
+END;
+$$;
+"""
+    parse_trees: dict[str, tuple[ast.RawStmt, ...]] = {}
+
+    first_inline_sql_statements = visitors.extract_nested_inline_sql_statements(
+        node=parser.parse_sql(source_code),
+        raw_stream_factory=linter.formatter.create_raw_stream,
+        parse_trees=parse_trees,
+    )
+    second_inline_sql_statements = visitors.extract_nested_inline_sql_statements(
+        node=parser.parse_sql(source_code),
+        raw_stream_factory=linter.formatter.create_raw_stream,
+        parse_trees=parse_trees,
+    )
+
+    assert len(first_inline_sql_statements) == 1
+    assert len(parse_trees) == 1
+    assert len(
+        visitors.extract_nested_inline_sql_statements(
+            node=parser.parse_sql(source_code),
+            raw_stream_factory=linter.formatter.create_raw_stream,
+        ),
+    ) == len(first_inline_sql_statements)
+    assert (
+        first_inline_sql_statements[0].parse_tree
+        is second_inline_sql_statements[0].parse_tree
+    )
+
+
+def test_linter_profile_rules(linter: core.Linter) -> None:
+    """Test linter profile rules."""
+    linter.profile_rules = True
+    try:
+        first_lint_result = linter.run(
+            source_file=SOURCE_FILE,
+            source_code="SELECT a = NULL, b = NULL;",
+        )
+        second_lint_result = linter.run(
+            source_file=SOURCE_FILE,
+            source_code="SELECT a = NULL;",
+        )
+    finally:
+        linter.profile_rules = False
+
+    assert first_lint_result.rule_profiles is not None
+    assert first_lint_result.rule_profiles["GN024"].violations == 2  # noqa: PLR2004
+
+    rule_profiles = linter.merge_rule_profiles([first_lint_result, second_lint_result])
+
+    assert rule_profiles["GN024"].violations == 3  # noqa: PLR2004
+    assert rule_profiles["GN024"].invocations > 0
+    assert rule_profiles["GN024"].time > 0
+    assert (
+        linter.run(source_file=SOURCE_FILE, source_code="SELECT 1;").rule_profiles is None
+    )
+
+
+def test_linter_profile_rules_fix_time(linter: core.Linter) -> None:
+    """Test the time spent fixing is not counted in the time spent visiting."""
+    linter.profile_rules = True
+    linter.config.lint.fix = True
+    try:
+        # Each reading of the clock advances it by one second
+        with patch.object(
+            time,
+            "perf_counter",
+            side_effect=itertools.count(),
+        ):
+            lint_result = linter.run(
+                source_file=SOURCE_FILE,
+                source_code="SELECT a = NULL;",
+            )
+    finally:
+        linter.profile_rules = False
+        linter.config.lint.fix = False
+
+    assert lint_result.rule_profiles is not None
+
+    rule_profile = lint_result.rule_profiles["GN024"]
+
+    assert rule_profile.invocations == 1
+    assert rule_profile.fix_invocations == 1
+    assert rule_profile.fix_time == 1
+    assert rule_profile.time == 2  # noqa: PLR2004
+
+
+def test_linter_resets_checkers_per_source_file(linter: core.Linter) -> None:
+    """Test state kept across statements does not leak into the next source file."""
+    source_code = "CREATE INDEX idx ON tbl (a);"
+
+    linter.run(source_file=SOURCE_FILE, source_code=source_code)
+    linting_result = linter.run(source_file=SOURCE_FILE, source_code=source_code)
+
+    assert "GN025" not in {violation.rule_code for violation in linting_result.violations}
+
+
+def test_linter_run_stream(linter: core.Linter) -> None:
+    """Test linting a stream finds the same violations as linting the source code."""
+    linter.config.lint.fix = False
+    source_code = """-- pgrubic: noqa: GN001
+SELECT a = NULL;
+
+CREATE TABLE tbl (id bigint); -- noqa: TP017
+
+SELECT b FROM;
+
+SELECT
+    c = NULL;
+"""
+
+    linting_result = linter.run(source_file=SOURCE_FILE, source_code=source_code)
+    streaming_result = linter.run_stream(
+        source_file=SOURCE_FILE,
+        stream=io.StringIO(source_code),
+        chunk_size=8,
+    )
+
+    assert streaming_result.violations == linting_result.violations
+    assert streaming_result.errors == {
+        error.with_statement(source_code) for error in linting_result.errors
+    }
+    assert {violation.line_number for violation in streaming_result.violations} >= {2, 9}
+    assert streaming_result.fixed_source_code is None
+
+
+def test_linter_with_statement_cache(tmp_path: pathlib.Path) -> None:
+    """Test linting with the statement cache finds the same violations, including those
+    of rules keeping state across statements and with file-level noqa directives.
+    """
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+    config.lint.fix = False
+
+    rules = core.load_rules(config=config)
+
+    linter = core.Linter(config=config, formatters=core.load_formatters)
+    cached_linter = core.Linter(
+        config=config,
+        formatters=core.load_formatters,
+        statement_cache=core.cache.StatementCache(
+            config=config,
+            name="linter",
+            config_digest=core.cache.lint_config_digest(config),
+        ),
+    )
+
+    for rule in rules:
+        linter.checkers.add(rule(config=config))
+        cached_linter.checkers.add(rule(config=config))
+
+    rule_codes: list[set[str]] = []
+
+    for source_code in (
+        "CREATE INDEX idx ON tbl (a);\nSELECT a = NULL;\n",
+        "CREATE INDEX idx ON tbl (a);\nCREATE INDEX idx ON tbl (a);\nSELECT a = NULL;\n",
+        "-- pgrubic: noqa: GN024\nSELECT 1;\nSELECT a = NULL;\n",
+        "SELECT 1; SELECT a = NULL;\nDO $$ BEGIN UPDATE tbl SET a = NULL; END $$;\n",
+    ):
+        linting_result = linter.run(source_file=SOURCE_FILE, source_code=source_code)
+        cached_linting_result = cached_linter.run(
+            source_file=SOURCE_FILE,
+            source_code=source_code,
+        )
+
+        assert cached_linting_result.violations == linting_result.violations
+
+        # Served from the statement cache
+        cached_linting_result = cached_linter.run(
+            source_file=SOURCE_FILE,
+            source_code=source_code,
+        )
+
+        assert cached_linting_result.violations == linting_result.violations
+
+        rule_codes.append(
+            {violation.rule_code for violation in cached_linting_result.violations},
+        )
+
+    assert "GN025" not in rule_codes[0]
+    assert "GN025" in rule_codes[1]
+    assert "GN024" not in rule_codes[2]
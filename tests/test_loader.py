@@ -1,6 +1,14 @@
 """Test loader."""
 
-from pgrubic import core
+import importlib
+import importlib.metadata
+from collections import abc
+from unittest.mock import patch
+
+import pytest
+
+from pgrubic import MANIFEST_FILE, RULE_PACKS_ENTRY_POINT_GROUP, core, manifest
+from pgrubic.core import errors, loader
 
 
 def test_load_rules(linter: core.Linter) -> None:
@@ -16,3 +24,132 @@ def test_load_rules(linter: core.Linter) -> None:
 
     assert len(active_rules) == expected_active_rules
     assert len(all_rules) == expected_total_rules
+
+
+def test_manifest_up_to_date() -> None:
+    """Test the manifest lists the rules and formatters of the package."""
+    assert MANIFEST_FILE.read_text(encoding="utf-8") == loader.generate_manifest(), (
+        "Manifest is out of date, run `python tools/manifest_generator.py`"
+    )
+
+
+def test_load_rules_imports_selected_rules() -> None:
+    """Test only the modules of the selected rules are imported."""
+    config = core.parse_config()
+    config.lint.select = ["US"]
+    config.lint.ignore = ["US001"]
+
+    with patch.object(
+        importlib,
+        "import_module",
+        wraps=importlib.import_module,
+    ) as import_module:
+        rules = core.load_rules(config=config)
+
+    assert rules
+    assert {rule.code for rule in rules} == {
+        code
+        for code, (_, _, _, deprecated) in manifest.RULES.items()
+        if code.startswith("US") and code != "US001" and not deprecated
+    }
+    assert {call.args[0] for call in import_module.call_args_list} == {
+        rule.__module__ for rule in rules
+    }
+
+
+def test_load_formatters() -> None:
+    """Test loading formatters."""
+    formatters = core.load_formatters()
+
+    assert len(formatters) == sum(len(names) for names in manifest.FORMATTERS.values())
+
+
+@pytest.fixture
+def rule_packs() -> abc.Iterator[list[importlib.metadata.EntryPoint]]:
+    """Register rule packs."""
+    entry_points: list[importlib.metadata.EntryPoint] = [
+        importlib.metadata.EntryPoint(
+            name="tests",
+            value="tests.rule_pack.manifest",
+            group=RULE_PACKS_ENTRY_POINT_GROUP,
+        ),
+    ]
+
+    loader.load_rule_packs.cache_clear()
+
+    with patch.object(importlib.metadata, "entry_points", return_value=entry_points):
+        yield entry_points
+
+    loader.load_rule_packs.cache_clear()
+
+
+@pytest.mark.usefixtures("rule_packs")
+def test_load_rule_packs() -> None:
+    """Test the rules of rule packs are loaded when selected."""
+    (rule_pack,) = loader.load_rule_packs()
+
+    assert rule_pack.name == "tests"
+    assert rule_pack.rules["XP001"].category == "table"
+
+    config = core.parse_config()
+
+    assert "XP001" in {rule.code for rule in core.load_rules(config=config)}
+
+    config.lint.select = ["GN"]
+
+    with patch.object(
+        importlib,
+        "import_module",
+        wraps=importlib.import_module,
+    ) as import_module:
+        core.load_rules(config=config)
+
+    assert "tests.rule_pack.table.XP001" not in {
+        call.args[0] for call in import_module.call_args_list
+    }
+
+
+@pytest.mark.usefixtures("rule_packs")
+def test_rule_pack_lint() -> None:
+    """Test the rules of rule packs lint along the built-in rules."""
+    config = core.parse_config()
+
+    linter = core.Linter(config=config, formatters=core.load_formatters)
+
+    for rule in core.load_rules(config=config):
+        linter.checkers.add(rule(config=config))
+
+    lint_result = linter.run(source_file="test.sql", source_code="TRUNCATE tbl;")
+
+    (violation,) = (
+        violation
+        for violation in lint_result.violations
+        if violation.rule_code.startswith("XP")
+    )
+
+    assert violation.rule_code == "XP001"
+    assert violation.rule_category == "table"
+    assert violation.rule_name == "truncate-table"
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [
+        ("tests.rule_pack.missing", "cannot be loaded"),
+        ("pgrubic.manifest", "redefines the rules CT001, CT002"),
+    ],
+)
+def test_rule_pack_error(
+    rule_packs: list[importlib.metadata.EntryPoint],
+    value: str,
+    message: str,
+) -> None:
+    """Test rule packs that cannot be loaded or redefine rules."""
+    rule_packs[0] = importlib.metadata.EntryPoint(
+        name="tests",
+        value=value,
+        group=RULE_PACKS_ENTRY_POINT_GROUP,
+    )
+
+    with pytest.raises(errors.RulePackError, match=message):
+        loader.load_rule_packs()
@@ -0,0 +1,592 @@
+"""Test language server."""
+
+import io
+import json
+import typing
+import pathlib
+from unittest.mock import patch
+
+import pytest
+
+from pgrubic import core
+from pgrubic.core import lsp, noqa
+
+URI: typing.Final[str] = "file:///tmp/test.sql"
+
+
+def _frame(message: dict[str, typing.Any]) -> bytes:
+    """Frame a message with its header."""
+    body = json.dumps({"jsonrpc": "2.0", **message}).encode("utf-8")
+    return b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+
+
+def _messages(output: bytes) -> list[dict[str, typing.Any]]:
+    """Read the messages written by the server."""
+    reader = io.BytesIO(output)
+    server = lsp.LanguageServer(
+        config=core.parse_config(),
+        reader=reader,
+        writer=io.BytesIO(),
+    )
+
+    messages = []
+
+    while (message := server.read_message()) is not None:
+        messages.append(message)
+
+    return messages
+
+
+def _initialize(*, position_encodings: list[str] | None = None) -> list[bytes]:
+    """Frame the initialize request and initialized notification."""
+    return [
+        _frame(
+            {
+                "id": 0,
+                "method": "initialize",
+                "params": {
+                    "capabilities": {
+                        "general": {"positionEncodings": position_encodings or []},
+                    },
+                },
+            },
+        ),
+        _frame({"method": "initialized", "params": {}}),
+    ]
+
+
+def _did_open(text: str, *, uri: str = URI) -> bytes:
+    """Frame the didOpen notification of a document."""
+    return _frame(
+        {
+            "method": "textDocument/didOpen",
+            "params": {
+                "textDocument": {
+                    "uri": uri,
+                    "languageId": "sql",
+                    "version": 1,
+                    "text": text,
+                },
+            },
+        },
+    )
+
+
+def _did_change(uri: str, *changes: dict[str, typing.Any]) -> bytes:
+    """Frame the didChange notification of a document."""
+    return _frame(
+        {
+            "method": "textDocument/didChange",
+            "params": {"textDocument": {"uri": uri}, "contentChanges": list(changes)},
+        },
+    )
+
+
+def _range_formatting(
+    request_id: int,
+    *,
+    start: dict[str, int],
+    end: dict[str, int],
+) -> bytes:
+    """Frame the rangeFormatting request of a range of the document."""
+    return _frame(
+        {
+            "id": request_id,
+            "method": "textDocument/rangeFormatting",
+            "params": {
+                "textDocument": {"uri": URI},
+                "range": {"start": start, "end": end},
+                "options": {},
+            },
+        },
+    )
+
+
+def _responses(messages: list[dict[str, typing.Any]]) -> dict[int, typing.Any]:
+    """Get the results of the responses by request id."""
+    return {
+        message["id"]: message["result"] for message in messages if "result" in message
+    }
+
+
+def _serve(*requests: bytes) -> tuple[int, list[dict[str, typing.Any]]]:
+    """Serve requests, returning the exit code and the written messages."""
+    writer = io.BytesIO()
+    server = lsp.LanguageServer(
+        config=core.parse_config(),
+        reader=io.BytesIO(b"".join(requests)),
+        writer=writer,
+    )
+
+    exit_code = server.serve()
+
+    return exit_code, _messages(writer.getvalue())
+
+
+def _diagnostics(
+    messages: list[dict[str, typing.Any]],
+) -> list[list[dict[str, typing.Any]]]:
+    """Get the published diagnostics."""
+    return [
+        message["params"]["diagnostics"]
+        for message in messages
+        if message.get("method") == "textDocument/publishDiagnostics"
+    ]
+
+
+def test_lsp_initialize_and_exit() -> None:
+    """Test initialize, shutdown and exit."""
+    exit_code, messages = _serve(
+        *_initialize(),
+        _frame({"id": 1, "method": "shutdown"}),
+        _frame({"method": "exit"}),
+    )
+
+    assert exit_code == 0
+    assert messages[0]["id"] == 0
+    assert messages[0]["result"]["capabilities"]["positionEncoding"] == "utf-16"
+    assert messages[0]["result"]["serverInfo"]["name"] == "pgrubic"
+    assert messages[1] == {"jsonrpc": "2.0", "id": 1, "result": None}
+
+
+def test_lsp_exit_without_shutdown() -> None:
+    """Test exit without shutdown and requests before initialize."""
+    exit_code, messages = _serve(
+        _frame({"id": 1, "method": "textDocument/formatting", "params": {}}),
+        *_initialize(),
+        _frame({"id": 2, "method": "unknown/method", "params": {}}),
+    )
+
+    assert exit_code == 1
+    assert messages[0]["error"]["code"] == lsp.ErrorCode.SERVER_NOT_INITIALIZED
+    assert messages[2]["error"]["code"] == lsp.ErrorCode.METHOD_NOT_FOUND
+
+
+def test_lsp_diagnostics() -> None:
+    """Test diagnostics of violations, errors and unused noqa directives."""
+    _, messages = _serve(
+        *_initialize(),
+        _did_open(
+            "SELECT a = NULL;\nSELECT * FROM;\nSELECT 1; -- noqa: GN024\n",
+        ),
+    )
+
+    (diagnostics,) = _diagnostics(messages)
+
+    violation, error, unused_noqa = diagnostics
+
+    assert violation["code"] == "GN024"
+    assert violation["range"] == {
+        "start": {"line": 0, "character": 9},
+        "end": {"line": 0, "character": 16},
+    }
+    assert violation["severity"] == lsp.DiagnosticSeverity.WARNING
+    assert violation["data"] == {"fixable": True}
+    assert violation["codeDescription"]["href"].endswith("/general/null-comparison")
+
+    assert error["severity"] == lsp.DiagnosticSeverity.ERROR
+    assert error["range"]["start"] == {"line": 1, "character": 0}
+
+    assert unused_noqa["tags"] == [lsp.DIAGNOSTIC_TAG_UNNECESSARY]
+    assert unused_noqa["range"]["start"]["line"] == 2  # noqa: PLR2004
+
+
+def test_lsp_incremental_change() -> None:
+    """Test an incremental change only lints the changed statement again."""
+    statements = [f"SELECT a{index} = NULL;" for index in range(5)]
+
+    with patch.object(
+        core.Linter,
+        "_lint_statement",
+        autospec=True,
+        side_effect=core.Linter._lint_statement,  # noqa: SLF001
+    ) as lint_statement:
+        _, messages = _serve(
+            *_initialize(),
+            _did_open(noqa.NEW_LINE.join(statements)),
+            _frame(
+                {
+                    "method": "textDocument/didChange",
+                    "params": {
+                        "textDocument": {"uri": URI, "version": 2},
+                        "contentChanges": [
+                            {
+                                "range": {
+                                    "start": {"line": 2, "character": 12},
+                                    "end": {"line": 2, "character": 16},
+                                },
+                                "text": "1",
+                            },
+                        ],
+                    },
+                },
+            ),
+        )
+
+    assert lint_statement.call_count == len(statements) + 1
+
+    first_diagnostics, second_diagnostics = _diagnostics(messages)
+
+    assert len(first_diagnostics) == len(statements)
+    assert [
+        diagnostic["range"]["start"]["line"] for diagnostic in second_diagnostics
+    ] == [
+        0,
+        1,
+        3,
+        4,
+    ]
+
+
+def test_lsp_diagnostics_scan_error() -> None:
+    """Test a document that cannot be tokenized has a single error diagnostic."""
+    _, messages = _serve(
+        *_initialize(),
+        _did_open("SELECT 1;\nSELECT 'a"),
+    )
+
+    ((diagnostic,),) = _diagnostics(messages)
+
+    assert diagnostic["severity"] == lsp.DiagnosticSeverity.ERROR
+    assert diagnostic["message"].startswith("unterminated quoted string")
+    assert diagnostic["range"]["start"]["line"] == 1
+
+
+@pytest.mark.parametrize(
+    ("position_encoding", "character"),
+    [("utf-16", 15), ("utf-32", 14)],
+)
+def test_lsp_position_encoding(position_encoding: str, character: int) -> None:
+    """Test positions are counted in the negotiated encoding."""
+    _, messages = _serve(
+        *_initialize(position_encodings=[position_encoding]),
+        _did_open("SELECT '\U0001f418', a = NULL;"),
+    )
+
+    (diagnostics,) = _diagnostics(messages)
+
+    assert diagnostics[0]["range"]["start"] == {"line": 0, "character": character}
+
+
+def test_lsp_formatting() -> None:
+    """Test document and range formatting."""
+    source_code = "select 1;\n\n-- comment\nselect   2;\nselect 3;\n"
+
+    _, messages = _serve(
+        *_initialize(),
+        _did_open(source_code),
+        _frame(
+            {
+                "id": 1,
+                "method": "textDocument/formatting",
+                "params": {"textDocument": {"uri": URI}, "options": {}},
+            },
+        ),
+        _frame(
+            {
+                "id": 2,
+                "method": "textDocument/rangeFormatting",
+                "params": {
+                    "textDocument": {"uri": URI},
+                    "range": {
+                        "start": {"line": 3, "character": 0},
+                        "end": {"line": 3, "character": 3},
+                    },
+                    "options": {},
+                },
+            },
+        ),
+    )
+
+    responses = {
+        message["id"]: message["result"] for message in messages if "id" in message
+    }
+
+    formatted_source_code = core.Formatter(
+        config=core.parse_config(),
+        formatters=core.load_formatters,
+    ).format(source_file=URI, source_code=source_code)
+
+    assert responses[1] == [
+        {
+            "range": {
+                "start": {"line": 0, "character": 0},
+                "end": {"line": 5, "character": 0},
+            },
+            "newText": formatted_source_code.formatted_source_code,
+        },
+    ]
+    assert responses[2] == [
+        {
+            "range": {
+                "start": {"line": 2, "character": 0},
+                "end": {"line": 3, "character": 11},
+            },
+            "newText": "-- comment\nSELECT 2;",
+        },
+    ]
+
+
+def test_lsp_code_actions() -> None:
+    """Test fixes of auto-fixable violations are offered as code actions."""
+    _, messages = _serve(
+        *_initialize(),
+        _did_open("SELECT a = NULL;\n"),
+    )
+
+    (diagnostics,) = _diagnostics(messages)
+
+    _, messages = _serve(
+        *_initialize(),
+        _did_open("SELECT a = NULL;\n"),
+        _frame(
+            {
+                "id": 1,
+                "method": "textDocument/codeAction",
+                "params": {
+                    "textDocument": {"uri": URI},
+                    "range": diagnostics[0]["range"],
+                    "context": {"diagnostics": diagnostics},
+                },
+            },
+        ),
+        _frame(
+            {
+                "id": 2,
+                "method": "textDocument/codeAction",
+                "params": {
+                    "textDocument": {"uri": URI},
+                    "range": diagnostics[0]["range"],
+                    "context": {"diagnostics": [], "only": ["source.fixAll"]},
+                },
+            },
+        ),
+    )
+
+    responses = {
+        message["id"]: message["result"] for message in messages if "id" in message
+    }
+
+    quick_fix, fix_all = responses[1]
+
+    assert quick_fix["kind"] == lsp.CODE_ACTION_KIND_QUICK_FIX
+    assert quick_fix["title"] == "Fix GN024 (null-comparison)"
+    assert quick_fix["edit"]["changes"][URI][0]["newText"] == "SELECT a IS NULL;\n"
+    assert fix_all["kind"] == lsp.CODE_ACTION_KIND_SOURCE_FIX_ALL
+
+    assert responses[2] == [fix_all]
+
+
+def test_lsp_did_close(tmp_path: pathlib.Path) -> None:
+    """Test closing a document clears its diagnostics and statement tables."""
+    uri = (tmp_path / "test.sql").as_uri()
+
+    writer = io.BytesIO()
+    server = lsp.LanguageServer(
+        config=core.parse_config(),
+        reader=io.BytesIO(),
+        writer=writer,
+    )
+
+    server.handle({"id": 0, "method": "initialize", "params": {}})
+    server.handle(
+        {
+            "method": "textDocument/didOpen",
+            "params": {
+                "textDocument": {"uri": uri, "version": 1, "text": "SELECT 1;"},
+            },
+        },
+    )
+
+    assert server.lint_statement_cache.tables.keys() == {str(tmp_path / "test.sql")}
+
+    server.handle(
+        {"method": "textDocument/didClose", "params": {"textDocument": {"uri": uri}}},
+    )
+
+    assert not server.documents
+    assert not server.lint_statement_cache.tables
+    assert _diagnostics(_messages(writer.getvalue()))[-1] == []
+
+
+def test_lsp_changes() -> None:
+    """Test incremental changes with positions out of range and full changes of a
+    document of another scheme than file.
+    """
+    uri = "untitled:Untitled-1"
+
+    _, messages = _serve(
+        *_initialize(position_encodings=["utf-32"]),
+        _did_open("SELECT 1;", uri=uri),
+        _did_change(
+            uri,
+            {
+                "range": {
+                    "start": {"line": 0, "character": 7},
+                    "end": {"line": 9, "character": 0},
+                },
+                "text": "a = NULL;",
+            },
+        ),
+        _did_change(uri, {"text": "SELECT 2;"}),
+    )
+
+    assert [len(diagnostics) for diagnostics in _diagnostics(messages)] == [0, 1, 0]
+    assert lsp.uri_to_path(uri) == uri
+
+
+def test_lsp_messages_without_method_or_content_length() -> None:
+    """Test responses from the client are ignored and a message without content length
+    ends the input.
+    """
+    exit_code, messages = _serve(
+        *_initialize(),
+        _frame({"id": 1, "result": None}),
+        b"Content-Type: application/json\r\n\r\n{}",
+        _frame({"id": 2, "method": "shutdown"}),
+    )
+
+    assert exit_code == 1
+    assert [message["id"] for message in messages] == [0]
+
+
+def test_lsp_handler_error() -> None:
+    """Test failing requests are answered with an internal error, failing notifications
+    are only logged.
+    """
+    _, messages = _serve(
+        *_initialize(),
+        _did_change(URI, {"text": "SELECT 1;"}),
+        _frame(
+            {
+                "id": 1,
+                "method": "textDocument/formatting",
+                "params": {"textDocument": {"uri": URI}, "options": {}},
+            },
+        ),
+    )
+
+    assert len(messages) == 2  # noqa: PLR2004
+    assert messages[1]["id"] == 1
+    assert messages[1]["error"] == {
+        "code": lsp.ErrorCode.INTERNAL_ERROR,
+        "message": repr(URI),
+    }
+
+
+def test_lsp_formatting_without_edits() -> None:
+    """Test formatting of formatted documents and ranges without statements gives no
+    edits.
+    """
+    _, messages = _serve(
+        *_initialize(),
+        _did_open("SELECT 1;\n"),
+        _frame(
+            {
+                "id": 1,
+                "method": "textDocument/formatting",
+                "params": {"textDocument": {"uri": URI}, "options": {}},
+            },
+        ),
+        _range_formatting(
+            2,
+            start={"line": 0, "character": 0},
+            end={"line": 0, "character": 3},
+        ),
+        _range_formatting(
+            3,
+            start={"line": 1, "character": 0},
+            end={"line": 1, "character": 0},
+        ),
+    )
+
+    assert _responses(messages) == {0: messages[0]["result"], 1: [], 2: [], 3: []}
+
+
+def test_lsp_range_formatting_skipped_file() -> None:
+    """Test range formatting of a file skipped by the formatter gives no edits."""
+    _, messages = _serve(
+        *_initialize(),
+        _did_open("-- pgrubic: fmt: skip\nselect   1;\n"),
+        _range_formatting(
+            1,
+            start={"line": 1, "character": 0},
+            end={"line": 1, "character": 3},
+        ),
+    )
+
+    assert _responses(messages)[1] == []
+
+
+def test_lsp_range_formatting_copy_data() -> None:
+    """Test range formatting of a COPY FROM stdin statement keeps its data."""
+    _, messages = _serve(
+        *_initialize(),
+        _did_open("copy t from stdin;\n1\n\\.\n"),
+        _range_formatting(
+            1,
+            start={"line": 0, "character": 0},
+            end={"line": 0, "character": 3},
+        ),
+    )
+
+    (edit,) = _responses(messages)[1]
+
+    assert edit["range"]["end"] == {"line": 2, "character": 2}
+    assert edit["newText"].startswith("COPY t FROM STDIN;\n1\n\\.")
+
+
+def test_lsp_code_action_without_fix() -> None:
+    """Test no code action is offered for diagnostics whose violation is gone."""
+    _, messages = _serve(
+        *_initialize(),
+        _did_open("SELECT a IS NULL;\n"),
+        _frame(
+            {
+                "id": 1,
+                "method": "textDocument/codeAction",
+                "params": {
+                    "textDocument": {"uri": URI},
+                    "context": {
+                        "diagnostics": [
+                            {
+                                "source": "pgrubic",
+                                "code": "GN024",
+                                "data": {"fixable": True},
+                            },
+                        ],
+                    },
+                },
+            },
+        ),
+    )
+
+    assert _responses(messages)[1] == []
+
+
+def test_lsp_serve() -> None:
+    """Test serving a client over stdio."""
+    stdin = io.TextIOWrapper(
+        io.BytesIO(
+            b"".join(
+                [
+                    *_initialize(),
+                    _frame({"id": 1, "method": "shutdown"}),
+                    _frame({"method": "exit"}),
+                ],
+            ),
+        ),
+    )
+    stdout = io.TextIOWrapper(io.BytesIO())
+
+    with (
+        patch("sys.stdin", stdin),
+        patch("sys.stdout", stdout),
+    ):
+        exit_code = lsp.serve(core.parse_config())
+
+    assert exit_code == 0
+    assert [message["id"] for message in _messages(stdout.buffer.getvalue())] == [
+        0,
+        1,
+    ]
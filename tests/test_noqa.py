@@ -1,8 +1,12 @@
 """Test noqa."""
 
+import io
 import typing
 import pathlib
+from unittest.mock import patch
 
+import pytest
+from pglast import parser
 from colorama import Fore, Style
 
 from tests import TEST_FILE
@@ -179,3 +183,341 @@ CREATE TABLE tbl (
     extracted_statements = noqa.extract_statements(source_code=source_code)
 
     assert extracted_statements[0].text == expected_statement
+
+
+def test_line_index() -> None:
+    """Test line index locations."""
+    source_code: str = "SELECT 1;\n\n  SELECT a = NULL"
+
+    line_index = noqa.LineIndex(source_code)
+
+    expected_line_number = 3
+    expected_column_offset = 3
+
+    assert line_index.line_number(0) == 1
+    assert line_index.line_number(source_code.index("\n")) == 1
+    assert line_index.line(10) == ""
+    assert line_index.line_number(source_code.index("SELECT a")) == expected_line_number
+    assert line_index.column_offset(source_code.index("SELECT a")) == (
+        expected_column_offset
+    )
+    assert line_index.line(source_code.index("NULL")) == "  SELECT a = NULL"
+
+
+def test_line_index_with_start_location() -> None:
+    """Test line index of a chunk of a larger source code."""
+    source_code: str = "SELECT 1;\n\n  SELECT a = NULL"
+    chunk_start = source_code.index("\n") + 1
+
+    line_index = noqa.LineIndex(
+        source_code[chunk_start:],
+        start_location=chunk_start,
+        start_line_number=2,
+    )
+
+    expected_line_number = 3
+    expected_column_offset = 3
+
+    assert line_index.line_number(source_code.index("SELECT a")) == expected_line_number
+    assert line_index.column_offset(source_code.index("SELECT a")) == (
+        expected_column_offset
+    )
+    assert line_index.line(source_code.index("NULL")) == "  SELECT a = NULL"
+
+
+def test_read_source_chunks() -> None:
+    """Test chunks hold complete statements, located within the whole source code."""
+    source_code: str = """SELECT 'a;
+b';
+CREATE FUNCTION f() RETURNS int LANGUAGE sql
+BEGIN ATOMIC SELECT CASE WHEN true THEN 1 END; SELECT 2; END;
+CREATE RULE r AS ON INSERT TO tbl DO (SELECT 1; SELECT 2);
+/* a; comment */ SELECT $$;$$;
+SELECT 1"""
+
+    chunks = list(noqa.read_source_chunks(io.StringIO(source_code), chunk_size=3))
+
+    statements: list[noqa.Statement] = []
+
+    for chunk in chunks:
+        assert source_code[chunk.start_location :].startswith(chunk.text)
+        assert chunk.start_line_number == (
+            source_code[: chunk.start_location].count(noqa.NEW_LINE) + 1
+        )
+
+        statements.extend(
+            noqa.SourceDocument(
+                source_file=TEST_FILE,
+                source_code=chunk.text,
+                start_location=chunk.start_location,
+                start_line_number=chunk.start_line_number,
+            ).statements,
+        )
+
+    assert len(chunks) > 1
+    assert "".join(chunk.text for chunk in chunks) == source_code
+    assert statements == noqa.extract_statements(source_code=source_code)
+
+
+def test_extract_statements_copy_from_stdin() -> None:
+    """Test data rows of COPY FROM stdin statements are attached to their statement."""
+    copy_data = "1\tit's; a 'row\n2\t/* not a comment\n\\."
+    source_code: str = f"""CREATE TABLE tbl (a int, b text);
+COPY tbl (a, b) FROM stdin;
+{copy_data}
+
+SELECT 1;
+"""
+
+    document = noqa.SourceDocument(source_file=TEST_FILE, source_code=source_code)
+
+    assert [statement.text for statement in document.statements] == [
+        "CREATE TABLE tbl (a int, b text);",
+        "COPY tbl (a, b) FROM stdin;",
+        "\nSELECT 1;",
+    ]
+    assert [statement.copy_data for statement in document.statements] == [
+        "",
+        copy_data,
+        "",
+    ]
+    assert document.statements[-1].start_location == source_code.index("\nSELECT")
+    assert [token.name for token in document.tokens][-3:] == [
+        "SELECT",
+        "ICONST",
+        noqa.ASCII_SEMI_COLON,
+    ]
+    assert document.tokens[-1].start == source_code.rindex(noqa.SEMI_COLON)
+
+
+def test_read_source_chunks_skips_copy_data() -> None:
+    """Test data rows of COPY FROM stdin statements are skipped when streaming."""
+    source_code: str = """COPY tbl (a, b) FROM stdin;
+1\tit's; a 'row
+2\t/* not a comment
+\\.
+SELECT 1;
+"""
+
+    chunks = list(noqa.read_source_chunks(io.StringIO(source_code), chunk_size=4))
+
+    assert [chunk.text for chunk in chunks] == [
+        "COPY tbl (a, b) FROM stdin;\n",
+        "SELECT 1;\n",
+    ]
+    assert chunks[-1].start_location == source_code.index("SELECT")
+    assert chunks[-1].start_line_number == 5  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        "/*\nCOPY t FROM stdin;\n*/\nSELECT 1;\n",
+        "SELECT $$\nCOPY t FROM stdin;\n$$;\nSELECT 1;\n",
+        "SELECT '\nCOPY t FROM stdin;\n';\nSELECT 1;\n",
+        "/*\nCOPY t FROM stdin;\n*/\nCOPY tbl FROM stdin;\n1\n\\.\nSELECT 1;\n",
+    ],
+)
+def test_read_source_chunks_skips_commented_copy(source_code: str) -> None:
+    """Test COPY FROM stdin lines in comments or strings do not end a chunk."""
+    chunks = list(noqa.read_source_chunks(io.StringIO(source_code), chunk_size=4))
+
+    statements: list[noqa.Statement] = []
+
+    for chunk in chunks:
+        statements.extend(
+            noqa.SourceDocument(
+                source_file=TEST_FILE,
+                source_code=chunk.text,
+                start_location=chunk.start_location,
+                start_line_number=chunk.start_line_number,
+            ).statements,
+        )
+
+    assert [statement.text.strip() for statement in statements] == [
+        statement.text.strip()
+        for statement in noqa.extract_statements(source_code=source_code)
+    ]
+    assert statements[-1].text.endswith("SELECT 1;")
+
+
+def test_extract_statements_matches_tokenized_statements() -> None:
+    """Test statements split by libpg_query keep the tokenized boundaries."""
+    source_code: str = """-- table
+CREATE TABLE tbl (activated date) -- trailing
+;;
+CREATE FUNCTION f() RETURNS int LANGUAGE sql BEGIN ATOMIC SELECT 1; SELECT 2; END;
+SELECT 'a;b' /* unterminated */
+-- end
+"""
+
+    extracted_statements = noqa.extract_statements(source_code=source_code)
+
+    assert [statement.text for statement in extracted_statements] == [
+        "-- table\nCREATE TABLE tbl (activated date) -- trailing\n;",
+        "",
+        "CREATE FUNCTION f() RETURNS int LANGUAGE sql BEGIN ATOMIC SELECT 1; SELECT 2;"
+        " END;",
+        "SELECT 'a;b' /* unterminated */\n-- end",
+    ]
+
+
+def test_extract_statements_with_invalid_statement() -> None:
+    """Test statements are still extracted when a statement is invalid."""
+    source_code: str = "SELECT 1;\nSELECT b FROM;\nSELECT 2;"
+
+    extracted_statements = noqa.extract_statements(source_code=source_code)
+
+    assert [statement.text for statement in extracted_statements] == [
+        "SELECT 1;",
+        "SELECT b FROM;",
+        "SELECT 2;",
+    ]
+
+
+def test_extract_statements_falls_back_to_tokens() -> None:
+    """Test statements are extracted from the tokens when libpg_query cannot split the
+    source code, keeping blocks and parentheses whole.
+    """
+    source_code: str = """CREATE FUNCTION f() RETURNS int LANGUAGE sql
+BEGIN ATOMIC SELECT 1; SELECT 2; END;
+SELEC (1;
+2);
+SELECT 3;"""
+
+    extracted_statements = noqa.extract_statements(source_code=source_code)
+
+    assert [statement.text for statement in extracted_statements] == [
+        "CREATE FUNCTION f() RETURNS int LANGUAGE sql\n"
+        "BEGIN ATOMIC SELECT 1; SELECT 2; END;",
+        "SELEC (1;\n2);",
+        "SELECT 3;",
+    ]
+
+    (comment,) = noqa.extract_statements(source_code="-- only a comment\n")
+
+    assert comment.text == "-- only a comment"
+
+
+def test_read_source_chunks_chunk_ending_inside_comment() -> None:
+    """Test semi-colons of a comment cut by the end of what has been read do not end a
+    chunk.
+    """
+    source_code: str = "SELECT 1;\n/* a;\nb; */\nSELECT 2;\n"
+
+    chunks = list(noqa.read_source_chunks(io.StringIO(source_code), chunk_size=12))
+
+    assert [chunk.text for chunk in chunks] == [
+        "SELECT 1;\n",
+        "/* a;\nb; */\nSELECT 2;\n",
+    ]
+
+
+def test_scan_complete_tokens_without_error_location() -> None:
+    """Test nothing is scanned when the scan fails without a location."""
+    with patch("pglast.parser.scan", side_effect=parser.ParseError("error")):
+        assert noqa._scan_complete_tokens("SELECT 1;") == []  # noqa: SLF001
+
+
+def test_format_skip_and_comments_without_tokens() -> None:
+    """Test format skip and comments of a statement are found from its text when its
+    tokens are not given.
+    """
+    source_code: str = "SELECT 1;\n-- fmt: skip\nSELECT   2;\n"
+
+    first, second = noqa.extract_statements(source_code=source_code)
+
+    assert not noqa.check_statement_format_skip(
+        source_code=source_code,
+        statement=first,
+    )
+    assert noqa.check_statement_format_skip(source_code=source_code, statement=second)
+    assert [comment.text for comment in noqa.extract_comments(statement=second)] == [
+        "-- fmt: skip",
+    ]
+
+
+def test_extract_statements_transaction_block() -> None:
+    """Test transaction blocks are split into their statements."""
+    source_code: str = "BEGIN;\nSELECT 1;\nCOMMIT;"
+
+    extracted_statements = noqa.extract_statements(source_code=source_code)
+
+    assert [statement.text for statement in extracted_statements] == [
+        "BEGIN;",
+        "SELECT 1;",
+        "COMMIT;",
+    ]
+
+
+def test_source_document() -> None:
+    """Test source document statements, comments and directives."""
+    source_code: str = """-- pgrubic: noqa: GN001
+SELECT 1;
+-- fmt: skip
+SELECT   2;
+/* comment */
+SELECT 3 -- noqa: GN024
+;
+"""
+
+    document = noqa.SourceDocument(source_file=TEST_FILE, source_code=source_code)
+
+    expected_number_of_statements = 3
+
+    assert len(document.statements) == expected_number_of_statements
+    assert [ignore.rule for ignore in document.file_lint_ignores] == ["GN001"]
+    assert not document.is_file_format_skip
+
+    first, second, third = document.statements
+
+    assert not document.is_statement_format_skip(first)
+    assert document.is_statement_format_skip(second)
+    assert [comment.text for comment in document.statement_comments(third)] == [
+        "/* comment */",
+        "-- noqa: GN024",
+    ]
+    assert document.statement_lint_ignores(first) == []
+    assert [ignore.rule for ignore in document.statement_lint_ignores(third)] == [
+        "GN024",
+    ]
+
+
+def test_suppression_index() -> None:
+    """Test suppression index lookups and unused directive tracking."""
+    statement_location = 10
+
+    file_directive = noqa.NoQaDirective(
+        source_file=TEST_FILE,
+        location=0,
+        line_number=1,
+        column_offset=1,
+        rule="GN001",
+    )
+    statement_directive = noqa.NoQaDirective(
+        location=statement_location,
+        line_number=2,
+        column_offset=1,
+        rule="GN024",
+    )
+    unused_directive = noqa.NoQaDirective(
+        location=statement_location,
+        line_number=2,
+        column_offset=1,
+        rule="NM016",
+    )
+
+    suppressions = noqa.SuppressionIndex()
+    suppressions.add([file_directive, statement_directive, unused_directive])
+
+    assert suppressions.is_suppressed(location=0, rule="GN001")
+    assert not suppressions.is_suppressed(location=0, rule="GN024")
+    assert not file_directive.used
+
+    assert suppressions.suppress(location=statement_location, rule="GN001")
+    assert suppressions.suppress(location=statement_location, rule="GN024")
+    assert not suppressions.suppress(location=statement_location, rule="GN002")
+
+    assert file_directive.used
+    assert statement_directive.used
+    assert not unused_directive.used
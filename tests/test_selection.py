@@ -0,0 +1,68 @@
+"""Test rule selection."""
+
+import pathlib
+
+from pgrubic import core
+from pgrubic.core import selection
+
+CODES: frozenset[str] = frozenset({"GN001", "GN024", "TP001", "TP017"})
+
+
+def test_rule_selection() -> None:
+    """Test rule selection, ignore and unfixable take precedence."""
+    config = core.parse_config()
+    config.lint.select = ["GN", "TP"]
+    config.lint.ignore = ["GN001"]
+    config.lint.fixable = ["TP"]
+    config.lint.unfixable = ["TP017"]
+
+    rule_selection = selection.compile_rule_selection(config.lint, codes=CODES)
+
+    assert rule_selection.enabled == {"GN024", "TP001", "TP017"}
+    assert rule_selection.fix_enabled == {"TP001"}
+    assert rule_selection.rules["GN001"] == selection.RuleState(
+        enabled=False,
+        fix_enabled=False,
+    )
+    assert not rule_selection.has_per_file_rules
+    assert rule_selection.file_rules("migrations/V1.sql") == rule_selection.enabled
+
+
+def test_rule_selection_compiled_once() -> None:
+    """Test rule selection is compiled once per distinct settings."""
+    config = core.parse_config()
+
+    rule_selection = selection.compile_rule_selection(config.lint, codes=CODES)
+
+    assert selection.compile_rule_selection(config.lint, codes=CODES) is rule_selection
+
+    config.lint.ignore = ["TP"]
+
+    assert (
+        selection.compile_rule_selection(config.lint, codes=CODES) is not rule_selection
+    )
+
+
+def test_rule_selection_per_file() -> None:
+    """Test per file select replaces select, per file ignores add to ignore."""
+    config = core.parse_config()
+    config.lint.select = ["GN"]
+    config.lint.ignore = ["TP017"]
+    config.lint.per_file_select = {
+        "migrations/*.sql": ["TP"],
+        "*/V2.sql": ["GN024"],
+    }
+    config.lint.per_file_ignores = {"*/V2.sql": ["TP001"]}
+
+    rule_selection = selection.compile_rule_selection(config.lint, codes=CODES)
+
+    assert rule_selection.has_per_file_rules
+    assert rule_selection.loaded == {"GN001", "GN024", "TP001"}
+    assert rule_selection.file_rules("seeds/V1.sql") == {"GN001", "GN024"}
+    assert rule_selection.file_rules("migrations/V1.sql") == {"TP001"}
+    assert rule_selection.file_rules("migrations/V2.sql") == {"GN024"}
+
+    # Absolute paths match patterns relative to the current working directory
+    assert rule_selection.file_rules(
+        str(pathlib.Path.cwd() / "migrations" / "V1.sql"),
+    ) == {"TP001"}
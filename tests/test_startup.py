@@ -0,0 +1,140 @@
+"""Test startup."""
+
+import sys
+import json
+import time
+import typing
+import pathlib
+import tomllib
+import subprocess
+
+import pytest
+
+import pgrubic
+from tests import TEST_FILE
+
+# Seconds a cold `pgrubic lint` of a single file may take, generous enough for slow
+# machines while catching heavy imports or work added to the startup
+COLD_START_BUDGET: typing.Final[float] = 2.0
+
+COLD_START_RUNS: typing.Final[int] = 3
+
+IMPORTED_MODULES_SCRIPT: typing.Final[str] = """
+import sys
+import json
+
+from pgrubic.__main__ import cli
+
+try:
+    cli(sys.argv[1:], standalone_mode=False)
+finally:
+    print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _imported_modules(*args: str) -> set[str]:
+    """Run the cli in a new interpreter, returning the imported modules whatever the
+    exit status.
+    """
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", IMPORTED_MODULES_SCRIPT, *args],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+
+    return set(json.loads(process.stdout.splitlines()[-1]))
+
+
+def _is_imported(package: str, modules: set[str]) -> bool:
+    """Check if a package or any of its submodules is imported."""
+    return any(
+        module == package or module.startswith(f"{package}.") for module in modules
+    )
+
+
+def test_version() -> None:
+    """Test version is in sync with the project file."""
+    with (pgrubic.PROJECT_DIRECTORY / "pyproject.toml").open("rb") as file:
+        assert pgrubic.__version__ == tomllib.load(file)["project"]["version"]
+
+
+def test_cli_help_imports() -> None:
+    """Test help does not import the config, parser, linter, formatter and the modules
+    only used by the commands.
+    """
+    modules = _imported_modules("--help")
+
+    for package in (
+        "pydantic",
+        "rich",
+        "pglast",
+        "toml",
+        "multiprocessing",
+        "pgrubic.core.noqa",
+        "pgrubic.core.config",
+        "pgrubic.core.linter",
+        "pgrubic.core.formatter",
+    ):
+        assert not _is_imported(package, modules), package
+
+
+def test_cli_lint_imports(tmp_path: pathlib.Path) -> None:
+    """Test lint only imports what it uses."""
+    source_file = tmp_path / TEST_FILE
+    source_file.write_text("SELECT 1;\n")
+
+    modules = _imported_modules(
+        "lint",
+        str(source_file),
+        "--config",
+        "respect-gitignore = false",
+        "--workers",
+        "1",
+    )
+
+    assert _is_imported("pgrubic.core.linter", modules)
+
+    for package in ("rich", "git", "pgrubic.core.lsp", "tomllib"):
+        assert not _is_imported(package, modules), package
+
+
+def test_cli_format_diff_imports(tmp_path: pathlib.Path) -> None:
+    """Test rich is only imported by format when differences are printed."""
+    source_file = tmp_path / TEST_FILE
+    source_file.write_text("select 1;\n")
+
+    modules = _imported_modules("format", str(source_file), "--check", "--no-cache")
+
+    assert not _is_imported("rich", modules)
+
+    modules = _imported_modules("format", str(source_file), "--diff", "--no-cache")
+
+    assert _is_imported("rich", modules)
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    sys.platform != "linux",
+    reason="process startup is only benchmarked on Linux",
+)
+def test_cli_lint_cold_start(tmp_path: pathlib.Path) -> None:
+    """Benchmark the cold start of linting a single file."""
+    source_file = tmp_path / TEST_FILE
+    source_file.write_text("SELECT 1;\n")
+
+    durations: list[float] = []
+
+    for _ in range(COLD_START_RUNS):
+        start = time.perf_counter()
+
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-m", "pgrubic", "lint", str(source_file)],
+            capture_output=True,
+            check=True,
+            cwd=tmp_path,
+        )
+
+        durations.append(time.perf_counter() - start)
+
+    assert min(durations) < COLD_START_BUDGET, durations
@@ -0,0 +1,261 @@
+"""Test watcher."""
+
+import os
+import sys
+import errno
+import pathlib
+from unittest.mock import patch
+
+import pytest
+
+from pgrubic.core import watcher
+
+
+def test_polling_watcher(tmp_path: pathlib.Path) -> None:
+    """Test polling watcher reports changed and added files."""
+    unchanged_file = tmp_path / "unchanged.sql"
+    unchanged_file.write_text("SELECT 1;")
+
+    changed_file = tmp_path / "changed.sql"
+    changed_file.write_text("SELECT 1;")
+
+    polling_watcher = watcher.PollingWatcher((tmp_path,), interval=0)
+
+    changed_file.write_text("SELECT 12;")
+
+    added_file = tmp_path / "sub" / "added.sql"
+    added_file.parent.mkdir()
+    added_file.write_text("SELECT 1;")
+
+    (tmp_path / "ignored.txt").write_text("SELECT 1;")
+
+    assert polling_watcher.wait() == {changed_file, added_file}
+
+    polling_watcher.close()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is only available on Linux")
+def test_inotify_watcher(tmp_path: pathlib.Path) -> None:
+    """Test inotify watcher reports written files, in created directories as well."""
+    changed_file = tmp_path / "changed.sql"
+    changed_file.write_text("SELECT 1;")
+
+    inotify_watcher = watcher.InotifyWatcher((tmp_path,))
+
+    changed_file.write_text("SELECT 12;")
+    (tmp_path / "ignored.txt").write_text("SELECT 1;")
+
+    assert inotify_watcher.wait() == {changed_file}
+
+    added_file = tmp_path / "sub" / "added.sql"
+    added_file.parent.mkdir()
+
+    # The directory is watched once its creation is read
+    assert not inotify_watcher._read_events()[0]  # noqa: SLF001
+
+    added_file.write_text("SELECT 1;")
+
+    assert inotify_watcher.wait() == {added_file}
+
+    inotify_watcher.close()
+
+
+def test_watch_sources(tmp_path: pathlib.Path) -> None:
+    """Test watch sources only yields the included changed sources."""
+    included_file = tmp_path / "included.sql"
+    included_file.write_text("SELECT 1;")
+
+    excluded_file = tmp_path / "excluded.sql"
+    excluded_file.write_text("SELECT 1;")
+
+    polling_watcher = watcher.PollingWatcher((tmp_path,), interval=0)
+
+    excluded_file.write_text("SELECT 12;")
+    included_file.write_text("SELECT 12;")
+
+    with patch.object(watcher, "create_watcher", return_value=polling_watcher):
+        sources = watcher.watch_sources(
+            sources=(tmp_path,),
+            include=[],
+            exclude=["*/excluded.sql"],
+            respect_gitignore=False,
+        )
+
+        assert next(sources) == {included_file}
+
+        sources.close()
+
+
+def test_polling_watcher_file_sources(tmp_path: pathlib.Path) -> None:
+    """Test polling watcher only watches file sources with the extension."""
+    source_file = tmp_path / "source.sql"
+    source_file.write_text("SELECT 1;")
+
+    other_file = tmp_path / "other.txt"
+    other_file.write_text("SELECT 1;")
+
+    polling_watcher = watcher.PollingWatcher((source_file, other_file), interval=0)
+
+    assert set(polling_watcher.snapshot) == {source_file}
+
+
+def test_create_watcher(tmp_path: pathlib.Path) -> None:
+    """Test create watcher falls back to polling when inotify is unavailable."""
+    with (
+        patch.object(sys, "platform", "linux"),
+        patch.object(watcher, "InotifyWatcher", side_effect=OSError),
+    ):
+        assert isinstance(watcher.create_watcher((tmp_path,)), watcher.PollingWatcher)
+
+    with patch.object(sys, "platform", "darwin"):
+        assert isinstance(watcher.create_watcher((tmp_path,)), watcher.PollingWatcher)
+
+
+def test_watch_sources_falls_back_to_polling(tmp_path: pathlib.Path) -> None:
+    """Test watch sources falls back to polling when the watcher fails."""
+    source_file = tmp_path / "source.sql"
+    source_file.write_text("SELECT 1;")
+
+    failing_watcher = watcher.PollingWatcher((tmp_path,))
+    polling_watcher = watcher.PollingWatcher((tmp_path,), interval=0)
+
+    source_file.write_text("SELECT 12;")
+
+    with (
+        patch.object(watcher, "create_watcher", return_value=failing_watcher),
+        patch.object(failing_watcher, "wait", side_effect=OSError),
+        patch.object(watcher, "PollingWatcher", return_value=polling_watcher),
+    ):
+        sources = watcher.watch_sources(
+            sources=(tmp_path,),
+            include=[],
+            exclude=[],
+            respect_gitignore=False,
+        )
+
+        assert next(sources) == {source_file}
+
+        sources.close()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is only available on Linux")
+def test_inotify_watcher_init_error(tmp_path: pathlib.Path) -> None:
+    """Test inotify watcher raises OSError when inotify cannot be initialized."""
+    with (
+        patch("ctypes.CDLL") as cdll,
+        patch("ctypes.get_errno", return_value=errno.EMFILE),
+    ):
+        cdll.return_value.inotify_init1.return_value = -1
+
+        with pytest.raises(OSError, match=os.strerror(errno.EMFILE)):
+            watcher.InotifyWatcher((tmp_path,))
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is only available on Linux")
+def test_inotify_watcher_watch_error(tmp_path: pathlib.Path) -> None:
+    """Test inotify watcher raises OSError when the watch limit is reached, removed
+    directories are skipped.
+    """
+    inotify_watcher = watcher.InotifyWatcher((tmp_path,))
+
+    with (
+        patch.object(inotify_watcher, "libc") as libc,
+        patch("ctypes.get_errno", return_value=errno.ENOSPC),
+    ):
+        libc.inotify_add_watch.return_value = -1
+
+        with pytest.raises(OSError, match=os.strerror(errno.ENOSPC)):
+            inotify_watcher._watch(tmp_path / "sub")  # noqa: SLF001
+
+        with patch("ctypes.get_errno", return_value=errno.ENOENT):
+            inotify_watcher._watch(tmp_path / "removed")  # noqa: SLF001
+
+    assert list(inotify_watcher.directories.values()) == [tmp_path]
+
+    inotify_watcher.close()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is only available on Linux")
+def test_inotify_watcher_skips_directories(tmp_path: pathlib.Path) -> None:
+    """Test inotify watcher watches the directories of file sources, and skips hidden
+    and excluded directories.
+    """
+    for directory in ("sub", ".venv", "vendor", "sub/.git"):
+        (tmp_path / directory).mkdir()
+
+    source_file = tmp_path / "other" / "source.sql"
+    source_file.parent.mkdir()
+
+    inotify_watcher = watcher.InotifyWatcher(
+        (tmp_path, source_file),
+        exclude=["*/vendor/*"],
+    )
+
+    assert set(inotify_watcher.directories.values()) == {
+        tmp_path,
+        tmp_path / "sub",
+        tmp_path / "other",
+    }
+
+    (tmp_path / ".pgrubic_cache").mkdir()
+
+    assert inotify_watcher._read_events() == (set(), False)  # noqa: SLF001
+    assert tmp_path / ".pgrubic_cache" not in inotify_watcher.directories.values()
+
+    inotify_watcher.close()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is only available on Linux")
+def test_inotify_watcher_events(tmp_path: pathlib.Path) -> None:
+    """Test inotify watcher skips events of unknown and removed watches, and stops
+    reading at an overflow.
+    """
+    inotify_watcher = watcher.InotifyWatcher((tmp_path,))
+
+    (watch_descriptor,) = inotify_watcher.directories
+
+    name = b"source.sql".ljust(16, b"\0")
+
+    events = (
+        watcher.INOTIFY_EVENT.pack(watch_descriptor + 1, watcher.IN_CLOSE_WRITE, 0, 16)
+        + name
+        + watcher.INOTIFY_EVENT.pack(watch_descriptor, watcher.IN_IGNORED, 0, 0)
+        + watcher.INOTIFY_EVENT.pack(-1, watcher.IN_Q_OVERFLOW, 0, 0)
+        + watcher.INOTIFY_EVENT.pack(watch_descriptor, watcher.IN_CLOSE_WRITE, 0, 16)
+        + name
+    )
+
+    # Nothing is pending
+    assert inotify_watcher._read_events() == (set(), False)  # noqa: SLF001
+
+    with patch("os.read", return_value=events):
+        assert inotify_watcher._read_events() == (set(), True)  # noqa: SLF001
+
+    assert not inotify_watcher.directories
+
+    inotify_watcher.close()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is only available on Linux")
+def test_inotify_watcher_lost_events(tmp_path: pathlib.Path) -> None:
+    """Test inotify watcher reports every file of the sources when events were lost."""
+    changed_file = tmp_path / "changed.sql"
+    changed_file.write_text("SELECT 1;")
+
+    unchanged_file = tmp_path / "sub" / "unchanged.sql"
+    unchanged_file.parent.mkdir()
+    unchanged_file.write_text("SELECT 1;")
+
+    inotify_watcher = watcher.InotifyWatcher((tmp_path,))
+    read_events = inotify_watcher._read_events  # noqa: SLF001
+
+    changed_file.write_text("SELECT 12;")
+
+    with patch.object(
+        inotify_watcher,
+        "_read_events",
+        side_effect=lambda: (read_events()[0], True),
+    ):
+        assert inotify_watcher.wait() == {changed_file, unchanged_file}
+
+    inotify_watcher.close()
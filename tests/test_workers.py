@@ -0,0 +1,151 @@
+"""Test workers."""
+
+import os
+import signal
+import pathlib
+from unittest.mock import patch
+
+from tests import TEST_FILE
+from pgrubic import core
+from pgrubic.core import noqa, workers
+
+
+def test_lint_source(tmp_path: pathlib.Path) -> None:
+    """Test lint source reads and lints the file in the worker."""
+    source_file = tmp_path / TEST_FILE
+    source_file.write_text("SELECT a = NULL;")
+
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+
+    workers.initialize_linter(config, profile_rules=True)
+
+    lint_result = workers.lint_source(str(source_file))
+
+    assert lint_result.source_file == str(source_file)
+    assert {violation.rule_code for violation in lint_result.violations} == {"GN024"}
+    assert lint_result.rule_profiles is not None
+
+
+def test_lint_source_cached(tmp_path: pathlib.Path) -> None:
+    """Test lint source answers unchanged files from the cache."""
+    source_file = tmp_path / TEST_FILE
+    source_file.write_text("SELECT a = NULL; -- noqa: GN001\nSELECT b FROM;\n")
+
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+
+    workers.initialize_linter(config)
+
+    lint_result = workers.lint_source(str(source_file))
+
+    with patch.object(core.Linter, "run") as run:
+        cached_lint_result = workers.lint_source(str(source_file))
+
+    run.assert_not_called()
+    assert cached_lint_result.violations == lint_result.violations
+    assert cached_lint_result.errors == lint_result.errors
+    assert [directive.rule for directive in cached_lint_result.unused_lint_ignores] == [
+        "GN001"
+    ]
+
+    config.lint.no_cache = True
+
+    workers.initialize_linter(config)
+
+    with patch.object(core.Linter, "run", return_value=lint_result) as run:
+        workers.lint_source(str(source_file))
+
+    run.assert_called_once()
+
+
+def test_lint_source_caches_linted_content(tmp_path: pathlib.Path) -> None:
+    """Test lint source reads the file once and caches the result under the content
+    it was linted from, even if the file changes meanwhile.
+    """
+    source_file = tmp_path / TEST_FILE
+    source_file.write_text("SELECT a = NULL;")
+
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+
+    workers.initialize_linter(config)
+
+    run = core.Linter.run
+
+    def run_and_change_source(
+        linter: core.Linter,
+        *,
+        source_file: str,
+        source_code: str,
+    ) -> core.linter.LintResult:
+        """Lint the source code, changing the source file meanwhile."""
+        pathlib.Path(source_file).write_text("SELECT 1;")
+
+        return run(linter, source_file=source_file, source_code=source_code)
+
+    with (
+        patch.object(core.Linter, "run", run_and_change_source),
+        patch.object(
+            pathlib.Path,
+            "read_bytes",
+            autospec=True,
+            side_effect=pathlib.Path.read_bytes,
+        ) as read_bytes,
+    ):
+        workers.lint_source(str(source_file))
+
+    read_bytes.assert_called_once()
+
+    lint_result = workers.lint_source(str(source_file))
+
+    assert not lint_result.violations
+
+
+def test_lint_source_stream_cached(tmp_path: pathlib.Path) -> None:
+    """Test lint source caches streamed lint results under the content streamed."""
+    source_file = tmp_path / TEST_FILE
+    source_file.write_text("SELECT a = NULL;\r\nSELECT 1;\n")
+
+    config = core.parse_config()
+    config.cache_dir = tmp_path
+
+    workers.initialize_linter(config, stream=True)
+
+    lint_result = workers.lint_source(str(source_file))
+
+    with patch.object(core.Linter, "run_stream") as run_stream:
+        cached_lint_result = workers.lint_source(str(source_file))
+
+    run_stream.assert_not_called()
+    assert cached_lint_result.violations == lint_result.violations
+    assert {violation.rule_code for violation in lint_result.violations} == {"GN024"}
+
+
+def test_format_source(tmp_path: pathlib.Path) -> None:
+    """Test format source reads and formats the file in the worker."""
+    source_file = tmp_path / TEST_FILE
+    source_file.write_text("select 1;")
+
+    workers.initialize_formatter(core.parse_config())
+
+    format_result = workers.format_source(str(source_file))
+
+    assert format_result.original_source_code == "select 1;"
+    assert format_result.formatted_source_code == f"SELECT 1;{noqa.NEW_LINE}"
+    assert format_result.digest == workers._Worker.format_cache.hash_digest(  # noqa: SLF001
+        f"SELECT 1;{os.linesep}".encode(),
+    )
+
+
+def test_ignore_interrupts() -> None:
+    """Test worker processes ignore interrupts, left to the main process."""
+    with patch("signal.signal") as signal_:
+        workers._ignore_interrupts()  # noqa: SLF001
+
+        signal_.assert_not_called()
+
+        with patch("multiprocessing.parent_process", return_value=object()):
+            workers._ignore_interrupts()  # noqa: SLF001
+
+    signal_.assert_called_once_with(signal.SIGINT, signal.SIG_IGN)
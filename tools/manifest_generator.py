@@ -0,0 +1,6 @@
+"""Generate the manifest of the built-in rules and formatters."""
+
+from pgrubic import MANIFEST_FILE
+from pgrubic.core import loader
+
+MANIFEST_FILE.write_text(loader.generate_manifest(), encoding="utf-8")